@@ -0,0 +1,187 @@
+"""
+Fuzzy alias index for app and website names.
+
+Built once from the name tables plus user aliases, so a misrecognized name
+("crome", "git hab", "note pad") still resolves. Lookups try, in order: an
+exact match, a match ignoring spaces, a phonetic key match, and finally the
+closest name by edit distance through a BK-tree. Every match carries a
+confidence between 0 and 1.
+"""
+
+import json
+import re
+from collections import namedtuple
+
+Match = namedtuple('Match', ['target', 'alias', 'confidence', 'method'])
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+
+def compact(name):
+    """Lowercase and drop everything but letters and digits"""
+    return _NON_ALNUM.sub('', name.lower())
+
+
+_VOWELS = set('aeiouy')
+
+
+def sound_distance(a, b, vowel_cost=2.0):
+    """Edit distance where changing one vowel into another costs vowel_cost
+
+    Spelling slips (a dropped or doubled consonant, "ck" for "x", "i" for
+    "y") cost 0.5; a different vowel makes a different word ("point" /
+    "paint", "nation" / "notion"). Adding or dropping a vowel costs half of
+    vowel_cost, so swapping one can't be done more cheaply in two steps.
+    """
+    def indel(c):
+        return vowel_cost / 2 if c in _VOWELS else 0.5
+
+    previous = [0.0]
+    for cb in b:
+        previous.append(previous[-1] + indel(cb))
+    for ca in a:
+        current = [previous[0] + indel(ca)]
+        for j, cb in enumerate(b, 1):
+            if ca == cb or {ca, cb} == {'i', 'y'}:
+                change = 0.0
+            elif ca in _VOWELS and cb in _VOWELS:
+                change = vowel_cost
+            else:
+                change = 0.5
+            current.append(min(previous[j] + indel(ca), current[j - 1] + indel(cb), previous[j - 1] + change))
+        previous = current
+    return previous[-1]
+
+
+def edit_distance(a, b):
+    """Levenshtein distance"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+# Ordered rewrites that make similar-sounding spellings collide
+_PHONETIC_RULES = [
+    (re.compile(r'ph'), 'f'), (re.compile(r'ck'), 'k'), (re.compile(r'q'), 'k'),
+    (re.compile(r'x'), 'ks'), (re.compile(r'c(?=[eiy])'), 's'), (re.compile(r'c'), 'k'),
+    (re.compile(r'z'), 's'), (re.compile(r'dg'), 'j'), (re.compile(r'gh'), 'g'),
+    (re.compile(r'(?<=.)[wh]'), ''), (re.compile(r'y'), 'i'),
+]
+
+
+def phonetic_key(name):
+    """Rough sound-alike key: consonant skeleton after common spelling rewrites"""
+    key = compact(name)
+    for pattern, replacement in _PHONETIC_RULES:
+        key = pattern.sub(replacement, key)
+    if not key:
+        return key
+    # Keep the first letter, drop later vowels, collapse doubled letters
+    skeleton = key[0] + re.sub(r'[aeiou]', '', key[1:])
+    return re.sub(r'(.)\1+', r'\1', skeleton)
+
+
+class BKTree:
+    """Burkhard-Keller tree over strings with edit distance as the metric"""
+
+    def __init__(self):
+        self.root = None  # (word, {distance: child})
+
+    def add(self, word):
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """Return [(distance, word)] within max_distance, closest first"""
+        results = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_word, children = stack.pop()
+            distance = edit_distance(word, node_word)
+            if distance <= max_distance:
+                results.append((distance, node_word))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+        return sorted(results)
+
+
+class AliasIndex:
+    """Tolerant name -> target lookup"""
+
+    def __init__(self, aliases, max_distance=2):
+        self.max_distance = max_distance
+        self.exact = {}
+        self.compact = {}
+        self.phonetic = {}
+        self.tree = BKTree()
+        for alias, target in aliases.items():
+            self.add(alias, target)
+
+    def add(self, alias, target):
+        alias = alias.lower().strip()
+        key = compact(alias)
+        self.exact[alias] = target
+        self.compact[key] = (alias, target)
+        self.phonetic.setdefault(phonetic_key(alias), []).append(key)
+        self.tree.add(key)
+
+    def lookup(self, name):
+        """Return the best Match for a spoken name, or None"""
+        name = name.lower().strip()
+        if name in self.exact:
+            return Match(self.exact[name], name, 1.0, 'exact')
+        key = compact(name)
+        if not key:
+            return None
+        if key in self.compact:
+            alias, target = self.compact[key]
+            return Match(target, alias, 0.95, 'spacing')
+
+        candidates = self.phonetic.get(phonetic_key(name))
+        if candidates:
+            # A name the recognizer didn't know often comes back split into words
+            # ("git hab", "calcu later"); then a changed vowel is a likelier slip
+            split = lambda c: len(name.split()) > len(self.compact[c][0].split())
+            distance = lambda c: sound_distance(key, c, vowel_cost=1.0 if split(c) else 2.0)
+            best = min(candidates, key=distance)
+            alias, target = self.compact[best]
+            similarity = max(0.0, 1 - distance(best) / max(len(key), len(best)))
+            return Match(target, alias, round(0.85 * similarity, 3), 'phonetic')
+
+        # Allow fewer edits for short names so "x" doesn't match everything
+        max_distance = min(self.max_distance, max(0, len(key) // 3))
+        found = self.tree.search(key, max_distance) if max_distance else []
+        if found:
+            distance, best = found[0]
+            alias, target = self.compact[best]
+            return Match(target, alias, round(0.8 * (1 - distance / max(len(key), len(best))), 3), 'edit')
+        return None
+
+
+def load_user_aliases(path, section):
+    """Read {alias: target} for a section ("websites" or "apps") from a JSON aliases file"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {k.lower(): v for k, v in json.load(f).get(section, {}).items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Could not read aliases from {path}: {e}")
+        return {}
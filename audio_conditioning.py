@@ -0,0 +1,317 @@
+"""
+Conditioning of recorded speech before it is uploaded for recognition.
+
+What Recognizer.listen() captures starts and ends with silence (up to
+pause_threshold of it at the end) and is at the microphone's native rate,
+usually 44.1 or 48 kHz. speech_recognition then converts it to FLAC by running
+the flac executable. On a slow uplink the upload dominates recognition time.
+
+Here the audio is trimmed to the speech plus a little padding (an energy VAD
+over 20 ms frames), downmixed to mono, band-limited and resampled to 16 kHz,
+which is all a speech recognizer uses, and encoded as FLAC in-process with
+NumPy: fixed linear predictors and partitioned Rice coding, lossless and
+readable by any FLAC decoder.
+
+ConditionedRecognizer is a drop-in sr.Recognizer whose recognize_google()
+uploads the conditioned audio and counts bytes per utterance in stats.
+"""
+
+import hashlib
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+try:
+    from speech_recognition.recognizers import google as google_api
+except ImportError:     # speech_recognition < 3.10
+    google_api = None
+
+TARGET_RATE = 16000
+FRAME_SECONDS = 0.02
+BLOCK_SIZE = 4096
+MAX_PARTITION_ORDER = 6
+MAX_RICE_PARAMETER = 14
+
+# FLAC frame header codes for common sample rates; others are read from STREAMINFO
+RATE_CODES = {88200: 1, 176400: 2, 192000: 3, 8000: 4, 16000: 5, 22050: 6, 24000: 7,
+              32000: 8, 44100: 9, 48000: 10, 96000: 11}
+
+
+# =============================================================================
+# SIGNAL
+# =============================================================================
+
+def pcm_to_array(data, sample_width=2, channels=1):
+    """Little-endian PCM bytes -> float64 array of shape (frames, channels), int16 scale"""
+    if sample_width == 1:
+        samples = (np.frombuffer(data, np.uint8).astype(np.float64) - 128) * 256
+    elif sample_width == 3:
+        raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+        samples = ((raw[:, 0] | raw[:, 1] << 8 | raw[:, 2] << 16) << 8 >> 8) / 256.0
+    else:
+        dtype = {2: '<i2', 4: '<i4'}[sample_width]
+        samples = np.frombuffer(data, dtype).astype(np.float64) / (1 << (8 * sample_width - 16))
+    return samples.reshape(-1, channels)
+
+
+def downmix(samples):
+    """Average the channels of a (frames, channels) array"""
+    return samples.mean(axis=1) if samples.ndim == 2 else samples
+
+
+def speech_bounds(samples, rate, pad=0.25, ratio=3.0, min_level=150.0):
+    """(start, end) sample indexes of the speech in samples, padded; None if nothing is loud enough
+
+    A frame is speech when its RMS is ratio times the noise floor (the 10th
+    percentile of frame levels) and at least min_level.
+    """
+    frame = max(1, int(rate * FRAME_SECONDS))
+    count = len(samples) // frame
+    if count == 0:
+        return None
+    frames = samples[:count * frame].reshape(count, frame)
+    levels = np.sqrt(np.mean(frames * frames, axis=1))
+    threshold = max(np.percentile(levels, 10) * ratio, min_level)
+    loud = np.flatnonzero(levels >= threshold)
+    if len(loud) == 0:
+        return None
+    padding = int(pad * rate)
+    return max(0, loud[0] * frame - padding), min(len(samples), (loud[-1] + 1) * frame + padding)
+
+
+def resample(samples, rate, target):
+    """Band-limited resampling to target (FFT based); only ever lowers the rate"""
+    if rate <= target or len(samples) == 0:
+        return samples, rate
+    count = int(round(len(samples) * target / rate))
+    spectrum = np.fft.rfft(samples)[:count // 2 + 1]
+    return np.fft.irfft(spectrum, count) * (count / len(samples)), target
+
+
+def condition(data, rate, sample_width=2, channels=1, target_rate=TARGET_RATE, trim=True, pad=0.25):
+    """Trim, downmix and resample PCM; returns (int16 samples, rate)"""
+    samples = downmix(pcm_to_array(data, sample_width, channels))
+    if trim:
+        bounds = speech_bounds(samples, rate, pad=pad)
+        if bounds:
+            samples = samples[bounds[0]:bounds[1]]
+    samples, rate = resample(samples, rate, target_rate)
+    return np.clip(np.round(samples), -32768, 32767).astype(np.int16), rate
+
+
+# =============================================================================
+# FLAC
+# =============================================================================
+
+def _crc_table(polynomial, width):
+    top, mask = 1 << (width - 1), (1 << width) - 1
+    table = []
+    for byte in range(256):
+        crc = byte << (width - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial if crc & top else crc << 1) & mask
+        table.append(crc)
+    return table
+
+
+_CRC8 = _crc_table(0x07, 8)
+_CRC16 = _crc_table(0x8005, 16)
+
+
+def crc8(data):
+    crc = 0
+    for byte in data:
+        crc = _CRC8[crc ^ byte]
+    return crc
+
+
+def _crc16_skip(crc, count):
+    """CRC-16 state after count more zero bytes"""
+    for _ in range(count):
+        crc = ((crc << 8) & 0xFFFF) ^ _CRC16[crc >> 8]
+    return crc
+
+
+# CRC-16 is linear, so frames are checksummed CRC_CHUNK bytes at a time: all
+# chunks at once with NumPy, two bytes per step, then combined by skipping
+# each chunk's result forward over the bytes that follow it
+CRC_CHUNK = 64
+_byte_table = np.array(_CRC16, np.uint32)
+_words = np.arange(1 << 16, dtype=np.uint32)
+_after_high = _byte_table[_words >> 8]
+_CRC16_WORDS = ((_after_high << 8) & 0xFFFF) ^ _byte_table[(_after_high >> 8) ^ (_words & 0xFF)]
+_SKIP_HIGH = [_crc16_skip(byte << 8, CRC_CHUNK) for byte in range(256)]
+_SKIP_LOW = [_crc16_skip(byte, CRC_CHUNK) for byte in range(256)]
+del _byte_table, _words, _after_high
+
+
+def crc16(data):
+    padded = bytes(-len(data) % CRC_CHUNK) + data      # leading zeros leave the CRC unchanged
+    chunks = np.frombuffer(padded, '>u2').reshape(-1, CRC_CHUNK // 2).astype(np.uint32)
+    crcs = np.zeros(len(chunks), np.uint32)
+    for column in chunks.T:
+        crcs = _CRC16_WORDS[crcs ^ column]
+    crc = 0
+    for part in crcs.tolist():
+        crc = _SKIP_HIGH[crc >> 8] ^ _SKIP_LOW[crc & 0xFF] ^ part
+    return crc
+
+
+def _utf8_number(number):
+    """FLAC's UTF-8 style coding of a frame number"""
+    if number < 0x80:
+        return bytes([number])
+    tail = []
+    while True:
+        tail.insert(0, 0x80 | (number & 0x3F))
+        number >>= 6
+        limit = 0x3F >> len(tail)       # payload bits left in the first byte
+        if number <= limit:
+            lead = (0xFF00 >> (len(tail) + 1)) & 0xFF
+            return bytes([lead | number] + tail)
+
+
+def _bits(value, width):
+    return (value >> np.arange(width - 1, -1, -1)) & 1
+
+
+def _rice_bits(values, k):
+    """Rice code zigzagged residuals with parameter k, as an array of bits"""
+    quotients = values >> k
+    lengths = quotients + 1 + k
+    starts = np.cumsum(lengths) - lengths
+    bits = np.zeros(int(lengths.sum()), np.uint8)
+    stops = starts + quotients
+    bits[stops] = 1
+    for j in range(k):
+        bits[stops + 1 + j] = (values >> (k - 1 - j)) & 1
+    return bits
+
+
+def _residual_bits(residual, block, order):
+    """Partitioned Rice coding (method 0) of a fixed predictor's residual, choosing the cheapest layout"""
+    values = (residual << 1) ^ (residual >> 63)         # zigzag: 0, -1, 1, -2, ... -> 0, 1, 2, 3, ...
+    ks = np.arange(MAX_RICE_PARAMETER + 1)
+    # Bits per partition and parameter at the finest layout, summed pairwise for coarser ones
+    finest = 0
+    while finest < MAX_PARTITION_ORDER and not block % (2 << finest) and block >> (finest + 1) > order:
+        finest += 1
+    size = block >> finest
+    starts = np.arange(1 << finest) * size - order
+    starts[0] = 0
+    sums = np.add.reduceat(values[:, None] >> ks[None, :], starts, axis=0)
+    counts = np.full(1 << finest, size)
+    counts[0] -= order
+    best = None
+    for partition_order in range(finest, -1, -1):
+        costs = sums + counts[:, None] * (ks + 1)
+        params = costs.argmin(axis=1)
+        total = int(costs[np.arange(len(params)), params].sum()) + 4 * len(params)
+        if best is None or total < best[0]:
+            best = (total, partition_order, params, starts, counts)
+        sums = sums[0::2] + sums[1::2]
+        starts, counts = starts[0::2], counts[0::2] + counts[1::2]
+    _, partition_order, params, starts, counts = best
+    pieces = [np.zeros(2, np.uint8), _bits(partition_order, 4)]
+    for k, start, count in zip(params, starts, counts):
+        pieces.append(_bits(int(k), 4))
+        pieces.append(_rice_bits(values[start:start + count], int(k)))
+    return np.concatenate(pieces)
+
+
+def _subframe_bits(block):
+    """Bits of the cheapest fixed-predictor subframe (or a verbatim one) for int64 samples"""
+    residuals = [block]
+    for _ in range(min(4, len(block) - 1)):
+        residuals.append(np.diff(residuals[-1]))
+    order = int(np.argmin([np.abs(r).sum() for r in residuals]))
+    warmup = [_bits(int(s) & 0xFFFF, 16) for s in block[:order]]
+    coded = np.concatenate([_bits((0b001000 | order) << 1, 8)] + warmup
+                           + [_residual_bits(residuals[order], len(block), order)])
+    if len(coded) < 8 + 16 * len(block):
+        return coded
+    verbatim = ((block[:, None] & 0xFFFF) >> np.arange(15, -1, -1)) & 1
+    return np.concatenate([_bits(0b000010, 8), verbatim.ravel().astype(np.uint8)])
+
+
+def encode_flac(samples, rate):
+    """Encode mono int16 samples as a FLAC file"""
+    samples = np.asarray(samples, np.int16)
+    total = len(samples)
+    block_size = BLOCK_SIZE if total > BLOCK_SIZE else max(16, total)
+    streaminfo = (block_size.to_bytes(2, 'big') * 2 + bytes(6)
+                  + ((rate << 44) | (0 << 41) | (15 << 36) | total).to_bytes(8, 'big')
+                  + hashlib.md5(samples.astype('<i2').tobytes()).digest())
+    out = [b'fLaC', bytes([0x80, 0, 0, len(streaminfo)]), streaminfo]
+
+    wide = samples.astype(np.int64)
+    for number, start in enumerate(range(0, total, BLOCK_SIZE)):
+        block = wide[start:start + BLOCK_SIZE]
+        size_code = 12 if len(block) == BLOCK_SIZE else 7
+        header = bytes([0xFF, 0xF8, size_code << 4 | RATE_CODES.get(rate, 0), 0x08]) + _utf8_number(number)
+        if size_code == 7:
+            header += (len(block) - 1).to_bytes(2, 'big')
+        header += bytes([crc8(header)])
+        frame = header + np.packbits(_subframe_bits(block)).tobytes()
+        out.append(frame + crc16(frame).to_bytes(2, 'big'))
+    return b''.join(out)
+
+
+# =============================================================================
+# RECOGNIZER
+# =============================================================================
+
+def new_stats():
+    return {'utterances': 0, 'seconds_captured': 0.0, 'seconds_uploaded': 0.0,
+            'bytes_captured': 0, 'bytes_uploaded': 0, 'condition_seconds': 0.0}
+
+
+def report(stats):
+    """One line on what conditioning saved"""
+    count = max(1, stats['utterances'])
+    return (f"Recognition uploads: {stats['bytes_uploaded'] / count / 1024:.1f} KB per utterance "
+            f"({stats['bytes_uploaded'] / max(1, stats['bytes_captured']):.0%} of the captured audio), "
+            f"{stats['seconds_uploaded']:.1f} of {stats['seconds_captured']:.1f} s kept, "
+            f"{stats['condition_seconds'] / count * 1000:.0f} ms to condition")
+
+
+class ConditionedRecognizer(sr.Recognizer):
+    """sr.Recognizer that uploads trimmed 16 kHz FLAC to Google Speech Recognition"""
+
+    def __init__(self, target_rate=TARGET_RATE, trim=True, pad=0.25, stats=None):
+        super().__init__()
+        self.target_rate = target_rate
+        self.trim = trim
+        self.pad = pad
+        self.stats = stats if stats is not None else new_stats()
+
+    def condition(self, audio_data):
+        """(FLAC bytes, sample rate) for an AudioData"""
+        start = time.perf_counter()
+        data = audio_data.get_raw_data()
+        samples, rate = condition(data, audio_data.sample_rate, audio_data.sample_width,
+                                  target_rate=self.target_rate, trim=self.trim, pad=self.pad)
+        flac = encode_flac(samples, rate)
+        self.stats['utterances'] += 1
+        self.stats['bytes_captured'] += len(data)
+        self.stats['bytes_uploaded'] += len(flac)
+        self.stats['seconds_captured'] += len(data) / (audio_data.sample_rate * audio_data.sample_width)
+        self.stats['seconds_uploaded'] += len(samples) / rate
+        self.stats['condition_seconds'] += time.perf_counter() - start
+        return flac, rate, samples
+
+    def recognize_google(self, audio_data, key=None, language="en-US", pfilter=0, show_all=False,
+                         with_confidence=False, endpoint=None):
+        flac, rate, samples = self.condition(audio_data)
+        if google_api is None:
+            # Older speech_recognition: still upload the conditioned audio, encoded by its flac tool
+            conditioned = sr.AudioData(samples.astype('<i2').tobytes(), rate, 2)
+            return super().recognize_google(conditioned, key=key, language=language, pfilter=pfilter,
+                                            show_all=show_all, with_confidence=with_confidence)
+        from urllib.request import Request
+        builder = google_api.create_request_builder(endpoint=endpoint or google_api.ENDPOINT, key=key,
+                                                    language=language, filter_level=pfilter)
+        request = Request(builder.build_url(), data=flac, headers={'Content-Type': f"audio/x-flac; rate={rate}"})
+        response = google_api.obtain_transcription(request, timeout=self.operation_timeout)
+        return google_api.OutputParser(show_all=show_all, with_confidence=with_confidence).parse(response)
@@ -0,0 +1,124 @@
+"""
+In-process audio output for raw PCM.
+
+A single PyAudio output stream is opened on first use and kept open, so playing
+a reply is just writing the received buffers into it: no temporary file, no
+player process and no decoder. Buffers are passed through as memoryviews.
+
+Playback can be stopped from another thread; it ends within one output buffer.
+Everything written can also be fed to a reference (see barge_in.py) so the
+microphone can tell the assistant's own voice from the user's.
+"""
+
+import threading
+import time
+
+
+def pcm_rate(output_format):
+    """Sample rate of an ElevenLabs PCM format name such as 'pcm_22050', else None"""
+    if output_format and output_format.startswith("pcm_"):
+        try:
+            return int(output_format.split("_", 1)[1])
+        except ValueError:
+            return None
+    return None
+
+
+class PCMSink:
+    """Persistent output stream for 16-bit mono PCM"""
+
+    def __init__(self, sample_rate=22050, sample_width=2, channels=1,
+                 frames_per_buffer=1024, output=None, reference=None):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self.frames_per_buffer = frames_per_buffer
+        self._output = output       # any object with write(buffer); PyAudio stream if None
+        self._pyaudio = None
+        self._failed = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.reference = reference      # object with add(buffer), fed with everything played
+        self.last_first_sample = None   # seconds from play() call to first buffer written
+        self.stopped_at = None          # perf_counter() when a stop() took effect
+
+    def ensure_open(self):
+        """Open the output stream if needed; returns False if audio output is unavailable"""
+        if self._output is not None:
+            return True
+        if self._failed:
+            return False
+        with self._lock:
+            if self._output is None and not self._failed:
+                try:
+                    import pyaudio
+                    self._pyaudio = pyaudio.PyAudio()
+                    self._output = self._pyaudio.open(
+                        format=self._pyaudio.get_format_from_width(self.sample_width),
+                        channels=self.channels,
+                        rate=self.sample_rate,
+                        output=True,
+                        frames_per_buffer=self.frames_per_buffer,
+                    )
+                except Exception as e:
+                    print(f"PCM output not available: {e}")
+                    self._failed = True
+        return self._output is not None
+
+    @property
+    def interrupted(self):
+        return self._stop.is_set()
+
+    def stop(self):
+        """Interrupt playback; play() calls return without writing until reset()"""
+        self._stop.set()
+
+    def reset(self):
+        """Allow playback again after stop()"""
+        self._stop.clear()
+        self.stopped_at = None
+
+    def play(self, chunks):
+        """Write an iterable of PCM buffers to the output; blocks until written or stopped"""
+        frame_bytes = self.sample_width * self.channels
+        block = self.frames_per_buffer * frame_bytes
+        start = time.perf_counter()
+        self.last_first_sample = None
+        carry = b""
+        with self._lock:
+            for chunk in chunks:
+                if carry:
+                    # Only a chunk that split a sample is copied
+                    chunk = carry + bytes(chunk)
+                    carry = b""
+                view = memoryview(chunk)
+                usable = len(view) - len(view) % frame_bytes
+                if usable < len(view):
+                    carry = bytes(view[usable:])
+                    view = view[:usable]
+                if not usable:
+                    continue
+                # Written one output buffer at a time so a stop takes effect quickly
+                for offset in range(0, usable, block):
+                    if self._stop.is_set():
+                        if self.stopped_at is None:
+                            self.stopped_at = time.perf_counter()
+                        return False
+                    part = view[offset:offset + block]
+                    self._output.write(part)
+                    if self.reference is not None:
+                        self.reference.add(part)
+                    if self.last_first_sample is None:
+                        self.last_first_sample = time.perf_counter() - start
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._pyaudio is not None:
+                try:
+                    self._output.stop_stream()
+                    self._output.close()
+                finally:
+                    self._pyaudio.terminate()
+                self._pyaudio = None
+                self._output = None
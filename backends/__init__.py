@@ -0,0 +1,143 @@
+"""
+Desktop backends: everything that touches the operating system's desktop.
+
+Volume, screen lock, screenshots, windows, launching apps and URLs, WiFi
+profiles, and playing or speaking audio go through one Backend, so plugins and
+main.py stay platform independent:
+
+    windows   pycaw, pywin32, pyautogui and SAPI
+    linux     PulseAudio or ALSA, wmctrl, loginctl, NetworkManager and Pillow on X11
+    fake      in memory and deterministic, for CI, load tests and benchmarks
+
+get() picks one from PLATFORM_BACKEND ('auto': windows on Windows, linux
+anywhere else; fake only when asked for by name) and imports only that module;
+its platform libraries are imported on first use.
+"""
+
+import importlib
+import sys
+import threading
+import webbrowser
+
+BACKENDS = ('windows', 'linux', 'fake')
+
+_backend = None
+_lock = threading.Lock()
+
+
+class Backend:
+    """What every platform provides; these defaults mean "not supported here" """
+
+    name = None
+    speech_engine = None        # metrics label for speak(); None when the platform has no voice
+
+    # Volume, 0-100
+
+    def get_volume(self):
+        return None
+
+    def set_volume(self, level):
+        return False
+
+    def set_mute(self, muted=None):
+        """Mute or unmute; None toggles"""
+        return False
+
+    # Screen
+
+    def screen_size(self):
+        """(width, height) of the primary screen, or None"""
+        return None
+
+    def grab_screen(self, region=None):
+        """PIL image of the screen, or of a (left, top, width, height) region; None if unsupported"""
+        return None
+
+    def active_window_region(self):
+        """(left, top, width, height) of the foreground window, or None"""
+        return None
+
+    def lock_screen(self):
+        return False
+
+    # Windows and applications
+
+    def minimize_windows(self):
+        return False
+
+    def switch_window(self, name):
+        """Bring the first window whose title contains name to the front"""
+        return False
+
+    def close_app(self, name):
+        """Terminate the first process whose name contains name"""
+        if not name.strip():
+            return False        # '' is in every name
+        try:
+            import psutil
+            for proc in psutil.process_iter(['pid', 'name']):
+                if name.lower() in (proc.info['name'] or '').lower():
+                    proc.terminate()
+                    return True
+        except Exception:
+            pass
+        return False
+
+    def open_app(self, target, known=True):
+        """Launch an application; known is False for names not in the alias table"""
+        return False
+
+    def open_url(self, url):
+        return webbrowser.open(url)
+
+    # Network
+
+    def wifi_profiles(self):
+        """Names of saved WiFi networks"""
+        return []
+
+    # Audio
+
+    def play_audio_file(self, path):
+        """Start playing an audio file without waiting for it to finish"""
+        return False
+
+    def speak(self, text):
+        """Say text with the platform's own voice; False if there is none"""
+        return False
+
+    def warm(self):
+        """Load whatever makes the first call slow (called by the warm-up stage)"""
+
+
+def choose(name='auto'):
+    """Backend name for a PLATFORM_BACKEND setting"""
+    if name != 'auto':
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown desktop backend {name!r}; expected one of {', '.join(BACKENDS)} or 'auto'")
+        return name
+    # The fake backend is never picked automatically: it reports success for
+    # everything, so without a display calls should fail visibly instead
+    return 'windows' if sys.platform == 'win32' else 'linux'
+
+
+def get():
+    """The configured backend, created on first use"""
+    global _backend
+    if _backend is None:
+        with _lock:
+            if _backend is None:
+                from settings import PLATFORM_BACKEND
+                name = choose(PLATFORM_BACKEND)
+                _backend = importlib.import_module(f"{__name__}.{name}").create()
+                if name == 'fake':
+                    print("Using the in-memory desktop backend (ASSISTANT_BACKEND=fake)")
+    return _backend
+
+
+def use(backend):
+    """Install a backend instance, e.g. a FakeBackend set up by a benchmark"""
+    global _backend
+    with _lock:
+        _backend = backend
+    return backend
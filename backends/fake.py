@@ -0,0 +1,148 @@
+"""
+In-memory desktop for headless runs: CI, load tests and benchmarks.
+
+Every operation succeeds deterministically and only changes this object, so
+the whole command pipeline (plugins, screenshots, replies) runs without a
+display, audio device or Windows. Calls are counted per operation, and delays
+can simulate how long the real operations take.
+
+    desktop = backends.use(FakeBackend(delays={'grab_screen': 0.03}))
+"""
+
+import collections
+import threading
+import time
+
+from backends import Backend
+
+
+class FakeBackend(Backend):
+    name = 'fake'
+    speech_engine = 'fake'
+
+    def __init__(self, size=(1920, 1080), windows=("Inbox - Mail", "Untitled - Notepad", "README.md - Visual Studio Code"),
+                 processes=("explorer.exe", "chrome.exe", "notepad.exe"), wifi=("HomeNetwork", "Office"), delays=None):
+        self.size = tuple(size)
+        self.volume = 50
+        self.muted = False
+        self.locked = False
+        self.windows = list(windows)            # front to back
+        self.processes = list(processes)
+        self.wifi = list(wifi)
+        self.launched = []                      # (target, known)
+        self.urls = []
+        self.played = []
+        self.spoken = []
+        self.delays = dict(delays or {})        # operation -> seconds
+        self.calls = collections.Counter()
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def _call(self, operation):
+        with self._lock:
+            self.calls[operation] += 1
+        delay = self.delays.get(operation)
+        if delay:
+            time.sleep(delay)
+
+    # Volume
+
+    def get_volume(self):
+        self._call('get_volume')
+        return self.volume
+
+    def set_volume(self, level):
+        self._call('set_volume')
+        self.volume = max(0, min(100, int(level)))
+        return True
+
+    def set_mute(self, muted=None):
+        self._call('set_mute')
+        self.muted = not self.muted if muted is None else bool(muted)
+        return True
+
+    # Screen
+
+    def screen_size(self):
+        return self.size
+
+    def grab_screen(self, region=None):
+        """The same gradient frame every time, cropped to region"""
+        self._call('grab_screen')
+        if self._frame is None:
+            from PIL import Image
+            self._frame = Image.linear_gradient('L').resize(self.size).convert('RGB')
+        if region:
+            left, top, width, height = region
+            return self._frame.crop((left, top, left + width, top + height))
+        return self._frame.copy()
+
+    def active_window_region(self):
+        width, height = self.size
+        return (width // 8, height // 8, width * 3 // 4, height * 3 // 4)
+
+    def lock_screen(self):
+        self._call('lock_screen')
+        self.locked = True
+        return True
+
+    # Windows and applications
+
+    def minimize_windows(self):
+        self._call('minimize_windows')
+        return True
+
+    def switch_window(self, name):
+        self._call('switch_window')
+        with self._lock:
+            for title in self.windows:
+                if name.lower() in title.lower():
+                    self.windows.remove(title)
+                    self.windows.insert(0, title)
+                    return True
+        return False
+
+    def close_app(self, name):
+        self._call('close_app')
+        if not name.strip():
+            return False
+        with self._lock:
+            for process in self.processes:
+                if name.lower() in process.lower():
+                    self.processes.remove(process)
+                    return True
+        return False
+
+    def open_app(self, target, known=True):
+        self._call('open_app')
+        with self._lock:
+            self.launched.append((target, known))
+            self.processes.append(target if target.endswith('.exe') else f"{target}.exe")
+        return True
+
+    def open_url(self, url):
+        self._call('open_url')
+        self.urls.append(url)
+        return True
+
+    # Network
+
+    def wifi_profiles(self):
+        self._call('wifi_profiles')
+        return list(self.wifi)
+
+    # Audio
+
+    def play_audio_file(self, path):
+        self._call('play_audio_file')
+        self.played.append(path)
+        return True
+
+    def speak(self, text):
+        self._call('speak')
+        self.spoken.append(str(text))
+        return True
+
+
+def create():
+    return FakeBackend()
@@ -0,0 +1,143 @@
+"""
+Linux desktop: command line tools that ship with most desktops.
+
+Volume goes through pactl (PulseAudio/PipeWire) or amixer (ALSA), windows
+through wmctrl, locking through loginctl or xdg-screensaver, WiFi through
+nmcli, screenshots through Pillow (X11) and speech through speech-dispatcher
+or espeak. Every tool is optional; a missing one makes its feature report
+failure instead of raising.
+"""
+
+import re
+import shutil
+import subprocess
+
+from backends import Backend
+
+# Linux equivalents of the Windows executables in plugins/aliases.py
+APPS = {
+    'notepad': 'gedit', 'calc': 'gnome-calculator', 'mspaint': 'pinta', 'winword': 'libreoffice --writer',
+    'excel': 'libreoffice --calc', 'powerpnt': 'libreoffice --impress', 'chrome': 'google-chrome',
+    'msedge': 'microsoft-edge', 'explorer': 'xdg-open .', 'cmd': 'x-terminal-emulator',
+    'powershell': 'x-terminal-emulator', 'taskmgr': 'gnome-system-monitor', 'control': 'gnome-control-center',
+    'ms-settings:': 'gnome-control-center',
+}
+
+# Audio players that can play an MP3 without a window, best first
+PLAYERS = (
+    ['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet'],
+    ['mpg123', '-q'],
+    ['mpv', '--no-video', '--really-quiet'],
+    ['xdg-open'],
+)
+
+_PERCENT = re.compile(r'(\d+)%')
+
+
+def _run(*command):
+    """stdout of a command, or None if it is missing or fails"""
+    if shutil.which(command[0]) is None:
+        return None
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+class LinuxBackend(Backend):
+    name = 'linux'
+
+    def __init__(self):
+        self.speech_engine = next((tool for tool in ('spd-say', 'espeak-ng', 'espeak') if shutil.which(tool)), None)
+
+    # Volume
+
+    def get_volume(self):
+        output = _run('pactl', 'get-sink-volume', '@DEFAULT_SINK@') or _run('amixer', 'get', 'Master')
+        match = _PERCENT.search(output or '')
+        return int(match.group(1)) if match else None
+
+    def set_volume(self, level):
+        return (_run('pactl', 'set-sink-volume', '@DEFAULT_SINK@', f'{level}%') is not None
+                or _run('amixer', '-q', 'set', 'Master', f'{level}%') is not None)
+
+    def set_mute(self, muted=None):
+        state = 'toggle' if muted is None else ('1' if muted else '0')
+        return (_run('pactl', 'set-sink-mute', '@DEFAULT_SINK@', state) is not None
+                or _run('amixer', '-q', 'set', 'Master', {'toggle': 'toggle', '1': 'mute', '0': 'unmute'}[state])
+                is not None)
+
+    # Screen
+
+    def screen_size(self):
+        """Read from xrandr or xdpyinfo, without capturing the screen; None without either"""
+        output = _run('xrandr', '--current')
+        match = output and re.search(r'current (\d+) x (\d+)', output)
+        if not match:
+            output = _run('xdpyinfo')
+            match = output and re.search(r'dimensions:\s+(\d+)x(\d+)', output)
+        if match:
+            return int(match.group(1)), int(match.group(2))
+        return None
+
+    def grab_screen(self, region=None):
+        from PIL import ImageGrab
+        bbox = None
+        if region:
+            left, top, width, height = region
+            bbox = (left, top, left + width, top + height)
+        return ImageGrab.grab(bbox=bbox)
+
+    def active_window_region(self):
+        window = _run('xdotool', 'getactivewindow', 'getwindowgeometry', '--shell')
+        if not window:
+            return None
+        values = dict(line.split('=', 1) for line in window.splitlines() if '=' in line)
+        try:
+            return (int(values['X']), int(values['Y']), int(values['WIDTH']), int(values['HEIGHT']))
+        except (KeyError, ValueError):
+            return None
+
+    def lock_screen(self):
+        return _run('loginctl', 'lock-session') is not None or _run('xdg-screensaver', 'lock') is not None
+
+    # Windows and applications
+
+    def minimize_windows(self):
+        return _run('wmctrl', '-k', 'on') is not None
+
+    def switch_window(self, name):
+        return _run('wmctrl', '-a', name) is not None
+
+    def open_app(self, target, known=True):
+        command = APPS.get(target, target).split()
+        if shutil.which(command[0]) is None:
+            return False
+        subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        return True
+
+    # Network
+
+    def wifi_profiles(self):
+        output = _run('nmcli', '-t', '-f', 'NAME,TYPE', 'connection', 'show') or ''
+        return [line.rsplit(':', 1)[0] for line in output.splitlines() if line.endswith(':802-11-wireless')]
+
+    # Audio
+
+    def play_audio_file(self, path):
+        for player in PLAYERS:
+            if shutil.which(player[0]):
+                subprocess.Popen(player + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                return True
+        return False
+
+    def speak(self, text):
+        if self.speech_engine is None:
+            return False
+        command = [self.speech_engine, '-w', text] if self.speech_engine == 'spd-say' else [self.speech_engine, text]
+        return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+
+
+def create():
+    return LinuxBackend()
@@ -0,0 +1,147 @@
+"""
+Windows desktop: pycaw for volume, pywin32 for windows and SAPI, pyautogui for
+screenshots and hotkeys. Each library is imported (and installed if missing)
+the first time it is needed.
+"""
+
+import importlib
+import os
+import subprocess
+
+from backends import Backend
+from plugins import install_package
+
+
+def _require(module, package=None):
+    """Import a module, installing its package first if it is missing"""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        install_package(package or module)
+        return importlib.import_module(module)
+
+
+class WindowsBackend(Backend):
+    name = 'windows'
+    speech_engine = 'sapi'
+
+    def __init__(self):
+        self._endpoint = None
+
+    # Volume
+
+    def _volume(self):
+        """The speakers' IAudioEndpointVolume, or None"""
+        if self._endpoint is None:
+            try:
+                pycaw = _require('pycaw.pycaw', 'pycaw')
+                from ctypes import cast, POINTER
+                from comtypes import CLSCTX_ALL
+                devices = pycaw.AudioUtilities.GetSpeakers()
+                interface = devices.Activate(pycaw.IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+                self._endpoint = cast(interface, POINTER(pycaw.IAudioEndpointVolume))
+            except Exception:
+                self._endpoint = False
+                print("Audio control not available")
+        return self._endpoint or None
+
+    def get_volume(self):
+        volume = self._volume()
+        return int(round(volume.GetMasterVolumeLevelScalar() * 100)) if volume else None
+
+    def set_volume(self, level):
+        volume = self._volume()
+        if not volume:
+            return False
+        volume.SetMasterVolumeLevelScalar(level / 100.0, None)
+        return True
+
+    def set_mute(self, muted=None):
+        volume = self._volume()
+        if not volume:
+            return False
+        volume.SetMute(not bool(volume.GetMute()) if muted is None else bool(muted), None)
+        return True
+
+    # Screen
+
+    def screen_size(self):
+        return tuple(_require('pyautogui').size())
+
+    def grab_screen(self, region=None):
+        return _require('pyautogui').screenshot(region=region)
+
+    def active_window_region(self):
+        try:
+            win32gui = _require('win32gui', 'pywin32')
+            left, top, right, bottom = win32gui.GetWindowRect(win32gui.GetForegroundWindow())
+            return (left, top, right - left, bottom - top)
+        except Exception:
+            return None
+
+    def lock_screen(self):
+        subprocess.run(["rundll32.exe", "user32.dll,LockWorkStation"])
+        return True
+
+    # Windows and applications
+
+    def minimize_windows(self):
+        _require('pyautogui').hotkey('win', 'm')
+        return True
+
+    def switch_window(self, name):
+        win32gui = _require('win32gui', 'pywin32')
+
+        def enum_window_callback(hwnd, windows):
+            if win32gui.IsWindowVisible(hwnd):
+                window_title = win32gui.GetWindowText(hwnd)
+                if name.lower() in window_title.lower():
+                    windows.append((hwnd, window_title))
+            return True
+
+        windows = []
+        win32gui.EnumWindows(enum_window_callback, windows)
+        if windows:
+            win32gui.SetForegroundWindow(windows[0][0])
+            return True
+        return False
+
+    def open_app(self, target, known=True):
+        if known:
+            subprocess.Popen(f'start {target}', shell=True)
+        else:
+            subprocess.call(['start', '', f'{target}.exe'], shell=True)
+        return True
+
+    # Network
+
+    def wifi_profiles(self):
+        result = subprocess.run(['netsh', 'wlan', 'show', 'profile'], capture_output=True, text=True)
+        if result.returncode != 0:
+            return []
+        return [line.split(':')[-1].strip() for line in result.stdout.splitlines() if 'All User Profile' in line]
+
+    # Audio
+
+    def play_audio_file(self, path):
+        os.system(f'start /min "" "{path}"')
+        return True
+
+    def speak(self, text):
+        # A voice per call: COM objects can't be shared between threads
+        sapi = _require('win32com.client', 'pywin32').Dispatch('SAPI.SpVoice')
+        sapi.Speak(text)
+        return True
+
+    def warm(self):
+        # Loads the SAPI engine and default voice; the voice itself is per thread
+        pythoncom = _require('pythoncom', 'pywin32')
+        pythoncom.CoInitialize()
+        try:
+            _require('win32com.client', 'pywin32').Dispatch('SAPI.SpVoice')
+        finally:
+            pythoncom.CoUninitialize()
+
+
+def create():
+    return WindowsBackend()
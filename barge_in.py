@@ -0,0 +1,157 @@
+"""
+Barge-in: listen while the assistant talks and stop talking when the user does.
+
+The microphone stays open during playback. Every buffer the output plays is
+recorded in a PlaybackReference, so for each microphone frame we know how loud
+the assistant itself was just before it. The microphone picks that up as echo;
+an EchoGate learns how strongly (the coupling) and only counts a frame as user
+speech when it is clearly louder than the echo estimate. A short run of such
+frames stops playback, and the rest of the phrase is captured as the next
+command.
+"""
+
+import audioop
+import collections
+import threading
+import time
+
+import speech_recognition as sr
+
+
+class PlaybackReference:
+    """Recent output levels, timestamped when written to the device"""
+
+    def __init__(self, sample_width=2, history=2.0):
+        self.sample_width = sample_width
+        self.history = history
+        self._blocks = collections.deque()   # (time written, rms)
+        self._lock = threading.Lock()
+
+    def add(self, buffer):
+        now = time.perf_counter()
+        level = audioop.rms(buffer, self.sample_width)
+        with self._lock:
+            self._blocks.append((now, level))
+            while self._blocks and self._blocks[0][0] < now - self.history:
+                self._blocks.popleft()
+
+    def level(self, start, end):
+        """Loudest output level written between start and end (perf_counter seconds)"""
+        with self._lock:
+            return max((level for t, level in self._blocks if start <= t <= end), default=0)
+
+    def clear(self):
+        with self._lock:
+            self._blocks.clear()
+
+
+class EchoGate:
+    """Tells user speech from the assistant's own voice picked up by the microphone"""
+
+    def __init__(self, reference, floor, margin=1.5, echo_tail=0.25, coupling=1.0, adapt=0.5):
+        self.reference = reference
+        self.floor = floor              # energy that counts as speech with no playback at all
+        self.margin = margin            # how far above the echo estimate speech must be
+        self.echo_tail = echo_tail      # output latency plus room reverberation, in seconds
+        self.coupling = coupling        # microphone level per unit of output level
+        self.adapt = adapt
+
+    def is_speech(self, frame, sample_width, frame_end, frame_seconds):
+        energy = audioop.rms(frame, sample_width)
+        played = self.reference.level(frame_end - frame_seconds - self.echo_tail, frame_end)
+        echo = self.coupling * played
+        if energy > max(self.floor, self.margin * echo):
+            return True
+        # Not speech: learn the coupling from frames that are echo only. It tracks the
+        # upper envelope (rises quickly, decays slowly) so echo peaks don't trigger.
+        if played > self.floor / 4:
+            ratio = energy / played
+            rate = self.adapt if ratio > self.coupling else self.adapt / 10
+            self.coupling += rate * (ratio - self.coupling)
+        return False
+
+
+class BargeInMonitor:
+    """Listens on a source during playback; calls on_speech once the user starts talking"""
+
+    def __init__(self, open_source, gate, on_speech, min_speech=0.15, pause=0.8,
+                 phrase_time_limit=10, pre_roll=0.3):
+        self.open_source = open_source  # callable returning an sr.AudioSource (e.g. sr.Microphone)
+        self.gate = gate
+        self.on_speech = on_speech
+        self.min_speech = min_speech
+        self.pause = pause
+        self.phrase_time_limit = phrase_time_limit
+        self.pre_roll = pre_roll
+        self.audio = None               # sr.AudioData of the interrupting phrase
+        self.stats = {}
+        self._triggered = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def triggered(self):
+        return self._triggered.is_set()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="barge-in")
+        self._thread.start()
+        return self
+
+    def finish(self, timeout=None):
+        """End monitoring; if the user barged in, wait for their phrase and return its audio"""
+        if not self._triggered.is_set():
+            self._stop.set()
+            if self._thread:
+                self._thread.join(0.5)
+            return None
+        if self._thread:
+            self._thread.join(timeout)
+        return self.audio
+
+    def _run(self):
+        try:
+            with self.open_source() as source:
+                self.stats['listening_since'] = time.perf_counter()
+                self._listen(source)
+        except Exception as e:
+            print(f"Barge-in monitor stopped: {e}")
+            self._stop.set()
+
+    def _listen(self, source):
+        width, rate = source.SAMPLE_WIDTH, source.SAMPLE_RATE
+        frame_seconds = float(source.CHUNK) / rate
+        needed = max(1, int(round(self.min_speech / frame_seconds)))
+        pre_roll = collections.deque(maxlen=max(needed, int(self.pre_roll / frame_seconds)))
+        run = 0
+        while not self._stop.is_set():
+            frame = source.stream.read(source.CHUNK)
+            if not frame:
+                return
+            now = time.perf_counter()
+            pre_roll.append(frame)
+            if self.gate.is_speech(frame, width, now, frame_seconds):
+                run += 1
+                if run == 1:
+                    onset = now - frame_seconds
+                if run >= needed:
+                    break
+            else:
+                run = 0
+        else:
+            return
+
+        self.stats.update(onset=onset, detected_at=time.perf_counter())
+        self._triggered.set()
+        self.on_speech()
+
+        # Playback has stopped, so plain energy endpointing is enough for the rest
+        frames = list(pre_roll)
+        silence = 0.0
+        while silence < self.pause and len(frames) * frame_seconds < self.phrase_time_limit:
+            frame = source.stream.read(source.CHUNK)
+            if not frame:
+                break
+            frames.append(frame)
+            silence = 0.0 if audioop.rms(frame, width) > self.gate.floor else silence + frame_seconds
+        self.audio = sr.AudioData(b"".join(frames), rate, width)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Alias index accuracy and lookup latency over misrecognized app and website names.
+
+Compares the old exact dictionary lookup with the fuzzy alias index on names as
+speech recognition tends to return them.
+
+    python benchmarks/bench_alias_index.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from alias_index import AliasIndex  # noqa: E402
+from plugins.aliases import APPS, WEBSITES  # noqa: E402
+
+MIN_CONFIDENCE = 0.6
+
+# (heard, table, expected alias) - expected None means it should not match
+CASES = [
+    ("you too", WEBSITES, "youtube"), ("u tube", WEBSITES, "youtube"), ("youtub", WEBSITES, "youtube"),
+    ("git hab", WEBSITES, "github"), ("get hub", WEBSITES, "github"), ("facebok", WEBSITES, "facebook"),
+    ("face books", WEBSITES, "facebook"), ("linkdin", WEBSITES, "linkedin"), ("linked inn", WEBSITES, "linkedin"),
+    ("stack over flow", WEBSITES, "stack overflow"), ("stackoverflow", WEBSITES, "stack overflow"),
+    ("g mail", WEBSITES, "gmail"), ("jimail", WEBSITES, "gmail"), ("what's app", WEBSITES, "whatsapp"),
+    ("whatsap", WEBSITES, "whatsapp"), ("instagramm", WEBSITES, "instagram"), ("insta gram", WEBSITES, "instagram"),
+    ("redit", WEBSITES, "reddit"), ("netflicks", WEBSITES, "netflix"), ("spotifi", WEBSITES, "spotify"),
+    ("twich", WEBSITES, "twitch"), ("discored", WEBSITES, "discord"), ("notion", WEBSITES, "notion"),
+    ("chat gbt", WEBSITES, "chat gpt"), ("chat g p t", WEBSITES, "chat gpt"), ("wikipedia", WEBSITES, "wikipedia"),
+    ("note pad", APPS, "notepad"), ("notepat", APPS, "notepad"), ("calculater", APPS, "calculator"),
+    ("calcu later", APPS, "calculator"), ("power point", APPS, "powerpoint"), ("exel", APPS, "excel"),
+    ("crome", APPS, "chrome"), ("google crome", APPS, "google chrome"), ("fire fox", APPS, "firefox"),
+    ("v s code", APPS, "vs code"), ("vscode", APPS, "vs code"), ("task manger", APPS, "task manager"),
+    ("power shell", APPS, "powershell"), ("control panle", APPS, "control panel"), ("setting", APPS, "settings"),
+    ("file explorer", APPS, "file explorer"), ("paint", APPS, "paint"),
+    ("blender", APPS, None), ("photoshop", APPS, None), ("hacker news", WEBSITES, None), ("bing", WEBSITES, None),
+    # Ordinary words that share a phonetic key with a name but are a different word
+    ("times", WEBSITES, None), ("sum", WEBSITES, None), ("same", WEBSITES, None), ("some", WEBSITES, None),
+    ("nation", WEBSITES, None), ("which", WEBSITES, None), ("slick", WEBSITES, None), ("weird", APPS, None),
+    ("ward", APPS, None), ("point", APPS, None), ("pint", APPS, None), ("cream", APPS, None), ("exile", APPS, None),
+]
+
+
+def main():
+    start = time.perf_counter()
+    indexes = {id(WEBSITES): AliasIndex(WEBSITES), id(APPS): AliasIndex(APPS)}
+    build_ms = (time.perf_counter() - start) * 1000
+
+    exact_correct = fuzzy_correct = 0
+    misses = []
+    for heard, table, expected in CASES:
+        exact = heard if heard in table else None
+        exact_correct += exact == expected
+        match = indexes[id(table)].lookup(heard)
+        got = match.alias if match and match.confidence >= MIN_CONFIDENCE else None
+        if got == expected or (got and expected and table[got] == table[expected]):
+            fuzzy_correct += 1
+        else:
+            misses.append((heard, expected, match))
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for heard, table, _ in CASES:
+            indexes[id(table)].lookup(heard)
+    lookup_us = (time.perf_counter() - start) / (rounds * len(CASES)) * 1e6
+
+    print(f"index build: {build_ms:.2f} ms for {len(WEBSITES) + len(APPS)} names")
+    print(f"exact lookup accuracy: {exact_correct}/{len(CASES)} ({exact_correct / len(CASES):.0%})")
+    print(f"alias index accuracy:  {fuzzy_correct}/{len(CASES)} ({fuzzy_correct / len(CASES):.0%})")
+    print(f"alias index latency:   {lookup_us:.1f} us per lookup")
+    for heard, expected, match in misses:
+        print(f"  miss: {heard!r} expected {expected!r}, got {match}")
+
+
+if __name__ == "__main__":
+    main()
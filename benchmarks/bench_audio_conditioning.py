@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Bytes uploaded and recognition latency with and without audio conditioning.
+
+Each utterance is recognized twice against a local stand-in for the Google
+endpoint that reads the upload at --uplink kbit/s and answers after
+--server-ms: once the way speech_recognition sends it (native rate, untrimmed,
+FLAC from the flac tool) and once conditioned (trimmed, 16 kHz, in-process
+FLAC). The conditioned FLAC is also decoded with the flac tool to check that
+it is lossless.
+
+Utterances are synthetic (speech-like tones and noise between the silence
+listen() keeps) unless --fixtures points at recorded fixtures.
+
+    python benchmarks/bench_audio_conditioning.py --uplink 256
+    python benchmarks/bench_audio_conditioning.py --fixtures fixtures/
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import audio_conditioning  # noqa: E402
+from fixtures import load_manifest  # noqa: E402
+
+RESPONSE = json.dumps({"result": [{"alternative": [{"transcript": "what time is it", "confidence": 0.9}],
+                                   "final": True}], "result_index": 0})
+
+
+def stub_server(uplink_kbps, server_ms):
+    """A recognition endpoint on a free port that reads uploads at uplink_kbps"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            remaining = int(self.headers.get('Content-Length', 0))
+            while remaining:
+                piece = self.rfile.read(min(remaining, 2048))
+                remaining -= len(piece)
+                time.sleep(len(piece) * 8 / (uplink_kbps * 1000))
+            time.sleep(server_ms / 1000)
+            body = ('{"result":[]}\n' + RESPONSE + '\n').encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/recognize", server
+
+
+def synthetic_utterances(count, rate, seed=7):
+    """AudioData shaped like listen() output: pre-roll, 1-3 s of speech-like sound, pause_threshold of silence"""
+    rng = np.random.default_rng(seed)
+    utterances = []
+    for _ in range(count):
+        speech_seconds = rng.uniform(1.0, 3.0)
+        t = np.arange(int(speech_seconds * rate)) / rate
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 3 * t))
+        voiced = sum(np.sin(2 * np.pi * np.cumsum(pitch * h) / rate) / h for h in range(1, 8))
+        syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None)
+        speech = 4000 * voiced * syllables + rng.normal(0, 300, len(t)) * (syllables > 0.2)
+        before = rng.normal(0, 60, int(rng.uniform(0.5, 1.0) * rate))
+        after = rng.normal(0, 60, int(0.8 * rate))
+        samples = np.clip(np.concatenate([before, speech, after]), -32768, 32767).astype('<i2')
+        utterances.append(sr.AudioData(samples.tobytes(), rate, 2))
+    return utterances
+
+
+def fixture_utterances(directory):
+    utterances = []
+    for entry in load_manifest(directory):
+        with sr.AudioFile(os.path.join(directory, entry['audio'])) as source:
+            utterances.append(sr.Recognizer().record(source))
+    return utterances
+
+
+def is_lossless(flac, samples):
+    decoder = sr.audio.get_flac_converter()
+    proc = subprocess.run([decoder, "-d", "-c", "-s", "--force-raw-format", "--endian=little", "--sign=signed", "-"],
+                          input=flac, capture_output=True)
+    return proc.returncode == 0 and np.array_equal(np.frombuffer(proc.stdout, '<i2'), samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload size and recognition latency with audio conditioning")
+    parser.add_argument("--utterances", type=int, default=10)
+    parser.add_argument("--rate", type=int, default=44100, help="capture sample rate of synthetic utterances")
+    parser.add_argument("--fixtures", metavar="DIR", help="use recorded fixtures instead of synthetic audio")
+    parser.add_argument("--uplink", type=float, default=256, help="simulated uplink in kbit/s")
+    parser.add_argument("--server-ms", type=float, default=150, help="simulated recognition time")
+    args = parser.parse_args()
+
+    utterances = fixture_utterances(args.fixtures) if args.fixtures else synthetic_utterances(args.utterances, args.rate)
+    if not utterances:
+        print("No utterances found")
+        return
+    endpoint, server = stub_server(args.uplink, args.server_ms)
+    print(f"{len(utterances)} utterances, uplink {args.uplink:g} kbit/s, server {args.server_ms:g} ms")
+
+    results = {'current': [], 'conditioned': []}
+    lossless = 0
+    for audio in utterances:
+        start = time.perf_counter()
+        plain = sr.Recognizer()
+        plain.recognize_google(audio, endpoint=endpoint)
+        elapsed = time.perf_counter() - start
+        size = len(audio.get_flac_data(convert_width=2))
+        results['current'].append((size, elapsed))
+
+        conditioned = audio_conditioning.ConditionedRecognizer()
+        start = time.perf_counter()
+        conditioned.recognize_google(audio, endpoint=endpoint)
+        elapsed = time.perf_counter() - start
+        results['conditioned'].append((conditioned.stats['bytes_uploaded'], elapsed))
+        flac, _, samples = conditioned.condition(audio)
+        lossless += is_lossless(flac, samples)
+
+    for path, rows in results.items():
+        size = statistics.median(r[0] for r in rows) / 1024
+        latency = statistics.median(r[1] for r in rows) * 1000
+        print(f"{path:<12} upload {size:7.1f} KB per utterance   recognition {latency:7.0f} ms (median)")
+    print(f"conditioned FLAC decodes losslessly: {lossless}/{len(utterances)}")
+    stats = audio_conditioning.new_stats()
+    recognizer = audio_conditioning.ConditionedRecognizer(stats=stats)
+    for audio in utterances:
+        recognizer.condition(audio)
+    print(audio_conditioning.report(stats))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
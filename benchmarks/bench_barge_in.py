@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Barge-in reaction time and false interruptions, replayed from audio fixtures.
+
+A reply is played through PCMSink into a device stand-in that consumes audio in
+real time. The "microphone" is a fixture source paced in real time that hears an
+attenuated, delayed echo of that reply, plus the user starting to talk part way
+through. Reaction time is from the user's speech onset to playback actually
+stopping. Echo-only trials count false interruptions.
+
+    python benchmarks/bench_barge_in.py --trials 10
+    python benchmarks/bench_barge_in.py --fixtures fixtures/   # recorded utterances as the user's speech
+"""
+
+import argparse
+import array
+import audioop
+import io
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_sink import PCMSink  # noqa: E402
+from barge_in import PlaybackReference, EchoGate, BargeInMonitor  # noqa: E402
+from fixtures import FixtureSource, load_manifest  # noqa: E402
+
+RATE = 16000
+
+
+class RealtimeOutput:
+    """Stands in for a sound card: write() takes as long as the audio lasts"""
+
+    def write(self, buffer):
+        time.sleep(len(buffer) / (RATE * 2))
+
+
+def babble(seconds, level, seed):
+    """Speech-like noise: syllable bursts with short gaps"""
+    rng = random.Random(seed)
+    samples = array.array('h')
+    while len(samples) < seconds * RATE:
+        length = int(RATE * rng.uniform(0.12, 0.3))
+        for i in range(length):
+            samples.append(max(-32768, min(32767, int(rng.gauss(0, level) * math.sin(math.pi * i / length)))))
+        samples.extend([0] * int(RATE * rng.uniform(0.02, 0.08)))
+    return samples[:int(seconds * RATE)].tobytes()
+
+
+def mix(*parts):
+    """Sum (offset_seconds, pcm) parts into one buffer"""
+    total = max(int(offset * RATE) * 2 + len(pcm) for offset, pcm in parts)
+    out = b"\x00" * total
+    for offset, pcm in parts:
+        start = int(offset * RATE) * 2
+        padded = b"\x00" * start + pcm + b"\x00" * (total - start - len(pcm))
+        out = audioop.add(out, padded, 2)
+    return out
+
+
+def wav_bytes(pcm):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(pcm)
+    buffer.seek(0)
+    return buffer
+
+
+def load_fixture_speech(directory):
+    """Recorded utterances from a fixture directory, as 16 kHz mono PCM"""
+    speech = []
+    for entry in load_manifest(directory):
+        with wave.open(os.path.join(directory, entry['wav']), "rb") as w:
+            pcm, width, rate = w.readframes(w.getnframes()), w.getsampwidth(), w.getframerate()
+            if w.getnchannels() == 2:
+                pcm = audioop.tomono(pcm, width, 0.5, 0.5)
+        pcm = audioop.lin2lin(pcm, width, 2) if width != 2 else pcm
+        if rate != RATE:
+            pcm = audioop.ratecv(pcm, 2, 1, rate, RATE, None)[0]
+        speech.append(pcm)
+    return speech
+
+
+def trial(reply, user, args, seed):
+    """Play reply with the user (or nobody if user is None) talking over it; returns (interrupted, reaction)"""
+    echo = audioop.mul(reply, 2, args.coupling)
+    noise = babble(len(reply) / (RATE * 2) + 1, 40, seed + 1000)
+    parts = [(args.echo_delay, echo), (0, noise)]
+    if user is not None:
+        parts.append((args.offset, user))
+    mic = mix(*parts)
+
+    reference = PlaybackReference()
+    sink = PCMSink(sample_rate=RATE, frames_per_buffer=args.buffer, output=RealtimeOutput(), reference=reference)
+    gate = EchoGate(reference, floor=args.threshold, margin=args.margin, echo_tail=args.echo_tail)
+    monitor = BargeInMonitor(lambda: FixtureSource(wav_bytes(mic)), gate, on_speech=sink.stop,
+                             min_speech=args.min_speech).start()
+    deadline = time.perf_counter() + 1
+    while 'listening_since' not in monitor.stats and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    sink.play([reply])
+    monitor.finish(timeout=5)
+    if not monitor.triggered:
+        return False, None
+    onset = monitor.stats['listening_since'] + args.offset
+    return True, (sink.stopped_at or monitor.stats['detected_at']) - onset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Barge-in reaction time benchmark")
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--fixtures", metavar="DIR", help="use recorded utterances as the user's speech")
+    parser.add_argument("--reply-seconds", type=float, default=4.0)
+    parser.add_argument("--offset", type=float, default=1.5, help="seconds into the reply the user starts talking")
+    parser.add_argument("--coupling", type=float, default=0.4, help="echo level relative to the played reply")
+    parser.add_argument("--echo-delay", type=float, default=0.06)
+    parser.add_argument("--threshold", type=int, default=300, help="energy floor for speech")
+    parser.add_argument("--margin", type=float, default=1.5)
+    parser.add_argument("--echo-tail", type=float, default=0.25)
+    parser.add_argument("--min-speech", type=float, default=0.15)
+    parser.add_argument("--buffer", type=int, default=1024, help="output frames per buffer")
+    args = parser.parse_args()
+
+    speech = load_fixture_speech(args.fixtures) if args.fixtures else []
+    reactions, missed, false_stops = [], 0, 0
+    for i in range(args.trials):
+        reply = babble(args.reply_seconds, 6000, seed=i)
+        user = speech[i % len(speech)] if speech else babble(1.5, 8000, seed=100 + i)
+        interrupted, reaction = trial(reply, user, args, seed=i)
+        if interrupted:
+            reactions.append(reaction * 1000)
+        else:
+            missed += 1
+        false_stops += trial(reply, None, args, seed=i)[0]
+
+    if reactions:
+        print(f"reaction: median {statistics.median(reactions):6.1f} ms   max {max(reactions):6.1f} ms   "
+              f"(needs {args.min_speech * 1000:.0f} ms of speech, mic frames of {1024 / RATE * 1000:.0f} ms, "
+              f"stops within one {args.buffer / RATE * 1000:.0f} ms output buffer)")
+    print(f"missed interruptions: {missed}/{args.trials}   false interruptions (echo only): {false_stops}/{args.trials}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Compound command splitting and execution latency.
+
+Checks how a set of multi-request utterances is split, times plan() per
+utterance, then runs the plans with simulated handler latencies (a network
+lookup takes longer than a volume change) on a thread pool, the way main.py
+does, against running the parts one after another.
+
+    python benchmarks/bench_compound.py --rounds 5
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import compound  # noqa: E402
+import plugins  # noqa: E402
+
+# utterance -> expected waves of sub-commands
+CASES = {
+    "set volume to 30 and take a screenshot and what's the weather in paris":
+        [["set volume to 30", "take a screenshot", "what's the weather in paris"]],
+    "mute the volume and take a screenshot then save it":
+        [["mute the volume", "take a screenshot"], ["save the screenshot"]],
+    "set a timer for an hour and a half and what time is it":
+        [["set a timer for an hour and a half", "what time is it"]],
+    "add milk and eggs to do list and read it":
+        [["add milk and eggs to do list"], ["read my to do list"]],
+    "what time is it, take a screenshot, and lock screen":
+        [["what time is it", "take a screenshot"], ["lock screen"]],
+    "weather in london and weather in tokyo and search the web for flight prices":
+        [["weather in london", "weather in tokyo", "search the web for flight prices"]],
+    "privacy mode on and then what time is it":
+        [["privacy mode on"], ["what time is it"]],
+    "take a screenshot and goodbye":
+        [["take a screenshot"], ["goodbye"]],
+    "search the web for salt and pepper": None,
+    "add milk and eggs to do list": None,
+    "what time is it": None,
+}
+
+# Simulated handler time per intent, in seconds
+LATENCY = {'weather': 0.6, 'web_answer': 0.8, 'wikipedia': 0.5, 'screenshot': 0.15, 'save_screenshot': 0.05,
+           'volume': 0.03, 'lock_screen': 0.02}
+
+
+def simulated(command):
+    rule = plugins.match(command)
+    time.sleep(LATENCY.get(rule.intent, 0.005) if rule else 0.005)
+    return command
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compound command splitting and latency")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    correct = 0
+    for utterance, expected in CASES.items():
+        waves = compound.plan(utterance, plugins.match)
+        got = [[step.command for step in wave] for wave in waves] if waves else None
+        correct += got == expected
+        if got != expected:
+            print(f"  MISMATCH {utterance!r}: {got}")
+    print(f"splits as expected: {correct}/{len(CASES)}")
+
+    rounds = 2000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for utterance in CASES:
+            compound.plan(utterance, plugins.match)
+    print(f"plan(): {(time.perf_counter() - start) / (rounds * len(CASES)) * 1e6:.1f} us per utterance")
+
+    pool = ThreadPoolExecutor(max_workers=4)
+    for utterance in CASES:
+        waves = compound.plan(utterance, plugins.match)
+        if not waves:
+            continue
+        steps = [step.command for wave in waves for step in wave]
+        sequential = concurrent = 0.0
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            for command in steps:
+                simulated(command)
+            sequential += time.perf_counter() - start
+            start = time.perf_counter()
+            compound.execute(waves, simulated, pool)
+            concurrent += time.perf_counter() - start
+        slowest = sum(max(LATENCY.get(step.rule.intent, 0.005) for step in wave) for wave in waves)
+        print(f"{utterance[:52]:<52} sequential {sequential / args.rounds * 1000:>5.0f} ms   "
+              f"compound {concurrent / args.rounds * 1000:>5.0f} ms   (slowest path {slowest * 1000:.0f} ms)")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
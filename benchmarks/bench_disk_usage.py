@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Disk usage scan throughput on a synthetic directory tree.
+
+Builds a tree of sparse files in a temporary folder, then compares a sequential
+os.walk with the threaded scanner at several worker counts (full scans), an
+incremental refresh with nothing changed, one after a few folders changed, and
+query latency on the finished tree.
+
+With a warm OS cache a scan is CPU bound and extra workers help little;
+--listing-delay adds a simulated wait per folder listing (a cold disk or network
+share), which is where the thread pool pays off.
+
+    python benchmarks/bench_disk_usage.py --dirs 3000 --files-per-dir 15
+    python benchmarks/bench_disk_usage.py --listing-delay 2
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from disk_usage import DiskUsage, human_size  # noqa: E402
+
+
+def build_tree(root, dirs, files_per_dir, seed=0):
+    """Random tree of sparse files (sizes from bytes to a few GB, no disk space used)"""
+    rng = random.Random(seed)
+    folders = [root]
+    for i in range(dirs):
+        folder = os.path.join(rng.choice(folders[-50:] + folders[:5]), f"dir{i}")
+        os.mkdir(folder)
+        folders.append(folder)
+    for folder in folders:
+        for j in range(files_per_dir):
+            with open(os.path.join(folder, f"file{j}.bin"), "wb") as f:
+                f.truncate(int(rng.lognormvariate(10, 3)) % (4 * 1024 ** 3))
+    return folders
+
+
+class SlowDisk(DiskUsage):
+    """Scanner whose folder listings wait delay seconds, like a cold disk"""
+
+    delay = 0.0
+
+    def _list(self, path, cached, full):
+        time.sleep(self.delay)
+        return super()._list(path, cached, full)
+
+
+def sequential_walk(root, delay=0.0):
+    total = entries = 0
+    for folder, subdirs, names in os.walk(root):
+        time.sleep(delay)
+        entries += len(subdirs) + len(names)
+        for name in names:
+            total += os.lstat(os.path.join(folder, name)).st_size
+    return total, entries
+
+
+def timed(function, rounds):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Disk usage scan throughput")
+    parser.add_argument("--dirs", type=int, default=3000)
+    parser.add_argument("--files-per-dir", type=int, default=15)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--listing-delay", type=float, default=0.0, help="simulated ms per folder listing")
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="disk_usage_bench_")
+    try:
+        root = os.path.join(base, "tree")
+        os.mkdir(root)
+        folders = build_tree(root, args.dirs, args.files_per_dir)
+        total, entries = sequential_walk(root)
+        print(f"tree: {len(folders):,} folders, {entries:,} entries, {human_size(total)} (sparse)")
+        SlowDisk.delay = args.listing_delay / 1000
+        if SlowDisk.delay:
+            print(f"full scans wait {args.listing_delay} ms per folder listing")
+        else:
+            print("(folder listings are in the OS cache after the first pass, so full scans are CPU bound)")
+
+        seconds = timed(lambda: sequential_walk(root, SlowDisk.delay), args.rounds)
+        print(f"{'os.walk + lstat':<28} {seconds * 1000:>9.1f} ms {entries / seconds:>12,.0f} entries/s")
+        for workers in args.workers:
+            scanner = SlowDisk([root], workers=workers)
+            seconds = timed(lambda: scanner.refresh(full=True), args.rounds)
+            assert scanner.total() == total, (scanner.total(), total)
+            print(f"{f'scandir, {workers} workers':<28} {seconds * 1000:>9.1f} ms {entries / seconds:>12,.0f} entries/s")
+
+        cache_file = os.path.join(base, "disk_usage.json")
+        scanner = DiskUsage([root], cache_file=cache_file, workers=max(args.workers))
+        scanner.refresh()
+        seconds = timed(scanner.refresh, args.rounds)
+        print(f"{'refresh, nothing changed':<28} {seconds * 1000:>9.1f} ms "
+              f"({scanner.stats['reused']:,} reused, {scanner.stats['listed']} listed)")
+        for i, folder in enumerate(random.Random(1).sample(folders, 10)):
+            open(os.path.join(folder, f"new{i}.bin"), "wb").close()
+        seconds = timed(scanner.refresh, 1)
+        print(f"{'refresh, 10 folders changed':<28} {seconds * 1000:>9.1f} ms "
+              f"({scanner.stats['reused']:,} reused, {scanner.stats['listed']} listed)")
+
+        start = time.perf_counter()
+        loaded = DiskUsage([root], cache_file=cache_file)
+        loaded.load()
+        print(f"{'load saved tree':<28} {(time.perf_counter() - start) * 1000:>9.1f} ms "
+              f"({os.path.getsize(cache_file) / 1024:,.0f} KB)")
+
+        folder = loaded.find(os.path.basename(folders[len(folders) // 2]))
+        queries = {
+            'largest folders': lambda: loaded.largest_folders(count=5),
+            'largest folders in one': lambda: loaded.largest_folders(folder, count=5),
+            'files over 1 GB': lambda: loaded.large_files(1024 ** 3, count=10),
+            'find folder by name': lambda: loaded.find("dir1234"),
+        }
+        for name, query in queries.items():
+            rounds = 1000
+            start = time.perf_counter()
+            for _ in range(rounds):
+                query()
+            print(f"{'query: ' + name:<28} {(time.perf_counter() - start) / rounds * 1e6:>9.1f} us")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
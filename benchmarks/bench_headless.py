@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+The whole command pipeline on the in-memory desktop backend, no display needed.
+
+Runs desktop commands (volume, screenshots, lock, windows, apps, websites,
+WiFi) next to core ones through main.run_command_captured, the way batch mode
+does, and reports latency per intent, failures, and what the fake desktop was
+asked to do. --delay adds simulated operating system latency to every desktop
+call, e.g. to see the effect of compound commands running parts at once.
+
+    python benchmarks/bench_headless.py --rounds 20
+    python benchmarks/bench_headless.py --delay 0.02
+"""
+
+import argparse
+import collections
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ["ASSISTANT_BACKEND"] = "fake"
+os.environ.setdefault("ASSISTANT_METRICS_PORT", "0")
+
+import backends  # noqa: E402
+from backends.fake import FakeBackend  # noqa: E402
+
+COMMANDS = [
+    "set volume to 30",
+    "what is the volume",
+    "take a screenshot",
+    "take a screenshot of the left half",
+    "save the last screenshot as jpeg",
+    "lock screen",
+    "minimize all windows",
+    "switch to mail",
+    "close application chrome",
+    "open calculator",
+    "open website youtube",
+    "google search python",
+    "wifi",
+    "what time is it",
+    "convert 5 miles to km",
+    "set volume to 20 and take a screenshot then save it",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless pipeline latency on the in-memory desktop")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every desktop call")
+    args = parser.parse_args()
+
+    operations = ('set_volume', 'get_volume', 'set_mute', 'grab_screen', 'lock_screen', 'minimize_windows',
+                  'switch_window', 'close_app', 'open_app', 'open_url', 'wifi_profiles')
+    desktop = backends.use(FakeBackend(delays={op: args.delay for op in operations}))
+
+    workdir = tempfile.mkdtemp(prefix="bench_headless_")
+    os.chdir(workdir)
+    start = time.perf_counter()
+    import main as assistant
+    assistant.batch_mode = True
+    print(f"startup: {(time.perf_counter() - start) * 1000:.0f} ms (working in {workdir})")
+
+    import plugins
+    latencies = collections.defaultdict(list)
+    failures = []
+    for _ in range(args.rounds):
+        for command in COMMANDS:
+            rule = plugins.match(command)
+            intent = rule.intent if rule else "unknown"
+            if " and " in command:
+                intent = "compound"
+            result = assistant.run_command_captured(command)
+            latencies[intent].append(result['elapsed_ms'])
+            if result['status'] == "error" or not result['responses']:
+                failures.append((command, result.get('error') or result['responses']))
+
+    print(f"\n{'intent':<20}{'median ms':>10}{'max ms':>10}")
+    for intent, samples in latencies.items():
+        print(f"{intent:<20}{statistics.median(samples):>10.2f}{max(samples):>10.2f}")
+    print(f"\nfailures: {len(failures)}")
+    for command, detail in failures[:5]:
+        print(f"  {command!r}: {detail}")
+    print(f"desktop calls: {dict(sorted(desktop.calls.items()))}")
+    print(f"volume {desktop.volume}, locked {desktop.locked}, {len(desktop.urls)} URLs opened, "
+          f"{len(desktop.launched)} apps launched, {len(os.listdir(workdir))} files written")
+
+
+if __name__ == "__main__":
+    main()
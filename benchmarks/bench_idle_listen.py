@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+CPU use and wake-up latency of idle listening over an hour of mostly silence.
+
+An hour (--minutes) of room audio is replayed as fast as it can be read: low
+background noise, a fan that runs for a while, door slams and other short
+bangs, and a few spoken phrases. It is listened to two ways:
+
+    current   the loop continuous_listen ran before: calibrate for 0.5 s,
+              then Recognizer.listen() with LISTEN_TIMEOUT, again and again
+    idle      IdleListener's energy gate, capturing each phrase that wakes it
+
+CPU is process time per second of audio, after subtracting what reading the
+replayed audio itself costs, so it is the share of one core the listener
+would take in real time. The current loop also opens the microphone every
+cycle, and sr.Microphone() initializes PortAudio twice on each open (the
+device scan is the expensive part); with PyAudio installed that cost is
+measured and added, otherwise pass --open-ms. Reads per second are how
+often the listening thread wakes up. The current loop reads 1024-sample
+chunks at the device rate (--device-rate), so its reads are replayed at
+that pace. Wake-up latency is from the start of a phrase to the end of the
+block in which the gate opened.
+
+    python benchmarks/bench_idle_listen.py
+    python benchmarks/bench_idle_listen.py --minutes 10 --phrases 10 --block 0.05
+    python benchmarks/bench_idle_listen.py --open-ms 40
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from idle_listen import IdleListener  # noqa: E402
+
+
+class ReplaySource(sr.AudioSource):
+    """An endless-looking microphone over a precomputed recording"""
+
+    def __init__(self, samples, rate, chunk=1024):
+        self.SAMPLE_RATE = rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk
+        self.samples = samples
+        self.offset = 0
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def read(self, size):
+        piece = self.samples[self.offset:self.offset + size]
+        self.offset += len(piece)
+        return piece.tobytes()
+
+    @property
+    def seconds(self):
+        return self.offset / self.SAMPLE_RATE
+
+
+def room_audio(minutes, phrases, bangs, rate, seed=11):
+    """(int16 samples, [(phrase start, end)], [bang start]) for a mostly quiet room"""
+    rng = np.random.default_rng(seed)
+    total = int(minutes * 60 * rate)
+    audio = rng.normal(0, 60, total).astype(np.float32)
+    # A fan runs for a sixth of the time
+    fan_start = int(total * 0.4)
+    fan = slice(fan_start, fan_start + total // 6)
+    audio[fan] += rng.normal(0, 200, fan.stop - fan.start).astype(np.float32)
+
+    def place(length):
+        while True:
+            start = int(rng.uniform(1, minutes * 60 - 15) * rate)
+            if all(start + length < s or start > e for s, e in taken):
+                taken.append((start, start + length))
+                return start
+
+    taken = []
+    spoken = []
+    for _ in range(phrases):
+        seconds = rng.uniform(1.0, 3.0)
+        t = np.arange(int(seconds * rate)) / rate
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 3 * t))
+        voiced = sum(np.sin(2 * np.pi * np.cumsum(pitch * h) / rate) / h for h in range(1, 8))
+        syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None)
+        level = rng.uniform(1500, 4000)         # across the room to close by
+        speech = level * voiced * syllables + rng.normal(0, level / 12, len(t)) * (syllables > 0.2)
+        start = place(len(t) + rate)
+        audio[start:start + len(t)] += speech
+        spoken.append((start / rate, (start + len(t)) / rate))
+    banged = []
+    for _ in range(bangs):
+        length = int(rng.uniform(0.03, 0.08) * rate)
+        start = place(length + rate)
+        bang = rng.normal(0, rng.uniform(3000, 12000), length) * np.exp(-np.arange(length) / (length / 3))
+        audio[start:start + length] += bang
+        banged.append(start / rate)
+    samples = np.clip(audio, -32768, 32767).astype('<i2')
+    return samples, sorted(spoken), banged
+
+
+def drain(samples, rate, size):
+    """Process seconds spent only reading the replay in pieces of size samples"""
+    source = ReplaySource(samples, rate)
+    start = time.process_time()
+    while source.read(size):
+        pass
+    return time.process_time() - start
+
+
+def microphone_open_ms():
+    """Process time of opening and closing the default microphone, or None without PyAudio"""
+    try:
+        times = []
+        for _ in range(3):
+            start = time.process_time()
+            with sr.Microphone():
+                pass
+            times.append(time.process_time() - start)
+        return statistics.median(times) * 1000
+    except Exception:
+        return None
+
+
+def run_current(samples, rate, chunk, timeout, phrase_time_limit):
+    source = ReplaySource(samples, rate, chunk)
+    r = sr.Recognizer()
+    r.energy_threshold = 4000
+    r.dynamic_energy_threshold = True
+    captured = []
+    cycles = 0
+    start = time.process_time()
+    while source.offset < len(samples):
+        cycles += 1
+        r.adjust_for_ambient_noise(source, duration=0.5)
+        try:
+            audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+        except sr.WaitTimeoutError:
+            continue
+        end = source.seconds
+        captured.append((end - len(audio.frame_data) / (2 * rate), end))
+    return time.process_time() - start, captured, cycles
+
+
+def run_idle(samples, rate, block):
+    source = ReplaySource(samples, rate)
+    listener = IdleListener(lambda: source, block_seconds=block)
+    wakes = []
+    start = time.process_time()
+    while True:
+        opened_at = source.seconds
+        audio = listener.wait()
+        if audio is None:
+            break
+        wakes.append((opened_at + listener.woke_at, source.seconds - len(audio.frame_data) / (2 * rate)))
+    return time.process_time() - start, wakes, listener.stats
+
+
+def matches(spoken, times):
+    """For each phrase, the first time that falls inside it (or None); and times that fall in none"""
+    found, stray = {}, []
+    for t in times:
+        phrase = next(((s, e) for s, e in spoken if s - 0.5 <= t <= e + 1.0), None)
+        if phrase is None:
+            stray.append(t)
+        elif phrase not in found:
+            found[phrase] = t
+    return found, stray
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle listening CPU and wake-up latency")
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--phrases", type=int, default=20, help="spoken phrases in the recording")
+    parser.add_argument("--bangs", type=int, default=40, help="door slams and other short noises")
+    parser.add_argument("--rate", type=int, default=16000)
+    parser.add_argument("--block", type=float, default=0.1, help="seconds read per wake-up of the idle thread")
+    parser.add_argument("--listen-timeout", type=float, default=5)
+    parser.add_argument("--device-rate", type=int, default=44100, help="microphone rate of the current loop")
+    parser.add_argument("--open-ms", type=float, help="CPU ms per microphone open (measured with PyAudio)")
+    args = parser.parse_args()
+    open_ms = args.open_ms if args.open_ms is not None else microphone_open_ms()
+
+    samples, spoken, banged = room_audio(args.minutes, args.phrases, args.bangs, args.rate)
+    seconds = len(samples) / args.rate
+    print(f"{seconds / 60:.0f} min of audio at {args.rate} Hz, {len(spoken)} phrases, {len(banged)} bangs, "
+          f"speech {sum(e - s for s, e in spoken) / seconds:.2%} of the time")
+
+    def cpu_line(name, cpu, opens, reads):
+        line = f"{name:<8} listening {cpu / seconds:7.3%} of a core"
+        if open_ms is not None:
+            line += f"   with microphone opens {(cpu + opens * open_ms / 1000) / seconds:7.3%}"
+        return line + f"   {opens / seconds * 3600:5.0f} opens/h   {reads / seconds:3.0f} reads/s"
+
+    chunk = max(1, int(round(1024 * args.rate / args.device_rate)))
+    cpu, captured, cycles = run_current(samples, args.rate, chunk, args.listen_timeout, 10)
+    cpu -= drain(samples, args.rate, chunk)
+    found, stray = matches(spoken, [start for start, _ in captured])
+    print(cpu_line("current", cpu, cycles, len(samples) / chunk))
+    print(f"{'':<8} phrases captured {len(found)}/{len(spoken)}, other captures {len(stray)}")
+
+    cpu, wakes, stats = run_idle(samples, args.rate, args.block)
+    cpu -= drain(samples, args.rate, int(args.rate * 0.02) * max(1, int(round(args.block / 0.02))))
+    found, stray = matches(spoken, [woke for woke, _ in wakes])
+    latency = [(found[p] - p[0]) * 1000 for p in spoken if p in found]
+    print(cpu_line("idle", cpu, stats['wakes'] + 1, len(samples) / (args.rate * args.block)))
+    print(f"{'':<8} phrases woken {len(found)}/{len(spoken)}, false wakes {len(stray)}")
+    if open_ms is None:
+        print("(PyAudio not available: microphone open cost not included, pass --open-ms to add it)")
+    if latency:
+        print(f"wake-up latency {statistics.median(latency):.0f} ms median, {max(latency):.0f} ms worst "
+              f"(from the start of the phrase)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Per-event cost of recording metrics, and the cost of a scrape.
+
+Times counter increments, labelled increments, histogram observations and the
+timer context manager on one thread and on several threads at once, then
+renders a registry of about the size main.py builds.
+
+    python benchmarks/bench_metrics.py --events 1000000 --threads 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import metrics  # noqa: E402
+
+
+def per_event(function, events):
+    start = time.perf_counter()
+    for _ in range(events):
+        function()
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(events):
+        pass
+    return (elapsed - (time.perf_counter() - start)) / events
+
+
+def threaded(function, events, threads):
+    """Seconds per event per thread with threads recording at once"""
+    results = []
+
+    def run():
+        results.append(per_event(function, events))
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(results) / len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrics recording overhead")
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    registry = metrics.Registry()
+    count = metrics.counter('bench_total', "Counter", registry=registry)
+    labelled = metrics.counter('bench_labelled_total', "Labelled counter", ['backend'], registry=registry)
+    seconds = metrics.histogram('bench_seconds', "Histogram", registry=registry)
+    child = labelled.labels('sapi')
+
+    def timed_block():
+        with seconds.time():
+            pass
+
+    cases = [
+        ("counter.inc()", count.inc),
+        ("child.inc() (label kept)", child.inc),
+        ("counter.labels(x).inc()", lambda: labelled.labels('sapi').inc()),
+        ("histogram.observe()", lambda: seconds.observe(0.03)),
+        ("with histogram.time()", timed_block),
+    ]
+    print(f"{'event':<28} {'1 thread':>10} {f'{args.threads} threads':>12}")
+    for name, function in cases:
+        single = per_event(function, args.events)
+        contended = threaded(function, args.events // args.threads, args.threads)
+        print(f"{name:<28} {single * 1e9:>8.0f} ns {contended * 1e9:>10.0f} ns")
+    expected = args.events + (args.events // args.threads) * args.threads
+    print(f"counter total {count._default.value:,} (expected {expected:,})")
+
+    # A registry the size of main.py's: a dozen metrics with a few labels each
+    for i in range(12):
+        metric = metrics.histogram(f'scrape_{i}_seconds', "Histogram", ['plugin'], registry=registry)
+        for plugin in ('core', 'files', 'productivity', 'web', 'weather'):
+            metric.labels(plugin).observe(0.01 * i)
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        text = registry.render()
+    print(f"render: {(time.perf_counter() - start) / rounds * 1000:.2f} ms for {len(text.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
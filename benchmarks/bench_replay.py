@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency from recorded audio fixtures (no microphone needed).
+
+Replays a fixture directory recorded with `python main.py --record-fixtures DIR`
+through the listening and command path several times and reports per-stage
+latency. --save writes the medians as a baseline and --baseline compares a run
+against one, flagging stages that got slower. --synthesize creates a small
+fixture set of synthetic utterances for trying this out offline.
+
+    python benchmarks/bench_replay.py fixtures/ --rounds 3 --offline
+    python benchmarks/bench_replay.py /tmp/fx --synthesize --offline --save baseline.json
+"""
+
+import argparse
+import array
+import io
+import json
+import math
+import os
+import random
+import statistics
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+import speech_recognition as sr  # noqa: E402
+
+import main  # noqa: E402
+from fixtures import FixtureRecorder, STAGES, summarize  # noqa: E402
+
+SYNTHETIC_COMMANDS = [
+    ("hello", "greeting"),
+    ("what time is it", "time"),
+    ("generate password 12", "generate_password"),
+    ("what can you do help", "help"),
+    ("tell me the time please", "time"),
+]
+
+
+def synthetic_utterance(text, rate=16000, seed=0):
+    """Noise bursts shaped like syllables, one per word, with short gaps"""
+    rng = random.Random(seed)
+    samples = array.array('h', (int(rng.gauss(0, 60)) for _ in range(int(rate * 0.3))))
+    for word in text.split():
+        length = int(rate * (0.12 + 0.04 * len(word)))
+        for i in range(length):
+            envelope = math.sin(math.pi * i / length)
+            samples.append(max(-32768, min(32767, int(rng.gauss(0, 9000) * envelope))))
+        samples.extend(int(rng.gauss(0, 60)) for _ in range(int(rate * 0.08)))
+    samples.extend(int(rng.gauss(0, 60)) for _ in range(int(rate * 0.3)))
+    return sr.AudioData(samples.tobytes(), rate, 2)
+
+
+def synthesize(directory):
+    recorder = FixtureRecorder(directory)
+    for seed, (text, intent) in enumerate(SYNTHETIC_COMMANDS):
+        recorder.record(synthetic_utterance(text, seed=seed), text, intent=intent)
+    print(f"wrote {len(SYNTHETIC_COMMANDS)} synthetic fixtures to {directory}")
+
+
+def medians(results):
+    return {stage: statistics.median(r['timings'][stage] for r in results if stage in r['timings'])
+            for stage in STAGES + ('total',) if any(stage in r['timings'] for r in results)}
+
+
+def run():
+    parser = argparse.ArgumentParser(description="Replay audio fixtures and report stage latencies")
+    parser.add_argument("directory")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--offline", action="store_true", help="use recorded transcripts instead of recognition")
+    parser.add_argument("--fast", action="store_true", help="don't pace audio to real time")
+    parser.add_argument("--synthesize", action="store_true", help="create synthetic fixtures first")
+    parser.add_argument("--save", metavar="FILE", help="write stage medians as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare stage medians with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize(args.directory)
+
+    results = []
+    for _ in range(args.rounds):
+        results += main.run_replay(args.directory, realtime=not args.fast, offline=args.offline, output=io.StringIO())
+    if not results:
+        return 1
+
+    print(summarize(results))
+    current = medians(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = 0
+        for stage, seconds in current.items():
+            before = baseline.get(stage)
+            if not before:
+                continue
+            change = (seconds - before) / before
+            flag = "  REGRESSION" if change > args.tolerance else ""
+            regressions += bool(flag)
+            print(f"{stage:<10} {before * 1000:8.1f} -> {seconds * 1000:8.1f} ms ({change:+.0%}){flag}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Screenshot pipeline benchmark with synthetic frames (no display needed).
+
+Reports how long the caller waits per capture with the background encoder
+compared with the old synchronous PNG save, and the encoder's cost per frame for
+each output format.
+
+    python benchmarks/bench_screenshots.py --frames 20 --size 1920x1080
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PIL import Image  # noqa: E402
+
+from screenshots import ScreenshotPipeline  # noqa: E402
+
+
+def synthetic_frame(width, height, seed):
+    """A desktop-like frame: flat panels with some noisy 'text' blocks"""
+    rng = random.Random(seed)
+    image = Image.new("RGB", (width, height), (rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    for _ in range(40):
+        w, h = rng.randrange(50, width // 2), rng.randrange(20, height // 3)
+        block = Image.effect_noise((w, h), rng.randrange(10, 80)).convert("RGB")
+        image.paste(block, (rng.randrange(width - w), rng.randrange(height - h)))
+    return image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screenshot pipeline benchmark")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--size", default="1920x1080")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    frames = [synthetic_frame(width, height, seed) for seed in range(4)]
+    grab = lambda region=None: frames[random.randrange(len(frames))]  # noqa: E731
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        # Baseline: grab and save a full-compression PNG on the caller's thread
+        start = time.perf_counter()
+        for i in range(args.frames):
+            grab().save(os.path.join(out_dir, f"sync_{i}.png"))
+        sync_ms = (time.perf_counter() - start) / args.frames * 1000
+        print(f"synchronous PNG save           caller waits {sync_ms:8.2f} ms/frame")
+
+        for fmt, level in (("png", 1), ("png", 6), ("jpeg", 1), ("webp", 0)):
+            pipeline = ScreenshotPipeline(grab, fmt=fmt, compress_level=level, output_dir=out_dir)
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                pipeline.capture()
+                time.sleep(0.001)  # distinct timestamps for filenames
+            caller_ms = ((time.perf_counter() - start) / args.frames - 0.001) * 1000
+            pipeline.flush()
+            encode_ms = pipeline.stats['encode_seconds'] / max(1, pipeline.stats['encoded']) * 1000
+            sizes = [os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir)
+                     if f.startswith("screenshot_")]
+            print(f"pipeline {fmt:<5} level {level}         caller waits {caller_ms:8.2f} ms/frame   "
+                  f"encode {encode_ms:8.2f} ms/frame   {sum(sizes) / max(1, len(sizes)) / 1024:8.1f} KiB/file")
+            for f in os.listdir(out_dir):
+                if f.startswith("screenshot_"):
+                    os.remove(os.path.join(out_dir, f))
+
+
+if __name__ == "__main__":
+    main()
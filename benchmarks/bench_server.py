@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Server mode load test: throughput and latency at increasing client counts.
+
+By default an in-process server is started on a free port with the weather
+lookup replaced by a simulated one (--lookup-delay seconds), so the effect of
+the shared lookup cache shows up without API keys. Use --url to load an
+already running server instead (python main.py --serve).
+
+    python benchmarks/bench_server.py --clients 1 2 4 8 16 --requests 50
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+COMMANDS = [
+    "hello",
+    "what time is it",
+    "generate password 12",
+    "weather in paris",
+    "weather in london",
+    "weather in tokyo",
+]
+
+
+def start_local_server(workers, lookup_delay):
+    """Serve main.run_command_captured on a free port; returns (url, server, fetch counter)"""
+    import main
+    from server import AssistantServer
+
+    fetches = []
+
+    def fake_weather(city):
+        fetches.append(city)
+        time.sleep(lookup_delay)
+        return {"cod": 200, "main": {"temp": 18, "humidity": 60}, "weather": [{"description": "light rain"}]}
+
+    weather = main.plugins.load('weather')
+    weather.OPENWEATHER_API_KEY = "benchmark"
+    weather.fetch_weather = fake_weather
+    main.batch_mode = True
+
+    server = AssistantServer(("127.0.0.1", 0), main.run_command_captured, workers=workers)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server, fetches
+
+
+def client(url, name, count, latencies, errors):
+    http = requests.Session()
+    for i in range(count):
+        start = time.perf_counter()
+        try:
+            response = http.post(f"{url}/command", json={'text': COMMANDS[i % len(COMMANDS)], 'session': name},
+                                 timeout=30)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(name)
+
+
+def run_level(url, clients, count):
+    latencies, errors = [], []
+    threads = [threading.Thread(target=client, args=(url, f"bench-{clients}-{n}", count, latencies, errors))
+               for n in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for main.py --serve")
+    parser.add_argument("--url", help="server to load (default: start one in-process)")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--requests", type=int, default=30, help="commands per client")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookup-delay", type=float, default=0.3, help="simulated weather lookup time")
+    args = parser.parse_args()
+
+    server, fetches = None, None
+    url = args.url
+    if not url:
+        url, server, fetches = start_local_server(args.workers, args.lookup_delay)
+
+    # Handler output (generated passwords, ...) would drown the table
+    report = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    print(f"{'clients':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'errors':>7}", file=report)
+    for clients in args.clients:
+        latencies, errors, elapsed = run_level(url, clients, args.requests)
+        ordered = sorted(latencies) or [0.0]
+        p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+        print(f"{clients:>7} {len(latencies) / elapsed:>9.1f} {statistics.median(ordered) * 1000:>9.1f} "
+              f"{p95 * 1000:>9.1f} {len(errors):>7}", file=report)
+
+    health = requests.get(f"{url}/health", timeout=5).json()
+    print(f"server: {health}", file=report)
+    if fetches is not None:
+        weather_requests = sum(args.requests * c for c in args.clients) * 3 // len(COMMANDS)
+        print(f"weather lookups: about {weather_requests} requested, {len(fetches)} fetched (shared cache)", file=report)
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Slot extraction throughput and coverage over a generated utterance corpus.
+
+Compares the single-pass extractor in slots.py with the per-handler regexes it
+replaced (timer minutes, password length, volume level, convert word indexing),
+on commands with digits and with spoken numbers.
+
+    python benchmarks/bench_slots.py --utterances 50000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from slots import _extract, extract, first_int  # noqa: E402
+
+SPOKEN = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten', 'eleven', 'twelve',
+          'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+
+
+def spell(n):
+    if n < 20:
+        return SPOKEN[n]
+    if n < 100:
+        return TENS[n // 10] + ('' if n % 10 == 0 else ' ' + SPOKEN[n % 10])
+    return SPOKEN[n // 100] + ' hundred' + ('' if n % 100 == 0 else ' and ' + spell(n % 100))
+
+
+def corpus(count, seed=0):
+    """(kind, utterance, expected value) with a mix of digits and spoken numbers"""
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        n = rng.randint(1, 99)
+        number = str(n) if rng.random() < 0.5 else spell(n)
+        kind = rng.choice(['timer', 'password', 'volume', 'convert'])
+        if kind == 'timer':
+            unit, seconds = rng.choice([('minutes', 60), ('seconds', 1), ('hours', 3600)])
+            items.append((kind, f"set a timer for {number} {unit}", n * seconds))
+        elif kind == 'password':
+            items.append((kind, f"generate password with {number} characters", n))
+        elif kind == 'volume':
+            items.append((kind, rng.choice([f"set volume to {number}", f"volume {number} percent"]), n))
+        else:
+            source, target = rng.choice([('pounds', 'kilograms'), ('miles', 'kilometers'), ('celsius', 'fahrenheit')])
+            items.append((kind, f"convert {number} {source} to {target}", (n, source, target)))
+    return items
+
+
+def old_slots(kind, command):
+    """What the handlers extracted before slots.py"""
+    try:
+        if kind == 'timer':
+            match = re.search(r'(\\d+)\\s*minute', command)
+            return int(match.group(1)) * 60 if match else None
+        if kind == 'password':
+            match = re.search(r'(\\d+)', command)
+            return int(match.group(1)) if match else 12
+        if kind == 'volume':
+            match = re.search(r'\d+', command)
+            return int(match.group()) if match else None
+        parts = command.split()
+        to_index = parts.index('to')
+        value = float(parts[parts.index('convert') + 1])
+        return (int(value), parts[parts.index('convert') + 2], parts[to_index + 1])
+    except Exception:
+        return None
+
+
+def new_slots(kind, command, extractor=_extract):
+    """What the handlers extract now"""
+    slots = extractor(command)
+    if kind == 'timer':
+        return int(slots.duration) if slots.duration is not None else None
+    if kind == 'password':
+        return first_int(slots, 12)
+    if kind == 'volume':
+        return int(slots.percent) if slots.percent is not None else first_int(slots)
+    values = [u for u in slots.units if u.value is not None]
+    targets = [u for u in slots.units if u.value is None]
+    return (int(values[0].value), values[0].unit, targets[0].unit) if values and targets else None
+
+
+def measure(name, items, function):
+    start = time.perf_counter()
+    correct = sum(function(kind, text) == expected for kind, text, expected in items)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<26} {len(items) / elapsed:>12,.0f} utt/s {elapsed / len(items) * 1e6:>8.2f} us "
+          f"{correct / len(items):>8.1%} correct")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slot extraction throughput")
+    parser.add_argument("--utterances", type=int, default=50000)
+    args = parser.parse_args()
+
+    items = corpus(args.utterances)
+    print(f"{len(items):,} utterances, {sum(not any(c.isdigit() for c in t) for _, t, _ in items):,} with spoken numbers")
+    measure("per-handler regexes", items, old_slots)
+    measure("slots (single pass)", items, new_slots)
+    measure("slots (cached, repeated)", items[:200] * (len(items) // 200),
+            lambda kind, text: new_slots(kind, text, extract))
+    for kind in ('timer', 'password', 'volume', 'convert'):
+        subset = [item for item in items if item[0] == kind]
+        old = sum(old_slots(k, t) == e for k, t, e in subset)
+        new = sum(new_slots(k, t) == e for k, t, e in subset)
+        print(f"  {kind:<9} correct: before {old / len(subset):>6.1%}   after {new / len(subset):>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Startup time and resident memory with and without lazy plugin loading.
+
+Each run imports main.py in a fresh interpreter (LAZY_PLUGINS=1 imports only the
+plugin manifest; LAZY_PLUGINS=0 also imports every plugin and its platform
+libraries up front, as main() does) and reports import time and RSS.
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROBE = r"""
+import json, time
+start = time.perf_counter()
+import main
+if not main.LAZY_PLUGINS:
+    main.plugins.load_all()
+elapsed = time.perf_counter() - start
+try:
+    import psutil
+    rss = psutil.Process().memory_info().rss
+except ImportError:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+print("RESULT " + json.dumps({'seconds': elapsed, 'rss': rss, 'plugins': main.plugins.loaded()}))
+"""
+
+
+def measure(lazy):
+    env = dict(os.environ, LAZY_PLUGINS="1" if lazy else "0")
+    proc = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    line = [l for l in proc.stdout.splitlines() if l.startswith("RESULT ")][-1]
+    return json.loads(line[len("RESULT "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time and memory with/without lazy plugins")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for lazy in (False, True):
+        label = "lazy plugins" if lazy else "eager plugins"
+        try:
+            results = [measure(lazy) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{label:<14} failed: {e}")
+            continue
+        seconds = statistics.median(r['seconds'] for r in results)
+        rss = statistics.median(r['rss'] for r in results) / (1024 ** 2)
+        print(f"{label:<14} startup {seconds * 1000:8.1f} ms   RSS {rss:7.1f} MiB   "
+              f"plugins loaded: {', '.join(results[-1]['plugins']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+A simulated month of replies against the cloud TTS character budget.
+
+Replies are drawn from a mix like a real session: short fixed answers said
+all the time ("Volume set to 30"), medium ones that recur (the weather, the
+date) and long one-offs (Wikipedia summaries, status readouts). The same
+stream is spoken three ways:
+
+    cloud       every reply synthesized by the cloud service, no cache
+    routed      TTSRouter with the reply cache (reuse-weighted admission)
+    routed+lru  the same routing with a plain LRU reply cache
+
+and the characters billed, replies spoken locally, cache hit rate and the
+projection the budget made halfway through are printed for each.
+
+    python benchmarks/bench_tts_budget.py --budget 10000 --replies-per-day 60
+    python benchmarks/bench_tts_budget.py --cache-mb 2
+"""
+
+import argparse
+import collections
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from server import AudioCache  # noqa: E402
+from tts_budget import DAY, CharacterBudget, ReuseTracker, TTSRouter  # noqa: E402
+
+BYTES_PER_CHAR = 22050 * 2 * 0.07      # about 70 ms of 22.05 kHz PCM per character
+
+SHORT = ["Of course!", "Done.", "Volume set to {n}.", "It's {n} past {h}.", "Timer set for {n} minutes.",
+         "Switching to mail.", "Screen locked.", "Added to your to-do list."]
+MEDIUM = ["Today is {day}, the {n}th of October.", "It's {n} degrees and cloudy in Berlin, with rain later.",
+          "You have {n} items on your to-do list. The first one is to call the bank.",
+          "Battery at {n} percent, about two hours left."]
+
+
+class LRUCache:
+    """Reply cache that always admits new audio and evicts the least recently used"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'rejected': 0}
+
+    def get(self, text):
+        audio = self._entries.get(text)
+        if audio is not None:
+            self._entries.move_to_end(text)
+        self.stats['hits' if audio is not None else 'misses'] += 1
+        return audio
+
+    def put(self, text, audio):
+        if text in self._entries:
+            self.size -= len(self._entries.pop(text))
+        self._entries[text] = audio
+        self.size += len(audio)
+        while self.size > self.max_bytes:
+            self.size -= len(self._entries.popitem(last=False)[1])
+        return True
+
+
+def reply_stream(days, per_day, seed=3):
+    """(time, text) for a month of replies"""
+    rng = np.random.default_rng(seed)
+    days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    replies = []
+    for day in range(days):
+        times = np.sort(rng.uniform(day * DAY + 8 * 3600, day * DAY + 23 * 3600, rng.poisson(per_day)))
+        for t in times:
+            kind = rng.choice(3, p=[0.7, 0.22, 0.08])
+            if kind == 0:
+                # Small slot values, so the same sentences come back
+                text = SHORT[rng.zipf(1.6) % len(SHORT)].format(n=rng.integers(1, 6) * 10, h=rng.integers(1, 4))
+            elif kind == 1:
+                text = MEDIUM[rng.integers(len(MEDIUM))].format(n=rng.integers(1, 4) * 10 + day % 3,
+                                                                day=days_of_week[day % 7])
+            else:
+                words = rng.integers(40, 120)
+                text = " ".join(f"word{rng.integers(100000)}" for _ in range(words)) + "."
+            replies.append((float(t), text))
+    return replies
+
+
+def simulate(replies, args, route=True, cache='reuse'):
+    now = [0.0]
+    budget = CharacterBudget(args.budget, args.days, clock=lambda: now[0])
+    reuse = ReuseTracker()
+    router = TTSRouter(budget, max_chars=args.max_chars, reuse=reuse)
+    max_bytes = int(args.cache_mb * 1024 * 1024)
+    audio_cache = AudioCache(max_bytes, reuse=reuse) if cache == 'reuse' else LRUCache(max_bytes) if cache else None
+    local = 0
+    midway = None
+    for t, text in replies:
+        now[0] = t
+        if midway is None and t >= args.days * DAY / 2:
+            midway = budget.projected()
+        if not route:
+            budget.record(len(text))
+            continue
+        clip = audio_cache.get(text) if audio_cache else None
+        if audio_cache is not None and not isinstance(audio_cache, AudioCache):
+            reuse.seen(text)            # the LRU doesn't count requests itself
+        decision = router.route(text, 0 if clip else len(text))
+        if decision.route == 'local':
+            local += 1
+        elif clip is None:
+            budget.record(len(text))
+            if audio_cache is not None and router.worth_caching(text):
+                audio_cache.put(text, b"\0" * int(len(text) * BYTES_PER_CHAR))
+    stats = audio_cache.stats if audio_cache else {'hits': 0, 'misses': 0}
+    lookups = stats['hits'] + stats['misses']
+    return {'billed': budget.used, 'local': local, 'midway': midway or budget.projected(),
+            'hit_rate': stats['hits'] / lookups if lookups else 0.0, 'routes': router.stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cloud TTS characters over a simulated month")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--replies-per-day", type=float, default=60)
+    parser.add_argument("--budget", type=int, default=10000, help="characters per period (0 = no limit)")
+    parser.add_argument("--max-chars", type=int, default=200)
+    parser.add_argument("--cache-mb", type=float, default=0.5, help="reply audio cache size")
+    args = parser.parse_args()
+
+    replies = reply_stream(args.days, args.replies_per_day)
+    total = sum(len(text) for _, text in replies)
+    print(f"{len(replies)} replies over {args.days} days, {total} characters, budget {args.budget or 'none'}")
+    for name, route, cache in (('cloud', False, None), ('routed', True, 'reuse'), ('routed+lru', True, 'lru')):
+        result = simulate(replies, args, route, cache)
+        over = f" ({result['billed'] / args.budget:.0%} of budget)" if args.budget else ""
+        print(f"{name:<11} billed {result['billed']:7d}{over:<17} local {result['local']:5d}   "
+              f"cache hits {result['hit_rate']:5.1%}   projected at mid-period {result['midway']:7d}")
+        if name == 'routed':
+            routes = ", ".join(f"{r}/{why} {n}" for (r, why), n in sorted(result['routes'].items()))
+            print(f"{'':<11} {routes}")
+
+
+if __name__ == "__main__":
+    main()
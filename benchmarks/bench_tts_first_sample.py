@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Time-to-first-sample benchmark: MP3 file + external player vs in-process PCM sink.
+
+Live mode (needs ELEVENLABS_API_KEY and a voice ID) measures the full path from
+request to first audio written. --offline replays synthetic chunks from memory
+to isolate the local cost of each path (file write + process spawn vs a buffer
+write), which is what the PCM mode removes.
+
+    python benchmarks/bench_tts_first_sample.py --offline
+    python benchmarks/bench_tts_first_sample.py --voice-id <id> --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_sink import PCMSink  # noqa: E402
+
+TEXT = "Sure thing! Volume set to forty percent."
+
+
+class NullOutput:
+    """Stands in for the audio device"""
+    def write(self, buffer):
+        pass
+
+
+def spawn_player(path):
+    """Start the player the way speak() does; returns when the process is launched"""
+    if os.name == "nt":
+        os.system(f'start /min "" "{path}"')
+    else:
+        subprocess.Popen([sys.executable, "-c", "pass"]).wait()
+
+
+def mp3_path(chunks):
+    """Current path: write all chunks to a temp file, then launch a player"""
+    start = time.perf_counter()
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
+        for chunk in chunks:
+            tmp_file.write(chunk)
+        path = tmp_file.name
+    spawn_player(path)
+    elapsed = time.perf_counter() - start
+    os.remove(path)
+    return elapsed  # lower bound: excludes player startup and MP3 decode
+
+
+def pcm_path(sink, chunks):
+    """PCM path: write buffers straight into the open output stream"""
+    sink.play(chunks)
+    return sink.last_first_sample or 0.0
+
+
+def summarize(name, samples):
+    samples = sorted(samples)
+    p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+    print(f"{name:<6} median {statistics.median(samples) * 1000:9.3f} ms   p90 {p90 * 1000:9.3f} ms   (n={len(samples)})")
+
+
+def run_offline(runs):
+    # One second of 22.05 kHz 16-bit audio in 4 KB chunks, roughly what a short reply returns
+    payload = [bytes(4096)] * 11
+    sink = PCMSink(output=NullOutput())
+    summarize("mp3", [mp3_path(iter(payload)) for _ in range(runs)])
+    summarize("pcm", [pcm_path(sink, iter(payload)) for _ in range(runs)])
+
+
+def run_live(runs, voice_id, null_output):
+    from config import ELEVENLABS_API_KEY
+    from tts_transport import CloudTTS
+
+    tts = CloudTTS(ELEVENLABS_API_KEY)
+    sink = PCMSink(sample_rate=22050, output=NullOutput() if null_output else None)
+    if not sink.ensure_open():
+        sys.exit("No audio output device; rerun with --null-output")
+
+    mp3, pcm = [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        mp3_path(tts.stream(voice_id, TEXT))
+        mp3.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        chunks = tts.stream(voice_id, TEXT, output_format="pcm_22050", accept="audio/pcm")
+        pcm.append(time.perf_counter() - start + pcm_path(sink, chunks))
+    summarize("mp3", mp3)
+    summarize("pcm", pcm)
+    sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--offline", action="store_true", help="synthetic chunks, no network")
+    parser.add_argument("--voice-id", help="ElevenLabs voice ID (default: from voice_cache.json)")
+    parser.add_argument("--null-output", action="store_true", help="discard PCM instead of playing it")
+    args = parser.parse_args()
+
+    if args.offline:
+        run_offline(args.runs)
+        return
+
+    voice_id = args.voice_id
+    if not voice_id:
+        try:
+            with open("voice_cache.json", encoding="utf-8") as f:
+                voice_id = json.load(f)["voice_id"]
+        except (OSError, ValueError, KeyError):
+            sys.exit("Pass --voice-id or run the assistant once to create voice_cache.json")
+    run_live(args.runs, voice_id, args.null_output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+First-command latency with and without the warm-up stage.
+
+Each run starts a fresh interpreter on the in-memory desktop backend, imports
+main.py, optionally runs the warm-up (as main() does while the greeting plays)
+and then times the first command and a second one of the same kind. Without
+warm-up the first command pays for importing its plugin (and, for commands the
+rules don't match, loading the intent classifier).
+
+    python benchmarks/bench_warmup.py --runs 5
+    python benchmarks/bench_warmup.py --command "shut down chrome"
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+PROBE = r"""
+import json, sys, time
+import main
+main.batch_mode = True
+warmup = None
+if sys.argv[1] == "warm":
+    start = time.perf_counter()
+    warm = main.start_warmup().wait()
+    warmup = {'seconds': time.perf_counter() - start, 'report': warm.report()}
+first = main.run_command_captured(sys.argv[2])
+second = main.run_command_captured(sys.argv[2])
+print("RESULT " + json.dumps({'first': first['elapsed_ms'], 'second': second['elapsed_ms'], 'warmup': warmup,
+                              'responses': first['responses']}))
+"""
+
+
+def measure(command, warm):
+    env = dict(os.environ, ASSISTANT_BACKEND="fake", ASSISTANT_METRICS_PORT="0")
+    proc = subprocess.run([sys.executable, "-c", PROBE, "warm" if warm else "cold", command], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    line = [l for l in proc.stdout.splitlines() if l.startswith("RESULT ")][-1]
+    return json.loads(line[len("RESULT "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="First-command latency with and without warm-up")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", action="append",
+                        help="command to time (repeatable; default: a few common ones)")
+    args = parser.parse_args()
+    commands = args.command or ["what time is it", "set volume to 30", "switch to mail", "shut down chrome"]
+
+    for command in commands:
+        for warm in (False, True):
+            try:
+                results = [measure(command, warm) for _ in range(args.runs)]
+            except RuntimeError as e:
+                print(f"{command!r:<22} failed: {e}")
+                break
+            first = statistics.median(r['first'] for r in results)
+            second = statistics.median(r['second'] for r in results)
+            line = f"{command!r:<22} {'warm' if warm else 'cold'}   first {first:8.2f} ms   second {second:6.2f} ms"
+            if warm:
+                seconds = statistics.median(r['warmup']['seconds'] for r in results)
+                report = results[-1]['warmup']['report']
+                ready = [name for name, (status, _, _) in report.items() if status == 'done']
+                line += f"   warm-up {seconds * 1000:.0f} ms ({len(ready)}/{len(report)} ready)"
+            print(line)
+    print("\nlast warm-up:")
+    for name, (status, seconds, error) in results[-1]['warmup']['report'].items():
+        timing = f"{seconds * 1000:8.1f} ms" if seconds is not None else " " * 11
+        print(f"  {name:<20}{status:<9}{timing}  {error or ''}")
+
+
+if __name__ == "__main__":
+    main()
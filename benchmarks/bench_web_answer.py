@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Time to a spoken web answer, against a local stub search and content server.
+
+The stub search endpoint returns SearXNG-shaped JSON; every result page has a
+random first-byte delay, is sent in slowly trickled chunks, and carries its
+answer paragraph somewhere after a navigation menu and filler. Some results
+are dead (404, non-HTML, or slower than the page deadline). Compares
+WebAnswers (top pages in parallel, streaming parse, first extract wins) with
+fetching the same results one after another and parsing each page in full.
+
+    python benchmarks/bench_web_answer.py --queries 30 --pages 3
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from web_answer import MainTextParser, WebAnswers, query_terms  # noqa: E402
+
+NAV = "<nav><ul>" + "".join(f"<li><a href='/{i}'>Section {i}</a></li>" for i in range(40)) + "</ul></nav>"
+FILLER = "<p>" + "Unrelated filler text about other matters entirely, repeated for length. " * 12 + "</p>"
+
+
+class Site:
+    """Pages and their behaviour, decided per query so both fetchers see the same web"""
+
+    def __init__(self, pages, seed=0):
+        self.pages = pages
+        self.rng = random.Random(seed)
+        self.plans = {}
+
+    def plan(self, query):
+        if query not in self.plans:
+            plans = []
+            for i in range(self.pages):
+                kind = self.rng.choices(['ok', 'ok', 'ok', 'missing', 'pdf', 'stalled'], k=1)[0]
+                plans.append({'kind': kind, 'delay': self.rng.uniform(0.05, 0.8), 'filler': self.rng.randint(2, 30)})
+            self.plans[query] = plans
+        return self.plans[query]
+
+
+def make_server(site, trickle):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            if url.path == '/search':
+                query = params['q'][0]
+                base = f"http://127.0.0.1:{self.server.server_address[1]}"
+                results = [{'url': f"{base}/page?q={requests.utils.quote(query)}&n={i}", 'title': f"Result {i}"}
+                           for i in range(site.pages)]
+                self._send(200, 'application/json', json.dumps({'query': query, 'results': results}).encode())
+                return
+            query, n = params['q'][0], int(params['n'][0])
+            plan = site.plan(query)[n]
+            time.sleep(plan['delay'])
+            if plan['kind'] == 'missing':
+                self._send(404, 'text/html', b"<p>Not found</p>")
+                return
+            if plan['kind'] == 'pdf':
+                self._send(200, 'application/pdf', b"%PDF-1.4" + b"\0" * 2048)
+                return
+            answer = (f"<p>The answer about {query} is page {n}: {query} has been studied for a long time "
+                      f"and its nature is well understood today. Further detail follows below.</p>")
+            body = f"<html><head><script>var x = 1;</script></head><body>{NAV}<main>{FILLER * plan['filler']}" \
+                   f"{answer}{FILLER * 20}</main><footer><p>Copyright and all rights reserved.</p></footer></body></html>"
+            body = body.encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                for start in range(0, len(body), 4096):
+                    self.wfile.write(body[start:start + 4096])
+                    self.wfile.flush()
+                    time.sleep(trickle * (20 if plan['kind'] == 'stalled' else 1))
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _send(self, status, content_type, body):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def sequential(search_url, query, page_timeout):
+    """One page after another, each downloaded in full and then parsed"""
+    session = requests.Session()
+    results = session.get(search_url.format(query=requests.utils.quote(query)), timeout=3).json()['results']
+    for result in results:
+        try:
+            response = session.get(result['url'], timeout=page_timeout)
+        except requests.RequestException:
+            continue
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+            continue
+        parser = MainTextParser(query_terms(query))
+        parser.feed(response.text)
+        parser.close()
+        if parser.found:
+            return parser.found
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Web answer latency against a stub server")
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-timeout", type=float, default=3.0)
+    parser.add_argument("--trickle", type=float, default=0.01, help="seconds between 4 KB chunks")
+    args = parser.parse_args()
+
+    site = Site(args.pages)
+    server = make_server(site, args.trickle)
+    search_url = f"http://127.0.0.1:{server.server_address[1]}/search?q={{query}}&format=json"
+    answers = WebAnswers(search_url, pages=args.pages, page_timeout=args.page_timeout)
+    queries = [f"topic{i} nature" for i in range(args.queries)]
+
+    for name, function in [
+        ("sequential, full pages", lambda q: sequential(search_url, q, args.page_timeout)),
+        (f"parallel top {args.pages}, streaming", lambda q: answers.answer(q)),
+    ]:
+        times, answered = [], 0
+        for query in queries:
+            start = time.perf_counter()
+            answer = function(query)
+            times.append(time.perf_counter() - start)
+            text = answer.text if hasattr(answer, 'text') else answer
+            answered += bool(text and query in text)
+        times.sort()
+        print(f"{name:<30} median {statistics.median(times) * 1000:>6.0f} ms   "
+              f"p95 {times[int(len(times) * 0.95)] * 1000:>6.0f} ms   answered {answered}/{len(queries)}")
+    print(f"stats: {answers.stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
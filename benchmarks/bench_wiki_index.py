@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Offline Wikipedia index: build time, size, open time and lookup latency.
+
+Generates a synthetic abstracts corpus (random multi-word titles, a share of
+them with qualifiers like "(film)"), builds an index in a temporary folder and
+times lookups of random titles as they would be spoken (lowercase, no
+punctuation), misses, and qualifier-free names.
+
+    python benchmarks/bench_wiki_index.py --titles 2000000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wiki_index  # noqa: E402
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ran', 'te', 'vo', 'sul', 'dra', 'pe', 'no', 'ber', 'qui', 'tan', 'zu', 'hel', 'gor']
+QUALIFIERS = ['(film)', '(band)', '(river)', '(novel)', '(album)', '(city)']
+FILLER = ("is a {kind} first described in {year}. It is known for its {trait} and appears in several "
+          "works of reference. Later accounts expanded on its history and influence.")
+
+
+def word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def title(i, seed=0):
+    """The i-th synthetic title (deterministic, so lookups can regenerate it)"""
+    rng = random.Random(seed * 1000003 + i)
+    name = ' '.join(word(rng) for _ in range(rng.randint(1, 3))) + f" {i}"
+    return name + ' ' + rng.choice(QUALIFIERS) if rng.random() < 0.1 else name
+
+
+def corpus(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        text = FILLER.format(kind=rng.choice(['river', 'novel', 'city', 'mineral', 'band']),
+                             year=rng.randint(1500, 2020), trait=rng.choice(['size', 'colour', 'sound', 'age']))
+        name = title(i, seed)
+        yield name, f"{name.split(' (')[0]} {text}"
+
+
+def latency(function, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        function(query)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Wikipedia index benchmark")
+    parser.add_argument("--titles", type=int, default=2000000)
+    parser.add_argument("--queries", type=int, default=20000)
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="wiki_index_bench_")
+    try:
+        path = os.path.join(base, "wiki_index.bin")
+        start = time.perf_counter()
+        keys = wiki_index.build(corpus(args.titles), path)
+        print(f"build: {args.titles:,} articles, {keys:,} keys in {time.perf_counter() - start:.1f} s, "
+              f"{os.path.getsize(path) / 1024 ** 2:,.0f} MB")
+
+        opens = []
+        for _ in range(20):
+            start = time.perf_counter()
+            index = wiki_index.WikiIndex(path)
+            opens.append(time.perf_counter() - start)
+            index.close()
+        index = wiki_index.WikiIndex(path)
+        print(f"open: {statistics.median(opens) * 1000:.2f} ms (median of {len(opens)})")
+
+        rng = random.Random(1)
+        picks = [rng.randrange(args.titles) for _ in range(args.queries)]
+        spoken = [wiki_index.normalize(title(i)).split(' (')[0] for i in picks]
+        qualified = [title(i).split(' (')[0] for i in picks if '(' in title(i)]
+        misses = [f"nothing called {i}" for i in picks]
+        found = sum(index.lookup(q) is not None for q in spoken)
+        print(f"hits: {found / len(spoken):.1%} of spoken titles, "
+              f"{sum(index.lookup(q) is not None for q in qualified) / max(1, len(qualified)):.1%} without qualifier")
+
+        for name, queries, function in [
+            ("lookup, random titles", spoken, index.lookup),
+            ("summary, random titles", spoken, index.summary),
+            ("lookup, misses", misses, index.lookup),
+        ]:
+            median, p99 = latency(function, queries)
+            print(f"{name:<28} median {median:>7.1f} us   p99 {p99:>7.1f} us")
+        index.close()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Accuracy and latency of the fallback intent classifier.
+
+Reports cross-validated accuracy on the bundled examples, accuracy on held-out
+paraphrases (which manifest rule each one ends up at with keyword rules only,
+and with the classifier as fallback), how many out-of-domain requests would
+still run a handler, and per-utterance latency for single and batched
+classification.
+
+    python benchmarks/eval_intent_classifier.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import plugins  # noqa: E402
+from classifier import IntentClassifier, usable  # noqa: E402
+from intent_examples import EXAMPLES  # noqa: E402
+from settings import INTENT_ACTION_CONFIDENCE, INTENT_MIN_CONFIDENCE  # noqa: E402
+
+# (utterance, manifest intent it should reach, or None if it should stay unknown)
+HELD_OUT = [
+    ("how loud is the volume right now", 'volume'), ("how loud are things", 'volume'),
+    ("silence everything", 'volume'), ("make the sound 35", 'volume'), ("turn the audio down to 15", 'volume'),
+    ("snap my screen", 'screenshot'), ("capture the whole screen", 'screenshot'),
+    ("lock the pc", 'lock_screen'), ("lock up my computer", 'lock_screen'),
+    ("how much ram is in use", 'system_info'), ("what's the cpu load", 'system_info'),
+    ("which networks are saved", 'wifi'),
+    ("how much is 9 times 9", 'calculate'), ("work out 12 times 12", 'calculate'),
+    ("remind me in 5 minutes", 'timer'), ("ping me in 12 minutes", 'timer'),
+    ("jot down water the lawn", 'note'), ("write down dentist on friday", 'note'),
+    ("put eggs on my list", 'todo_add'), ("new task mow the grass", 'todo_add'),
+    ("what's left on my tasks", 'todo_read'), ("read my task list", 'todo_read'),
+    ("show me the desktop", 'minimize_windows'), ("hide all the windows", 'minimize_windows'),
+    ("go to outlook", 'switch_window'), ("bring up chrome", 'switch_window'),
+    ("shut down spotify", 'close_app'), ("kill firefox", 'close_app'), ("terminate notepad", 'close_app'),
+    ("launch spotify", 'open_app'), ("fire up the calculator", 'open_app'), ("boot up chrome", 'open_app'),
+    ("look up pasta recipes", 'web_answer'), ("search the web for used cars", 'web_answer'),
+    ("who is ada lovelace", 'wikipedia'), ("tell me about the moon landing", 'wikipedia'),
+    ("who was julius caesar", 'wikipedia'),
+    ("make me a new password", 'generate_password'), ("create a strong password", 'generate_password'),
+    ("scan my pc for threats", 'security_check'), ("is my pc secure", 'security_check'),
+    ("is it raining in dublin", 'weather'), ("how cold is it in oslo", 'weather'),
+    ("what's the temperature in rome", 'weather'),
+    ("good morning assistant", 'greeting'), ("what hour is it now", 'time'), ("see you later then", None),
+    ("what can you help with", 'help'),
+    ("tell me a funny joke", None), ("order me a taxi", None), ("what's your name", None),
+    ("play my favorite song", None), ("i feel tired", None),
+]
+
+# Out-of-domain requests that sound like commands; none of them may run a handler
+OUT_OF_DOMAIN = [
+    "lock the door", "lock my phone", "turn off the lights", "i'm done for today", "kill it", "quit it",
+    "shut up", "close the window blinds", "stop the music", "turn it up", "end the call", "shut the garage",
+    "mute my microphone on zoom", "exit the highway", "minimize my expenses",
+]
+
+
+def route(classifier, text):
+    """Manifest intent reached with the classifier as fallback (mirrors main.understood_as)"""
+    rule = plugins.match(text)
+    if rule is None:
+        guess = classifier.classify(text)
+        if usable(guess, INTENT_MIN_CONFIDENCE, INTENT_ACTION_CONFIDENCE):
+            rule = plugins.match(guess.command)
+    return rule.intent if rule else None
+
+
+def cross_validate(folds=5, seed=0):
+    rng = random.Random(seed)
+    items = [(label, i) for label, examples in EXAMPLES.items() for i in range(len(examples))]
+    rng.shuffle(items)
+    correct = 0
+    for fold in range(folds):
+        held = set(items[fold::folds])
+        train = {label: [e for i, e in enumerate(ex) if (label, i) not in held] for label, ex in EXAMPLES.items()}
+        model = IntentClassifier(examples=train).train()
+        for label, i in held:
+            text = EXAMPLES[label][i].replace('[', '').replace(']', '')
+            correct += model.classify(text).label == label
+    return correct / len(items)
+
+
+def main():
+    start = time.perf_counter()
+    classifier = IntentClassifier().train()
+    train_seconds = time.perf_counter() - start
+
+    print(f"training: {train_seconds * 1000:.0f} ms on {sum(len(v) for v in EXAMPLES.values())} examples, "
+          f"{len(EXAMPLES)} labels")
+    print(f"5-fold cross-validated label accuracy: {cross_validate():.1%}")
+
+    rules_only = sum((plugins.match(text).intent if plugins.match(text) else None) == expected
+                     for text, expected in HELD_OUT)
+    with_fallback = 0
+    for text, expected in HELD_OUT:
+        got = route(classifier, text)
+        with_fallback += got == expected
+        if got != expected:
+            print(f"  miss: {text!r} -> {got} (expected {expected})")
+    print(f"held-out paraphrases reaching the right handler: rules only {rules_only}/{len(HELD_OUT)}, "
+          f"with classifier {with_fallback}/{len(HELD_OUT)}")
+
+    # Only what the classifier adds counts here; keyword rule matches are the rules' business
+    actions = [(text, route(classifier, text)) for text in OUT_OF_DOMAIN if plugins.match(text) is None]
+    actions = [(text, got) for text, got in actions if got is not None]
+    for text, got in actions:
+        print(f"  out-of-domain: {text!r} -> {got}")
+    print(f"out-of-domain requests the classifier turns into a command: {len(actions)}/{len(OUT_OF_DOMAIN)}")
+
+    texts = [text for text, _ in HELD_OUT]
+    timings = []
+    for _ in range(20):
+        for text in texts:
+            t = time.perf_counter()
+            classifier.classify(text)
+            timings.append(time.perf_counter() - t)
+    timings.sort()
+    start = time.perf_counter()
+    rounds = 20
+    for _ in range(rounds):
+        classifier.classify_batch(texts)
+    batch = (time.perf_counter() - start) / (rounds * len(texts))
+    print(f"latency per utterance: single median {statistics.median(timings) * 1e6:.0f} us, "
+          f"p99 {timings[int(0.99 * len(timings))] * 1e6:.0f} us; batched {batch * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
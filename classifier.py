@@ -0,0 +1,232 @@
+"""
+Statistical intent classifier, consulted when no keyword rule matches.
+
+Utterances are turned into hashed sparse features (words, word pairs and
+character trigrams) and scored by a linear softmax model trained with NumPy on
+the bundled examples in intent_examples.py. Training takes about a second and
+the weights are cached on disk; classifying one utterance takes well under a
+millisecond, and classify_batch scores many at once with a single matrix product.
+"""
+
+import hashlib
+import json
+import re
+import zlib
+from collections import namedtuple
+
+from plugins import install_package
+from intents import normalize
+from intent_examples import CANONICAL, EXAMPLES, OPTIONAL_REST
+
+try:
+    import numpy as np
+except ImportError:
+    install_package("numpy")
+    import numpy as np
+
+Guess = namedtuple('Guess', ['label', 'confidence', 'command'])
+
+# Function words never kept as the {rest} of a canonical command
+STOPWORDS = {
+    'a', 'an', 'the', 'to', 'for', 'of', 'me', 'my', 'please', 'can', 'you', 'could', 'would',
+    'is', 'it', 'i', 'up', 'on', 'at', 'in', 'about', 'what', "what's", 'some',
+}
+
+# Intents whose handlers change something that is hard to take back. Guesses for
+# these need more confidence, and must account for the whole utterance: an
+# argument when the command takes one ("kill it" closes nothing), no leftover
+# words when it doesn't ("lock the door" does not lock the screen).
+SIDE_EFFECTS = frozenset({'exit', 'lock_screen', 'close_app', 'volume_set', 'volume_mute', 'minimize_windows'})
+
+# "[argument]" markers in the examples
+_ARGUMENT = re.compile(r'\[([^\]]*)\]')
+
+
+def usable(guess, min_confidence=0.5, action_confidence=0.65):
+    """Whether a guess may stand in for an unmatched command"""
+    if not (guess and guess.command):
+        return False
+    return guess.confidence >= (action_confidence if guess.label in SIDE_EFFECTS else min_confidence)
+
+
+def words(text):
+    return normalize(text).split()
+
+
+def features(text):
+    """Feature strings for an utterance: words, adjacent word pairs, character trigrams"""
+    tokens = words(text)
+    feats = ['w:' + t for t in tokens]
+    feats += ['b:' + a + ' ' + b for a, b in zip(tokens, tokens[1:])]
+    for t in tokens:
+        padded = f"<{t}>"
+        feats += ['c:' + padded[i:i + 3] for i in range(len(padded) - 2)]
+    return feats
+
+
+class IntentClassifier:
+    """Hashed n-gram features with a multinomial logistic regression model"""
+
+    def __init__(self, examples=EXAMPLES, canonical=CANONICAL, dim_bits=13, optional_rest=OPTIONAL_REST):
+        self.examples = examples
+        self.canonical = canonical
+        self.optional_rest = optional_rest
+        self.labels = sorted(examples)
+        # Training text has the [argument] brackets removed; trigger words are those outside them
+        self.texts = {label: [_ARGUMENT.sub(r'\1', e) for e in examples[label]] for label in self.labels}
+        self.triggers = {label: {w for e in examples[label] for w in words(_ARGUMENT.sub(' ', e))}
+                         for label in self.labels}
+        for label, template in canonical.items():
+            self.triggers.setdefault(label, set()).update(words(template.replace('{rest}', ' ')))
+        self.dim = 1 << dim_bits
+        self.weights = None     # (dim, labels)
+        self.bias = None        # (labels,)
+
+    # -------------------------------------------------------------------------
+    # Features
+    # -------------------------------------------------------------------------
+
+    def hashed(self, text):
+        """Column indices and signs of an utterance's features"""
+        indices, signs = [], []
+        for feat in features(text):
+            h = zlib.crc32(feat.encode("utf-8"))
+            indices.append(h & (self.dim - 1))
+            signs.append(1.0 if h & self.dim else -1.0)
+        return indices, signs
+
+    def vectorize(self, texts):
+        """Dense (n, dim) feature matrix, each row scaled to unit length"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            indices, signs = self.hashed(text)
+            if indices:
+                np.add.at(matrix[row], indices, signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-6)
+
+    # -------------------------------------------------------------------------
+    # Training
+    # -------------------------------------------------------------------------
+
+    def fingerprint(self):
+        """Changes whenever the examples or feature settings change"""
+        data = json.dumps([self.examples, self.dim], sort_keys=True).encode("utf-8")
+        return hashlib.sha1(data).hexdigest()[:16]
+
+    def train(self, epochs=200, learning_rate=0.5, l2=1e-4):
+        """Fit the model on the examples with full-batch gradient descent (Adam)"""
+        texts, targets = [], []
+        for index, label in enumerate(self.labels):
+            texts += self.texts[label]
+            targets += [index] * len(self.texts[label])
+        x = self.vectorize(texts)
+        # Only feature columns that occur in the examples can get non-zero weights
+        active = np.flatnonzero(np.abs(x).sum(axis=0))
+        x = x[:, active]
+        y = np.zeros((len(texts), len(self.labels)), dtype=np.float32)
+        y[np.arange(len(texts)), targets] = 1.0
+
+        w = np.zeros((len(active), len(self.labels)), dtype=np.float32)
+        b = np.zeros(len(self.labels), dtype=np.float32)
+        moments = [np.zeros_like(w), np.zeros_like(w), np.zeros_like(b), np.zeros_like(b)]
+        beta1, beta2 = 0.9, 0.999
+        for step in range(1, epochs + 1):
+            probs = self._softmax(x @ w + b)
+            error = (probs - y) / len(texts)
+            grads = (x.T @ error + l2 * w, error.sum(axis=0))
+            for i, (param, grad) in enumerate(zip((w, b), grads)):
+                m, v = moments[2 * i], moments[2 * i + 1]
+                m *= beta1
+                m += (1 - beta1) * grad
+                v *= beta2
+                v += (1 - beta2) * grad * grad
+                m_hat = m / (1 - beta1 ** step)
+                v_hat = v / (1 - beta2 ** step)
+                param -= learning_rate * m_hat / (np.sqrt(v_hat) + 1e-8)
+        self.weights = np.zeros((self.dim, len(self.labels)), dtype=np.float32)
+        self.weights[active] = w
+        self.bias = b
+        return self
+
+    def save(self, path):
+        np.savez_compressed(path, weights=self.weights, bias=self.bias,
+                            labels=np.array(self.labels), fingerprint=self.fingerprint())
+
+    def load(self, path):
+        """Load cached weights; returns False if missing or trained on other examples"""
+        try:
+            with np.load(path) as data:
+                if str(data['fingerprint']) != self.fingerprint():
+                    return False
+                self.weights, self.bias = data['weights'], data['bias']
+                self.labels = [str(label) for label in data['labels']]
+            return True
+        except Exception:
+            return False
+
+    def load_or_train(self, path=None):
+        if path and self.load(path):
+            return self
+        self.train()
+        if path:
+            try:
+                self.save(path)
+            except Exception as e:
+                print(f"Could not cache intent model: {e}")
+        return self
+
+    # -------------------------------------------------------------------------
+    # Classification
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def probabilities(self, text):
+        """Label probabilities for one utterance (sparse row gather, no dense vector)"""
+        indices, signs = self.hashed(text)
+        if not indices:
+            return None
+        signs = np.asarray(signs, dtype=np.float32)
+        scale = 1.0 / max(np.linalg.norm(np.bincount(indices, weights=signs)), 1e-6)
+        logits = (signs[:, None] * self.weights[indices]).sum(axis=0) * scale + self.bias
+        return self._softmax(logits)
+
+    def classify(self, text):
+        """Return a Guess for one utterance, or None for empty input"""
+        probs = self.probabilities(text)
+        if probs is None:
+            return None
+        best = int(probs.argmax())
+        return self._guess(text, best, float(probs[best]))
+
+    def classify_batch(self, texts):
+        """Guesses for many utterances with one matrix product"""
+        probs = self._softmax(self.vectorize(texts) @ self.weights + self.bias)
+        best = probs.argmax(axis=1)
+        return [self._guess(text, int(i), float(probs[row, i])) if words(text) else None
+                for row, (text, i) in enumerate(zip(texts, best))]
+
+    def _guess(self, text, index, confidence):
+        label = self.labels[index]
+        template = self.canonical.get(label)
+        command = None
+        if template:
+            rest = self.remainder(text, label)
+            if '{rest}' in template:
+                # A command that needs an argument ("close application {rest}") is no use without one
+                complete = bool(rest) or label in self.optional_rest
+            else:
+                complete = not (rest and label in SIDE_EFFECTS)
+            if complete:
+                command = template.format(rest=rest).strip()
+        return Guess(label, round(confidence, 3), command)
+
+    def remainder(self, text, label):
+        """The words of an utterance that aren't the label's trigger words (its arguments)"""
+        triggers = self.triggers.get(label, ())
+        return " ".join(t for t in words(text) if t not in triggers and t not in STOPWORDS)
@@ -0,0 +1,217 @@
+"""
+Response composer: splice pre-rendered audio for fixed phrases with synthesized tails.
+
+Reply templates such as "{confirmation} Volume set to {level} percent." are split
+into fixed segments (literal text, and pooled slots like {confirmation} whose
+values come from a known list) and free slots ({level}). Fixed segments are
+rendered once and cached as PCM. When a reply is spoken, the cached leading
+segments play immediately while the rest of the reply, starting at the first
+free slot, is synthesized in the background.
+"""
+
+import array
+import hashlib
+import os
+import queue
+import random
+import string
+import threading
+
+
+class Reply(str):
+    """A reply string that also carries its (text, fixed) segments"""
+
+    def __new__(cls, segments):
+        obj = str.__new__(cls, "".join(text for text, _ in segments).strip())
+        obj.segments = segments
+        return obj
+
+
+def join(replies):
+    """One Reply that says several in order; plain strings become synthesized segments"""
+    segments = []
+    for reply in replies:
+        if segments:
+            segments.append((" ", True))
+        segments.extend(getattr(reply, 'segments', None) or [(str(reply), False)])
+    return Reply(segments)
+
+
+def trim_silence(pcm, threshold=400, margin=220):
+    """Strip leading and trailing near-silence from 16-bit mono PCM"""
+    samples = array.array('h', pcm[:len(pcm) - len(pcm) % 2])
+    start, end = 0, len(samples)
+    while start < end and abs(samples[start]) <= threshold:
+        start += 1
+    while end > start and abs(samples[end - 1]) <= threshold:
+        end -= 1
+    if start >= end:
+        return b""
+    start, end = max(0, start - margin), min(len(samples), end + margin)
+    return samples[start:end].tobytes()
+
+
+def fade(pcm, samples=110):
+    """Apply a short linear fade in and out so spliced clips don't click"""
+    data = array.array('h', pcm[:len(pcm) - len(pcm) % 2])
+    n = min(samples, len(data) // 2)
+    for i in range(n):
+        gain = i / n
+        data[i] = int(data[i] * gain)
+        data[-1 - i] = int(data[-1 - i] * gain)
+    return data.tobytes()
+
+
+def skip_leading_silence(chunks, threshold=400):
+    """Drop near-silent samples at the start of a PCM chunk stream"""
+    chunks = iter(chunks)
+    pending = b""
+    for chunk in chunks:
+        pending += bytes(chunk)
+        even = len(pending) - len(pending) % 2
+        for i, value in enumerate(array.array('h', pending[:even])):
+            if abs(value) > threshold:
+                yield pending[i * 2:]
+                yield from chunks
+                return
+        pending = pending[even:]
+
+
+class PhraseCache:
+    """PCM clips for fixed phrases, in memory and optionally on disk"""
+
+    def __init__(self, cache_dir=None, namespace=""):
+        self.cache_dir = cache_dir
+        self.namespace = namespace    # e.g. voice ID and format, so a voice change misses
+        self._clips = {}
+        self._lock = threading.Lock()
+
+    def _path(self, text):
+        digest = hashlib.sha1(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".pcm")
+
+    def get(self, text):
+        with self._lock:
+            clip = self._clips.get(text)
+        if clip is None and self.cache_dir:
+            try:
+                with open(self._path(text), "rb") as f:
+                    clip = f.read()
+                with self._lock:
+                    self._clips[text] = clip
+            except OSError:
+                return None
+        return clip
+
+    def put(self, text, clip):
+        with self._lock:
+            self._clips[text] = clip
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self._path(text), "wb") as f:
+                    f.write(clip)
+            except OSError as e:
+                print(f"Phrase cache write failed: {e}")
+
+
+class ResponseComposer:
+    """Builds Replies from templates and plays them with cached fixed segments"""
+
+    def __init__(self, templates, pools, cache=None, sample_rate=22050, gap=0.06):
+        self.templates = {name: list(string.Formatter().parse(t)) for name, t in templates.items()}
+        self.pools = pools
+        self.cache = cache or PhraseCache()
+        self.gap = bytes(int(sample_rate * gap) * 2)
+        self.stats = {'replies': 0, 'chars_total': 0, 'chars_synthesized': 0}
+
+    def reply(self, template_name, **values):
+        """Render a template to a Reply, choosing pooled slot values at random"""
+        segments = []
+        for literal, field, _, _ in self.templates[template_name]:
+            if literal:
+                segments.append((literal, True))
+            if field is None:
+                continue
+            if field in self.pools:
+                segments.append((random.choice(self.pools[field]), True))
+            else:
+                segments.append((str(values[field]), False))
+        return Reply(segments)
+
+    def fixed_phrases(self):
+        """Every fixed segment that may start a reply, i.e. worth pre-rendering"""
+        phrases = set()
+        for pool in self.pools.values():
+            phrases.update(p.strip() for p in pool)
+        for parts in self.templates.values():
+            for literal, field, _, _ in parts:
+                if literal.strip():
+                    phrases.add(literal.strip())
+                if field is not None and field not in self.pools:
+                    break   # anything after a free slot is synthesized with it
+        return sorted(phrases)
+
+    def prerender(self, synthesize):
+        """Render and cache every fixed phrase not cached yet; returns the number rendered"""
+        rendered = 0
+        for phrase in self.fixed_phrases():
+            if self.cache.get(phrase) is None:
+                clip = trim_silence(b"".join(synthesize(phrase)))
+                self.cache.put(phrase, fade(clip))
+                rendered += 1
+        return rendered
+
+    def split(self, reply):
+        """(cached clips for the leading fixed segments, text of the rest to synthesize)"""
+        head = []
+        for index, (text, is_fixed) in enumerate(reply.segments):
+            clip = self.cache.get(text.strip()) if is_fixed and text.strip() else None
+            if clip is None and text.strip():
+                break
+            if clip:
+                head.append(clip)
+        else:
+            index = len(reply.segments)
+        return head, "".join(text for text, _ in reply.segments[index:]).strip()
+
+    def play(self, reply, synthesize, sink, fallback=None):
+        """Play cached leading segments now and the synthesized remainder after them"""
+        head, tail_text = self.split(reply)
+
+        self.stats['replies'] += 1
+        self.stats['chars_total'] += len(reply)
+        self.stats['chars_synthesized'] += len(tail_text)
+
+        # Start the tail request before the cached audio plays
+        chunks = queue.Queue()
+        if tail_text:
+            def fetch():
+                try:
+                    for chunk in synthesize(tail_text):
+                        chunks.put(chunk)
+                    chunks.put(None)
+                except Exception as e:
+                    chunks.put(e)
+            threading.Thread(target=fetch, daemon=True).start()
+
+        if head:
+            sink.play([part for clip in head for part in (clip, self.gap)])
+        if not tail_text:
+            return
+
+        first = chunks.get()
+        if isinstance(first, Exception) or first is None:
+            if fallback:
+                fallback(tail_text)
+            return
+
+        def drain():
+            yield first
+            while True:
+                item = chunks.get()
+                if item is None or isinstance(item, Exception):
+                    return
+                yield item
+
+        sink.play(skip_leading_silence(drain()))
@@ -0,0 +1,139 @@
+"""
+Compound commands: several requests in one utterance.
+
+"set volume to 30 and take a screenshot and what's the weather in paris" is
+split on conjunctions into sub-commands. A split is kept only where both sides
+match a manifest rule on their own, so "add milk and eggs to my to do list" and
+"a timer for an hour and a half" stay whole. Each sub-command then waits for
+the earlier ones it depends on:
+
+- after "then" / "after that", on the one before it
+- when it refers back ("save it", "read that"), on the one before it
+- when it changes the same state (two volume changes, opening an app and
+  taking a screenshot), on the earlier one changing that state
+- exit, privacy mode and help run after everything before them, and everything
+  after them waits for them
+
+plan() groups the sub-commands into waves; the commands in one wave are
+independent and can run at once, so a compound command takes about as long as
+its slowest wave rather than the sum of its parts.
+
+    >>> [[step.command for step in wave] for wave in plan("mute the volume and take a screenshot then save it", match)]
+    [['mute the volume', 'take a screenshot'], ['save the screenshot']]
+"""
+
+import re
+from collections import namedtuple
+
+# index: position in the utterance; rule: the manifest rule it matched;
+# after: indexes of the sub-commands it waits for
+Step = namedtuple('Step', ['index', 'command', 'rule', 'after'])
+
+# Conjunctions between sub-commands; the captured text is put back when a split is rejected
+_JOINER = re.compile(r'(\s*,\s*(?:and then|and after that|after that|then|and)?\s+|'
+                     r'\s+(?:and then|and after that|after that|then|and)\s+)')
+_SEQUENTIAL = re.compile(r'\bthen\b|\bafter that\b')
+# A sub-command that uses the previous one's result
+_REFERENCE = re.compile(r'\b(?:save|open|send|read|close|delete|copy|play|show|share|rename|move|repeat)\s+'
+                        r'(?P<pronoun>it|that|them|this|those)\b|\bthe (?:same|result|answer)\b')
+# What "it" means after these intents, so "take a screenshot and save it" can be split
+REFERENTS = {
+    'screenshot': 'the screenshot', 'save_screenshot': 'the screenshot',
+    'todo_add': 'my to do list', 'todo_read': 'my to do list',
+}
+
+# Intents that change shared state keep their spoken order; the rest (lookups,
+# calculations, timers) can run alongside anything
+RESOURCES = {
+    'volume': 'volume', 'note': 'notes',
+    'screenshot': 'desktop', 'save_screenshot': 'desktop', 'lock_screen': 'desktop',
+    'minimize_windows': 'desktop', 'switch_window': 'desktop', 'close_app': 'desktop',
+    'open_app': 'desktop', 'open_website': 'desktop',
+    'todo_add': 'todo', 'todo_read': 'todo',
+    'create_folder': 'files', 'create_file': 'files', 'search_files': 'files',
+}
+# Intents that change how everything after them behaves
+BARRIERS = {'exit', 'privacy_mode', 'help'}
+
+
+def resolve(piece, previous):
+    """piece with a pronoun replaced by what the previous rule's intent refers to ("save it" -> "save the screenshot")"""
+    referent = REFERENTS.get(previous.intent)
+    reference = _REFERENCE.search(piece)
+    if referent is None or reference is None or reference.group('pronoun') is None:
+        return piece
+    return piece[:reference.start('pronoun')] + referent + piece[reference.end('pronoun'):]
+
+
+def split(command, match):
+    """[(joiner, sub-command, refers back)] of an utterance; joiner is the conjunction before it
+
+    match is plugins.match. The pieces between conjunctions are grouped into
+    the most sub-commands that each match a rule on their own; pieces that
+    match nothing stay with the ones before them ("for an hour and a half").
+    """
+    pieces = _JOINER.split(command)
+    texts, joiners = pieces[0::2], pieces[1::2]
+    if len(texts) == 1:
+        return [('', command, False)]
+    best = {0: []}                  # number of pieces covered -> best parts for them
+    for end in range(1, len(texts) + 1):
+        for start in reversed(range(end)):
+            parts = best.get(start)
+            if parts is None:
+                continue
+            text = texts[start] + ''.join(joiners[k] + texts[k + 1] for k in range(start, end - 1))
+            refers = bool(parts) and bool(_REFERENCE.search(text))
+            if match(text) is None:
+                text = resolve(text, match(parts[-1][1])) if parts else text
+                if match(text) is None:
+                    continue
+            candidate = parts + [(joiners[start - 1].strip(' ,') if start else '', text, refers)]
+            if end not in best or len(candidate) > len(best[end]):
+                best[end] = candidate
+    return best.get(len(texts)) or [('', command, False)]
+
+
+def plan(command, match):
+    """Waves of Steps for a compound command, or None if it is a single command"""
+    parts = split(command, match)
+    if len(parts) == 1:
+        return None
+    steps, last_by_resource, barrier = [], {}, None
+    for index, (joiner, text, refers) in enumerate(parts):
+        rule = match(text)
+        resource = RESOURCES.get(rule.intent)
+        after = set()
+        if index and (refers or _SEQUENTIAL.search(joiner)):
+            after.add(index - 1)
+        if resource is not None and resource in last_by_resource:
+            after.add(last_by_resource[resource])
+        if barrier is not None:
+            after.add(barrier)
+        if rule.intent in BARRIERS:
+            after.update(range(index))
+            barrier = index
+        if resource is not None:
+            last_by_resource[resource] = index
+        steps.append(Step(index, text, rule, tuple(sorted(after))))
+
+    levels = []
+    for step in steps:
+        levels.append(1 + max((levels[i] for i in step.after), default=-1))
+    waves = [[] for _ in range(max(levels) + 1)]
+    for step, level in zip(steps, levels):
+        waves[level].append(step)
+    return waves
+
+
+def execute(waves, run, pool):
+    """Run every step's command with run(command) on pool, wave by wave; results in utterance order"""
+    results = {}
+    for wave in waves:
+        if len(wave) == 1:
+            results[wave[0].index] = run(wave[0].command)
+            continue
+        futures = [(step.index, pool.submit(run, step.command)) for step in wave]
+        for index, future in futures:
+            results[index] = future.result()
+    return [results[index] for index in sorted(results)]
@@ -13,6 +13,32 @@ import os
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "YOUR_ELEVENLABS_API_KEY")
 CUSTOM_VOICE_NAME = os.getenv("CUSTOM_VOICE_NAME", "default_voice")  # Name of your custom voice
 
+# Resolved voice ID is cached locally and revalidated in the background
+VOICE_CACHE_FILE = "voice_cache.json"
+VOICE_CACHE_MAX_AGE = 24 * 3600  # Seconds before the cached ID is revalidated
+VOICE_LOOKUP_TIMEOUT = 2  # Max seconds startup waits for a lookup when nothing is cached
+
+# Cloud TTS transport: fail fast and fall back to the local engine during outages
+TTS_CONNECT_TIMEOUT = 2.0  # Seconds to open a connection
+TTS_FIRST_BYTE_TIMEOUT = 3.0  # Seconds to wait for the first audio byte
+TTS_MAX_RETRIES = 1  # Retries per request (also limited by a shared retry budget)
+TTS_BREAKER_THRESHOLD = 3  # Consecutive failures before skipping ElevenLabs
+TTS_BREAKER_RESET = 30  # Seconds before a probe request tries ElevenLabs again
+
+# "pcm_16000" / "pcm_22050" / "pcm_24000" play in-process from memory (needs PyAudio);
+# "mp3_44100_128" saves an MP3 and opens it with the default player
+TTS_OUTPUT_FORMAT = "pcm_22050"
+
+# Pre-rendered audio for fixed reply phrases ("Of course!", "Volume set to", ...)
+PHRASE_CACHE_DIR = "phrase_cache"
+
+# Cloud TTS character budget: long or over-budget replies use the local voice
+TTS_CHAR_BUDGET = int(os.getenv("ASSISTANT_TTS_CHAR_BUDGET", "10000"))  # Characters per period (0 = no limit)
+TTS_BUDGET_PERIOD_DAYS = 30  # Billing period; the count resets when it renews
+TTS_BUDGET_FILE = "tts_budget.json"  # Where the count survives restarts
+TTS_CLOUD_MAX_CHARS = 200  # Longest reply sent to the cloud (shrinks when spending runs ahead)
+REPLY_CACHE_MB = 16  # Memory for audio of replies that recur
+
 # =============================================================================
 # API KEYS
 # =============================================================================
@@ -43,6 +69,39 @@ TTS_VOLUME = 0.9  # Volume level for fallback TTS (0.0 to 1.0)
 ENABLE_ELEVENLABS = True
 ENABLE_WEATHER = True
 
+# Import command plugins (and their platform libraries) only when first used
+LAZY_PLUGINS = os.getenv("LAZY_PLUGINS", "1") != "0"
+
+# While the greeting plays, load plugins and the classifier, open connections to
+# the recognition, TTS and weather hosts and pre-render reply phrases, so the
+# first command is as fast as later ones
+WARMUP = True
+WARMUP_BUDGET = 3.0  # Seconds to wait for it after the greeting (unfinished parts continue in the background)
+
+# Desktop access (volume, windows, screenshots, playback): "windows", "linux",
+# "fake" (in memory, for headless runs and benchmarks) or "auto" to pick by platform
+PLATFORM_BACKEND = os.getenv("ASSISTANT_BACKEND", "auto")
+
+# =============================================================================
+# SERVER MODE (python main.py --serve)
+# =============================================================================
+
+SERVER_HOST = "127.0.0.1"  # Use "0.0.0.0" to accept satellites from the local network
+SERVER_PORT = 8765
+SERVER_WORKERS = 4  # Commands processed at the same time
+SERVER_SESSION_TTL = 600  # Seconds before an idle satellite session is forgotten
+SERVER_TOKEN = os.getenv("ASSISTANT_SERVER_TOKEN", "")  # Shared secret satellites must send (empty = none)
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+# Prometheus-format metrics (replies by TTS backend, recognition errors, command
+# latency, cache hit rates, queue depths) at http://METRICS_HOST:METRICS_PORT/metrics
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.getenv("ASSISTANT_METRICS_PORT", "9464"))  # 0 = no endpoint
+METRICS_FILE = "metrics.prom"  # Written on exit ("" = don't write)
+
 # =============================================================================
 # SYSTEM SETTINGS
 # =============================================================================
@@ -51,8 +110,90 @@ ENABLE_WEATHER = True
 NOTES_FILE = "quick_notes.txt"
 TODO_FILE = "todo.txt"
 
+# Screenshots (encoded in the background; recent ones kept in memory)
+SCREENSHOT_FORMAT = "png"  # "png", "jpeg" or "webp"
+SCREENSHOT_QUALITY = 85  # JPEG/WebP quality
+SCREENSHOT_COMPRESS_LEVEL = 1  # PNG zlib level (1 = fast) / WebP method
+SCREENSHOT_RING_SIZE = 5  # Recent captures kept for "save the last screenshot"
+SCREENSHOT_DIR = "."
+SCREENSHOT_AUTOSAVE = True  # False = keep captures in memory until saved
+
+# Extra names for "open ..." commands, e.g.
+# {"websites": {"hn": "https://news.ycombinator.com"}, "apps": {"editor": "code"}}
+ALIASES_FILE = "aliases.json"
+ALIAS_MIN_CONFIDENCE = 0.6  # Below this, unknown names are opened as typed
+
+# Disk usage: folders sized for "what's using my disk"; the size tree is cached
+# and only directories that changed are listed again on refresh
+DISK_SCAN_ROOTS = [os.path.join(os.path.expanduser("~"), name)
+                   for name in ("Desktop", "Documents", "Downloads", "Music", "Pictures", "Videos")]
+DISK_SCAN_WORKERS = 8
+DISK_CACHE_FILE = "disk_usage.json"
+DISK_REFRESH_SECONDS = 300  # Answers older than this trigger a background refresh
+DISK_LARGE_FILE_MB = 100  # Files at least this big are indexed for "files over ..." questions
+
 # Speech recognition settings
 ENERGY_THRESHOLD = 4000
 DYNAMIC_ENERGY_THRESHOLD = True
 LISTEN_TIMEOUT = 5
 PHRASE_TIME_LIMIT = 10
+
+# Idle listening: after IDLE_AFTER seconds without a command, wait on a cheap
+# energy gate over short frames and only wake the full capture on sustained sound
+IDLE_LISTENING = True
+IDLE_AFTER = 30  # Seconds without a command before going idle
+IDLE_SAMPLE_RATE = 16000  # Microphone rate while idle
+IDLE_ENERGY_FACTOR = 3.0  # How far above the background a frame must be to count as loud
+IDLE_MIN_ENERGY = 300  # Quietest frame level that can count as loud
+IDLE_MIN_SPEECH = 0.15  # Seconds of loud frames (within half a second) that wake the full capture
+
+# Recorded speech is trimmed to the words (plus SILENCE_PADDING seconds each
+# side), resampled to RECOGNITION_SAMPLE_RATE and FLAC-encoded in-process
+# before upload, so less is sent over slow connections
+AUDIO_CONDITIONING = True
+RECOGNITION_SAMPLE_RATE = 16000
+SILENCE_PADDING = 0.25
+
+# Streaming recognition: interim transcripts while speaking, early commit of
+# short commands whose intent is already complete (e.g. "volume 40")
+STREAMING_RECOGNITION = False
+INTERIM_INTERVAL = 0.5  # Seconds of audio between interim recognition requests
+EARLY_COMMIT_PAUSE = 0.25  # Pause (seconds) that ends a phrase once its intent is complete
+
+# Speculative prefetch: start Wikipedia/weather lookups from interim transcripts
+SPECULATIVE_PREFETCH = True
+SPECULATION_TTL = 10  # Seconds a speculative result stays usable
+SPECULATION_MIN_CHARS = 3  # Shortest query worth speculating on (raise to be less aggressive)
+
+# Several requests in one utterance ("set volume to 30 and take a screenshot")
+# are split on "and" / "then"; independent ones run at the same time
+COMPOUND_COMMANDS = True
+COMPOUND_WORKERS = 4  # Parts of one compound command run at once
+
+# Commands no keyword rule matches are classified statistically (needs NumPy)
+INTENT_CLASSIFIER = True
+INTENT_MIN_CONFIDENCE = 0.5  # Below this the command is treated as unknown
+INTENT_ACTION_CONFIDENCE = 0.65  # Higher bar for guesses that lock, exit, close apps or change the volume
+INTENT_MODEL_FILE = "intent_model.npz"  # Trained weights, rebuilt when the examples change
+
+# Answers from Wikipedia and weather lookups are reused for this many seconds (0 = off)
+LOOKUP_CACHE_TTL = 300
+
+# Offline Wikipedia abstracts, checked before the network ("what is ...").
+# Build with: python wiki_index.py build enwiki-latest-abstract.xml.gz
+WIKI_INDEX_FILE = "wiki_index.bin"
+
+# Spoken answers from the web ("search the web for ..."). A search endpoint that
+# returns JSON results with URLs, {query} is filled in; e.g. a SearXNG instance:
+# "http://127.0.0.1:8888/search?q={query}&format=json". Empty opens a Google
+# search in the browser instead.
+WEB_SEARCH_URL = os.getenv("ASSISTANT_WEB_SEARCH_URL", "")
+WEB_ANSWER_PAGES = 3  # Top results fetched at once
+WEB_ANSWER_PAGE_TIMEOUT = 3  # Seconds each page may take
+
+# Barge-in: keep listening while replies play (in-process PCM output only) and
+# stop talking when the user starts speaking
+BARGE_IN = True
+BARGE_IN_MARGIN = 1.5  # How much louder than the expected echo of the reply speech must be
+BARGE_IN_MIN_SPEECH = 0.15  # Seconds of speech before playback is interrupted
+BARGE_IN_ECHO_TAIL = 0.25  # Output latency plus room echo, in seconds
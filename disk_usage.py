@@ -0,0 +1,302 @@
+"""
+Disk usage analyzer: a cached directory size tree.
+
+The configured roots are walked with os.scandir on a thread pool, one task per
+directory, and the result is kept as a tree of directory sizes plus an index of
+large files. The tree is saved to disk; a refresh stats every directory but
+only lists again those whose mtime changed (a file was added, removed or
+renamed in it), so after the first scan questions like "largest folders in
+Downloads" or "files over 1 GB" are answered from memory in milliseconds.
+
+A file rewritten in place does not change its directory's mtime; its new size
+is picked up by the next full scan (refresh(full=True)).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+CACHE_VERSION = 1
+
+
+class DirNode:
+    """One directory: its own files and its subdirectories"""
+
+    __slots__ = ('path', 'mtime', 'own', 'files', 'large', 'children', 'size')
+
+    def __init__(self, path, mtime, own=0, files=0, large=None):
+        self.path = path
+        self.mtime = mtime          # st_mtime_ns when it was listed
+        self.own = own              # bytes in files directly inside
+        self.files = files          # number of files directly inside
+        self.large = large or []    # [(name, size)] of files above the large file floor
+        self.children = {}          # name -> DirNode
+        self.size = own             # own plus all subdirectories, set by _total()
+
+    def to_json(self):
+        return [self.mtime, self.own, self.files, self.large,
+                {name: child.to_json() for name, child in self.children.items()}]
+
+    @classmethod
+    def from_json(cls, path, data):
+        mtime, own, files, large, children = data
+        node = cls(path, mtime, own, files, [tuple(item) for item in large])
+        for name, child in children.items():
+            node.children[name] = cls.from_json(os.path.join(path, name), child)
+        return node
+
+
+def human_size(size):
+    """1536 -> "1.5 KB", 104857600 -> "100 MB\""""
+    for unit in ('bytes', 'KB', 'MB', 'GB', 'TB'):
+        if size < 1024 or unit == 'TB':
+            return f"{size:.0f} {unit}" if unit == 'bytes' else f"{size:.1f}".rstrip('0').rstrip('.') + f" {unit}"
+        size /= 1024
+
+
+def _total(root):
+    """Fill in size (own + descendants) for every node, without recursion"""
+    order, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node.children.values())
+    for node in reversed(order):
+        node.size = node.own + sum(child.size for child in node.children.values())
+
+
+class DiskUsage:
+    """Size tree over a set of root folders, refreshed incrementally"""
+
+    def __init__(self, roots, cache_file=None, workers=8, large_file_bytes=100 * 1024 * 1024):
+        self.roots = [os.path.abspath(os.path.expanduser(root)) for root in roots]
+        self.cache_file = cache_file
+        self.workers = workers
+        self.large_file_bytes = large_file_bytes
+        self.trees = {}             # root -> DirNode
+        self.scanned_at = None
+        self.stats = {'listed': 0, 'reused': 0, 'entries': 0, 'errors': 0, 'seconds': 0.0}
+        self._index = {}            # normcased path -> DirNode
+        self._names = {}            # lowercase folder name -> shallowest DirNode with that name
+        self._large = []            # [(size, path)], largest first
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    # -------------------------------------------------------------------------
+    # Scanning
+    # -------------------------------------------------------------------------
+
+    def _list(self, path, cached, full):
+        """List one directory, or reuse its cached listing if unchanged
+
+        Returns (node, [(subdirectory name, its cached node)], entries listed, reused).
+        """
+        mtime = os.stat(path).st_mtime_ns
+        if cached is not None and cached.mtime == mtime and not full:
+            node = DirNode(path, mtime, cached.own, cached.files, cached.large)
+            return node, list(cached.children.items()), 0, True
+        node = DirNode(path, mtime)
+        subdirs, entries = [], 0
+        with os.scandir(path) as it:
+            for entry in it:
+                entries += 1
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, cached.children.get(entry.name) if cached else None))
+                    elif entry.is_file(follow_symlinks=False):
+                        size = entry.stat(follow_symlinks=False).st_size
+                        node.own += size
+                        node.files += 1
+                        if size >= self.large_file_bytes:
+                            node.large.append((entry.name, size))
+                except OSError:
+                    pass
+        return node, subdirs, entries, False
+
+    def _walk(self, pool, root, cached, full):
+        """Walk one root on the pool; returns its DirNode or None
+
+        Each task walks its subtree depth first and hands subdirectories to the
+        pool only while there are idle workers, so a warm (cached) scan is not
+        dominated by per-task overhead and a cold one still keeps every worker
+        waiting on the disk.
+        """
+        results = queue.Queue()
+        waiting = [0]               # submitted tasks not yet started
+        submitted = [0]
+        lock = threading.Lock()
+
+        def submit(path, cached_node, parent, name):
+            with lock:
+                waiting[0] += 1
+                submitted[0] += 1
+            pool.submit(task, path, cached_node, parent, name)
+
+        def task(path, cached_node, parent, name):
+            with lock:
+                waiting[0] -= 1
+            counts = {'listed': 0, 'reused': 0, 'entries': 0, 'errors': 0}
+            top = None
+            stack = [(path, cached_node, parent, name)]
+            try:
+                while stack:
+                    path, cached_node, parent, name = stack.pop()
+                    try:
+                        node, subdirs, entries, reused = self._list(path, cached_node, full)
+                    except OSError:
+                        counts['errors'] += 1
+                        continue
+                    counts['entries'] += entries
+                    counts['reused' if reused else 'listed'] += 1
+                    if parent is None:
+                        top = node
+                    else:
+                        parent.children[name] = node
+                    for child_name, child_cached in subdirs:
+                        child = (os.path.join(path, child_name), child_cached, node, child_name)
+                        if waiting[0] < self.workers and stack:
+                            submit(*child)
+                        else:
+                            stack.append(child)
+            finally:
+                results.put((top, counts))
+
+        submit(root, cached, None, None)
+        # A task submits its subtasks before reporting, so once every submitted
+        # task has reported, nothing is left running
+        received, top = 0, None
+        while True:
+            node, counts = results.get()
+            received += 1
+            top = top or node
+            for key, value in counts.items():
+                self.stats[key] += value
+            with lock:
+                if received == submitted[0]:
+                    break
+        if top is not None:
+            _total(top)
+        return top
+
+    def refresh(self, full=False):
+        """Rescan the roots, listing only directories whose mtime changed (all of them if full)"""
+        start = time.perf_counter()
+        self.stats.update(listed=0, reused=0, entries=0, errors=0)
+        trees = {}
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="disk-scan") as pool:
+            for root in self.roots:
+                if os.path.isdir(root):
+                    tree = self._walk(pool, root, self.trees.get(root), full)
+                    if tree is not None:
+                        trees[root] = tree
+        changed = self.stats['listed'] or trees.keys() != self.trees.keys()
+        self._install(trees, time.time())
+        self.stats['seconds'] = time.perf_counter() - start
+        if changed:
+            self.save()
+        return self
+
+    def _install(self, trees, scanned_at):
+        """Swap in a new set of trees and rebuild the lookup indexes"""
+        index, names, large = {}, {}, []
+        for tree in trees.values():
+            stack = [tree]
+            while stack:
+                node = stack.pop()
+                index[os.path.normcase(node.path)] = node
+                name = os.path.basename(node.path).lower()
+                known = names.get(name)
+                if known is None or known.path.count(os.sep) > node.path.count(os.sep):
+                    names[name] = node
+                large.extend((size, os.path.join(node.path, file)) for file, size in node.large)
+                stack.extend(node.children.values())
+        large.sort(reverse=True)
+        with self._lock:
+            self.trees, self._index, self._names, self._large = trees, index, names, large
+            self.scanned_at = scanned_at
+
+    def refresh_in_background(self):
+        """Start a refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            self._refreshing = threading.Thread(target=self.refresh, daemon=True, name="disk-refresh")
+            self._refreshing.start()
+
+    def ensure_fresh(self, max_age):
+        """Scan now if there is no tree yet; refresh in the background if it is older than max_age"""
+        if self.scanned_at is None:
+            self.load()
+        if self.scanned_at is None:
+            self.refresh()
+        elif time.time() - self.scanned_at > max_age:
+            self.refresh_in_background()
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self):
+        if not self.cache_file:
+            return
+        try:
+            data = {'version': CACHE_VERSION, 'scanned_at': self.scanned_at, 'large_file_bytes': self.large_file_bytes,
+                    'trees': {root: tree.to_json() for root, tree in self.trees.items()}}
+            temp = self.cache_file + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                f.write(json.dumps(data, separators=(',', ':')))    # dumps uses the C encoder, dump doesn't
+            os.replace(temp, self.cache_file)
+        except Exception as e:
+            print(f"Could not save disk usage cache: {e}")
+
+    def load(self):
+        """Load the saved tree; returns False if missing or made with other settings"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get('version') != CACHE_VERSION or data.get('large_file_bytes') != self.large_file_bytes:
+                return False
+            trees = {root: DirNode.from_json(root, tree) for root, tree in data['trees'].items() if root in self.roots}
+            for tree in trees.values():
+                _total(tree)
+            self._install(trees, data['scanned_at'])
+            return True
+        except Exception:
+            return False
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def find(self, name):
+        """A scanned folder by path or by (spoken) folder name"""
+        if not name:
+            return None
+        node = self._index.get(os.path.normcase(os.path.abspath(os.path.expanduser(name))))
+        return node or self._names.get(name.strip().lower())
+
+    def total(self):
+        return sum(tree.size for tree in self.trees.values())
+
+    def largest_folders(self, folder=None, count=5):
+        """[(size, path)] of the biggest subfolders of folder (or of all roots)"""
+        parents = [folder] if folder else list(self.trees.values())
+        children = [child for parent in parents for child in parent.children.values()]
+        return [(child.size, child.path) for child in sorted(children, key=lambda c: c.size, reverse=True)[:count]]
+
+    def large_files(self, min_size=None, folder=None, count=10):
+        """[(size, path)] of the biggest indexed files, at least min_size bytes, optionally under folder"""
+        min_size = max(min_size or 0, self.large_file_bytes)
+        prefix = os.path.normcase(folder.path + os.sep) if folder else None
+        found = []
+        for size, path in self._large:
+            if size < min_size:
+                break
+            if prefix is None or os.path.normcase(path).startswith(prefix):
+                found.append((size, path))
+                if len(found) == count:
+                    break
+        return found
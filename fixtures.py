@@ -0,0 +1,163 @@
+"""
+Audio fixtures: record live utterances, replay them without a microphone.
+
+Recording stores each utterance's audio as a WAV file next to a JSON-lines
+manifest holding the transcript, matched intent, spoken responses and per-stage
+timings. Replaying opens each WAV as a speech_recognition audio source, paced to
+real time, so it goes through the same calibration, voice activity detection and
+recognition path as the microphone. The recorded transcript can stand in for
+the recognizer to make replays repeatable offline.
+"""
+
+import audioop
+import datetime
+import json
+import os
+import statistics
+import threading
+import time
+
+import speech_recognition as sr
+
+MANIFEST = "fixtures.jsonl"
+
+# Stages timed for every utterance, in pipeline order
+STAGES = ('calibrate', 'capture', 'recognize', 'respond')
+
+
+# =============================================================================
+# RECORDING
+# =============================================================================
+
+def room_tone(raw, sample_width, sample_rate, seconds, window=0.05):
+    """Background noise for padding: the quietest short window of a recording, tiled"""
+    size = max(sample_width, int(sample_rate * window) * sample_width)
+    windows = [raw[i:i + size] for i in range(0, len(raw) - size + 1, size)] or [raw]
+    quietest = min(windows, key=lambda w: audioop.rms(w, sample_width) if w else 0)
+    needed = int(sample_rate * seconds) * sample_width
+    if not quietest:
+        return b"\x00" * needed
+    return (quietest * (needed // len(quietest) + 1))[:needed]
+
+
+def pad_audio(audio, lead, tail):
+    """Surround captured speech with room tone so calibration and end-of-phrase detection replay like live"""
+    raw = audio.get_raw_data()
+    width, rate = audio.sample_width, audio.sample_rate
+    return sr.AudioData(room_tone(raw, width, rate, lead) + raw + room_tone(raw, width, rate, tail), rate, width)
+
+
+class FixtureRecorder:
+    """Append utterances to a fixture directory"""
+
+    def __init__(self, directory, lead=0.5, tail=1.0):
+        self.directory = directory
+        self.lead = lead        # covers ambient-noise calibration before listening
+        self.tail = tail        # at least the recognizer's pause threshold
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.count = len(load_manifest(directory))
+
+    def record(self, audio, transcript, intent=None, responses=(), timings=None):
+        """Save one utterance; returns its fixture id"""
+        with self._lock:
+            self.count += 1
+            fixture_id = f"utt_{self.count:04d}"
+            wav = fixture_id + ".wav"
+            with open(os.path.join(self.directory, wav), "wb") as f:
+                f.write(pad_audio(audio, self.lead, self.tail).get_wav_data())
+            entry = {
+                'id': fixture_id,
+                'wav': wav,
+                'transcript': transcript,
+                'intent': intent,
+                'responses': [str(r) for r in responses],
+                'timings': {k: round(v, 4) for k, v in (timings or {}).items()},
+                'recorded_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            }
+            with open(os.path.join(self.directory, MANIFEST), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            return fixture_id
+
+
+def load_manifest(directory):
+    """Return the fixture entries recorded in a directory, oldest first"""
+    try:
+        with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+class _PacedStream:
+    """Wraps an audio file stream so reads return no faster than real time"""
+
+    def __init__(self, stream, bytes_per_second):
+        self.stream = stream
+        self.bytes_per_second = bytes_per_second
+        self.start = None
+        self.delivered = 0
+
+    def read(self, size=-1):
+        if self.start is None:
+            self.start = time.perf_counter()
+        data = self.stream.read(size)
+        self.delivered += len(data)
+        delay = self.start + self.delivered / self.bytes_per_second - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return data
+
+
+class FixtureSource(sr.AudioFile):
+    """A WAV fixture (path or file object) usable wherever the assistant opens sr.Microphone()"""
+
+    def __init__(self, filename, realtime=True, chunk=1024):
+        super().__init__(filename)
+        self.realtime = realtime
+        self.chunk = chunk      # frames per read, as sr.Microphone uses by default
+
+    def __enter__(self):
+        source = super().__enter__()
+        self.CHUNK = self.chunk
+        if self.realtime:
+            self.stream = _PacedStream(self.stream, self.SAMPLE_RATE * self.SAMPLE_WIDTH)
+        return source
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if isinstance(self.stream, _PacedStream):
+            self.stream = self.stream.stream
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
+class FixtureRecognizer(sr.Recognizer):
+    """Recognizer that answers with the recorded transcript instead of calling Google"""
+
+    def __init__(self, transcript):
+        super().__init__()
+        self.transcript = transcript
+
+    def recognize_google(self, audio_data, *args, **kwargs):
+        if not self.transcript:
+            raise sr.UnknownValueError()
+        return self.transcript
+
+
+def summarize(results):
+    """Per-stage latency summary (median, p95, max in ms) over replay results"""
+    lines = []
+    for stage in STAGES + ('total',):
+        values = sorted(r['timings'][stage] * 1000 for r in results if stage in r.get('timings', {}))
+        if not values:
+            continue
+        p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+        lines.append(f"{stage:<10} median {statistics.median(values):8.1f} ms   "
+                     f"p95 {p95:8.1f} ms   max {values[-1]:8.1f} ms   (n={len(values)})")
+    mismatched = [r['id'] for r in results if not r.get('match', True)]
+    if mismatched:
+        lines.append(f"transcript/intent changed: {', '.join(mismatched)}")
+    return "\n".join(lines)
@@ -0,0 +1,137 @@
+"""
+Idle listening: a cheap energy gate while nobody is talking.
+
+The normal capture path opens the microphone, calibrates for half a second
+and waits up to LISTEN_TIMEOUT for a phrase, over and over, so a core stays
+busy all day. After IDLE_AFTER seconds without a command the assistant goes
+idle instead: one low-rate microphone stream stays open, audio is read in
+blocks (the thread sleeps in the blocking read in between) and each short
+frame's RMS is compared with a slowly tracked noise floor. Only sustained
+energy, enough loud frames within a short window, wakes the full path, so a
+door slam or a cough doesn't. The phrase that woke it, with a little
+pre-roll, is captured and handed back to be recognized.
+
+    listener = IdleListener(lambda: sr.Microphone(sample_rate=16000))
+    audio = listener.wait()         # blocks until someone talks
+"""
+
+import audioop
+import collections
+import time
+
+import speech_recognition as sr
+
+
+class EnergyGate:
+    """Per-frame loudness against a tracked noise floor; reports sustained energy"""
+
+    def __init__(self, frame_seconds, factor=3.0, min_energy=300, min_speech=0.15, window=0.5,
+                 rise=0.002, fall=0.2):
+        self.factor = factor            # how far above the noise floor a loud frame is
+        self.min_energy = min_energy    # quietest level that can count as loud
+        self.rise = rise                # how fast the floor follows louder background
+        self.fall = fall                # and quieter background
+        self.floor = None
+        self.needed = max(1, int(round(min_speech / frame_seconds)))
+        self._recent = collections.deque(maxlen=max(self.needed, int(round(window / frame_seconds))))
+        self._loud = 0
+
+    def threshold(self):
+        return max(self.min_energy, self.factor * (self.floor or 0))
+
+    def feed(self, energy):
+        """Count one frame's RMS; True once enough of the recent frames were loud"""
+        if self.floor is None:
+            self.floor = energy
+        loud = energy > self.threshold()
+        if not loud:
+            self.floor += (self.fall if energy < self.floor else self.rise) * (energy - self.floor)
+        if len(self._recent) == self._recent.maxlen:
+            self._loud -= self._recent[0]
+        self._recent.append(loud)
+        self._loud += loud
+        return self._loud >= self.needed
+
+    def reset(self):
+        self._recent.clear()
+        self._loud = 0
+
+
+class IdleListener:
+    """Waits on an energy gate and captures the phrase that wakes it"""
+
+    def __init__(self, open_source, frame_seconds=0.02, block_seconds=0.1, factor=3.0, min_energy=300,
+                 min_speech=0.15, pause=0.8, phrase_time_limit=10, pre_roll=0.3):
+        self.open_source = open_source  # callable returning an sr.AudioSource (e.g. sr.Microphone)
+        self.frame_seconds = frame_seconds
+        self.block_seconds = block_seconds
+        self.pause = pause
+        self.phrase_time_limit = phrase_time_limit
+        self.pre_roll = pre_roll
+        self.gate = EnergyGate(frame_seconds, factor=factor, min_energy=min_energy, min_speech=min_speech)
+        self.position = 0.0             # seconds of audio read from the current source
+        self.woke_at = None             # position of the last wake
+        self.stats = collections.Counter()
+
+    def wait(self, stop=None):
+        """Block until sustained energy, then return the phrase as sr.AudioData
+
+        Returns None when the source runs out or stop() becomes true (checked
+        once per block).
+        """
+        with self.open_source() as source:
+            self.position = 0.0
+            self.woke_at = None
+            self.gate.reset()
+            start = time.perf_counter()
+            try:
+                frames = self._gate(source, stop)
+                if frames is None:
+                    return None
+                self.stats['wakes'] += 1
+                return self._capture(source, frames)
+            finally:
+                self.stats['seconds'] += time.perf_counter() - start
+
+    def _gate(self, source, stop):
+        """Read blocks until the gate opens; returns the pre-roll frames"""
+        width, rate = source.SAMPLE_WIDTH, source.SAMPLE_RATE
+        frame_samples = max(1, int(rate * self.frame_seconds))
+        frame_bytes = frame_samples * width
+        frame_seconds = frame_samples / rate
+        block_samples = frame_samples * max(1, int(round(self.block_seconds / self.frame_seconds)))
+        pre_roll = collections.deque(maxlen=max(self.gate.needed, int(self.pre_roll / frame_seconds)) + 1)
+        while not (stop and stop()):
+            block = source.stream.read(block_samples)
+            if not block:
+                return None
+            self.stats['blocks'] += 1
+            # A wake-up is only seen once the whole block has arrived
+            self.position += len(block) / (width * rate)
+            for offset in range(0, len(block) - frame_bytes + 1, frame_bytes):
+                frame = block[offset:offset + frame_bytes]
+                pre_roll.append(frame)
+                if self.gate.feed(audioop.rms(frame, width)):
+                    self.woke_at = self.position
+                    # The rest of this block belongs to the phrase
+                    pre_roll.append(block[offset + frame_bytes:])
+                    return list(pre_roll)
+        return None
+
+    def _capture(self, source, frames):
+        """Keep reading until a pause (plain energy endpointing against the gate's threshold)"""
+        width, rate = source.SAMPLE_WIDTH, source.SAMPLE_RATE
+        chunk = max(1, int(rate * self.frame_seconds))
+        frame_seconds = chunk / rate
+        threshold = self.gate.threshold()
+        captured = sum(len(frame) for frame in frames) / (width * rate)
+        silence = 0.0
+        while silence < self.pause and captured < self.phrase_time_limit:
+            frame = source.stream.read(chunk)
+            if not frame:
+                break
+            frames.append(frame)
+            captured += frame_seconds
+            self.position += frame_seconds
+            silence = 0.0 if audioop.rms(frame, width) > threshold else silence + frame_seconds
+        return sr.AudioData(b"".join(frames), rate, width)
@@ -0,0 +1,187 @@
+"""
+Training examples for the fallback intent classifier (classifier.py).
+
+Each label maps to phrasings the keyword rules in plugins/__init__.py miss or
+only partly cover. Arguments are marked with [brackets]: they are trained on
+like any other words, but only words outside brackets count as the label's
+trigger words. CANONICAL turns a classified command back into one the rules and
+handlers understand; {rest} is filled with the words left once trigger words
+are removed ("shut down chrome" -> "close application chrome"). A guess with
+nothing left for {rest} is dropped, unless its label is in OPTIONAL_REST; so is
+a side-effecting guess (classifier.SIDE_EFFECTS) with words left over when its
+command takes no {rest} ("lock the door" is not "lock screen"). The
+'none' label collects things the assistant can't do, so they stay unknown
+instead of being forced into the nearest intent.
+"""
+
+CANONICAL = {
+    'exit': "goodbye",
+    'greeting': "hello",
+    'time': "what time is it",
+    'volume_get': "what is the current volume",
+    'volume_mute': "mute the volume",
+    'volume_set': "set volume to {rest}",
+    'screenshot': "take a screenshot",
+    'lock_screen': "lock screen",
+    'system_info': "system info",
+    'wifi': "wifi",
+    'calculate': "calculate {rest}",
+    'timer': "set a timer for {rest}",
+    'note': "note {rest}",
+    'todo_add': "add {rest} to do list",
+    'todo_read': "read my to do list",
+    'minimize_windows': "minimize all windows",
+    'switch_window': "switch to {rest}",
+    'close_app': "close application {rest}",
+    'open_app': "open {rest}",
+    'google_search': "search google for {rest}",
+    'wikipedia': "what is {rest}",
+    'generate_password': "generate password {rest}",
+    'security_check': "security check",
+    'weather': "weather in {rest}",
+    'help': "help",
+}
+
+# Labels whose handlers work without an argument ("generate password")
+OPTIONAL_REST = {'generate_password'}
+
+EXAMPLES = {
+    'exit': [
+        "that's all for now", "see you later", "bye bye", "shut yourself down", "i'm done",
+        "we're finished here", "go to sleep", "turn yourself off", "that will be all", "bye for now",
+        "end the session", "catch you later",
+    ],
+    'greeting': [
+        "good morning", "good evening", "howdy", "hiya there", "greetings", "yo assistant",
+        "are you there", "good afternoon", "morning assistant", "hey there buddy", "what's up",
+    ],
+    'time': [
+        "what hour is it", "tell me the hour", "do you know what o'clock it is", "how late is it",
+        "what's the clock say", "give me the current hour", "is it noon yet", "how early is it",
+        "clock check", "what o'clock is it now",
+    ],
+    'volume_get': [
+        "how loud is it", "how loud is the sound", "what's the sound level", "tell me the volume level",
+        "how high is the volume", "what level is the sound at", "check the loudness", "is the sound loud",
+        "how loud are my speakers", "what is the audio level",
+    ],
+    'volume_mute': [
+        "silence the speakers", "be quiet", "turn the sound off", "kill the sound", "shh",
+        "no sound please", "silence the audio", "turn off the audio", "stop the sound", "make it silent",
+        "sound off",
+    ],
+    'volume_set': [
+        "make it louder to [80]", "turn the sound up to [70]", "turn it down to [20]", "sound at [40] percent",
+        "put the speakers at [60]", "crank it up to [90]", "lower the sound to [10]", "loudness [55]",
+        "change the sound level to [30]", "raise the audio to [65]", "set the speakers to [45] percent",
+    ],
+    'screenshot': [
+        "capture my screen", "grab the screen", "snap the display", "take a picture of my screen",
+        "screen capture please", "save what's on my screen", "print screen", "take a screen grab",
+        "snapshot of the desktop", "capture the display",
+    ],
+    'lock_screen': [
+        "lock it up", "lock my pc", "lock the workstation", "secure my desktop", "lock the machine",
+        "lock my laptop", "i'm stepping away lock it", "lock everything", "lock up the pc",
+        "protect my computer while i'm away",
+    ],
+    'system_info': [
+        "how much memory am i using", "what's my cpu usage", "how's the battery", "check my ram",
+        "how much disk space is used", "show me the processor load", "is my pc running hot",
+        "computer status", "performance stats", "how busy is the cpu", "what's the memory usage",
+    ],
+    'wifi': [
+        "which wireless networks do i have", "show saved networks", "list my networks",
+        "what networks are saved", "show me the wireless profiles", "internet connections saved",
+        "which hotspots do i know", "network profiles",
+    ],
+    'calculate': [
+        "what's [12 times 4]", "how much is [7 times 8]", "compute [15 divided by 3]", "add up [5 and 9]",
+        "what does [100 over 4] give", "work out [36 times 2]", "solve [8 times 8]", "how much is [250 less 75]",
+        "figure out [18 times 3]", "compute the sum of [40 and 2]",
+    ],
+    'timer': [
+        "remind me in [10 minutes]", "countdown [5 minutes]", "wake me in [20 minutes]",
+        "alert me after [15 minutes]", "start a countdown for [3 minutes]", "let me know in [30 minutes]",
+        "ping me in [2 minutes]", "set an alarm for [45 minutes]", "give me [25 minutes]",
+        "count down from [8 minutes]",
+    ],
+    'note': [
+        "jot down [buy milk]", "write down [call the dentist]", "make a memo about [the meeting]",
+        "save this thought [pay rent]", "take a memo [pick up kids]", "write this down [gym at six]",
+        "keep a record that [the car needs oil]", "memo [renew passport]", "jot this down [email sarah]",
+        "write a quick memo about [the budget]",
+    ],
+    'todo_add': [
+        "put [milk] on my list", "i need to [buy eggs] put it on the list", "add [water the plants] to my tasks",
+        "new task [clean the garage]", "put [call mom] on my tasks", "add [pay bills] to my task list",
+        "stick [laundry] on my list", "i have to [walk the dog] add that", "task [renew insurance]",
+        "put [fix the bike] on the list",
+    ],
+    'todo_read': [
+        "what's on my list", "what do i have to do", "read my tasks", "list my tasks",
+        "what are my tasks today", "show my task list", "what's left on my list", "any tasks for me",
+        "tell me my chores", "what's pending",
+    ],
+    'minimize_windows': [
+        "show the desktop", "hide everything", "clear the screen", "hide all windows",
+        "get everything out of the way", "go to the desktop", "shrink all windows",
+        "put all windows away", "show me my desktop", "hide all apps",
+    ],
+    'switch_window': [
+        "go to [chrome]", "bring up [outlook]", "jump to [spotify]", "show me the [terminal] window",
+        "bring [notepad] to the front", "focus on [excel]", "flip over to [discord]", "change to [word]",
+        "take me to [firefox]", "bring [slack] forward",
+    ],
+    'close_app': [
+        "shut down [chrome]", "kill [notepad]", "quit [spotify]", "exit [word]", "end [firefox]",
+        "terminate [discord]", "get rid of [excel]", "shut [outlook]", "kill the [calculator]",
+        "stop [teams]", "close down [slack]",
+    ],
+    'open_app': [
+        "launch [chrome]", "start [notepad]", "fire up [spotify]", "run [calculator]", "boot up [excel]",
+        "bring up a new [word] document", "can you start [firefox]", "load [discord]", "launch the [terminal]",
+        "start up [outlook]", "run [paint]",
+    ],
+    'google_search': [
+        "look up [python tutorials]", "search the web for [cheap flights]", "find online [best pizza near me]",
+        "look online for [laptop reviews]", "search for [hiking trails]", "browse for [cat videos]",
+        "web search [climate news]", "look up [how to tie a tie]", "find me [recipes for lasagna]",
+        "search the internet for [movie times]",
+    ],
+    'wikipedia': [
+        "who is [alan turing]", "tell me about [the roman empire]", "who was [napoleon]",
+        "explain [photosynthesis]", "what are [black holes]", "who invented [the telephone]",
+        "tell me about [mount everest]", "define [quantum computing]", "give me info on [the eiffel tower]",
+        "who wrote [hamlet]", "describe [the french revolution]",
+    ],
+    'generate_password': [
+        "make me a password", "i need a new password", "create a secure password",
+        "give me a strong password of [20] characters", "new password please", "random password [12]",
+        "come up with a password", "make a safe passphrase", "password with [16] characters",
+        "invent a password for me",
+    ],
+    'security_check': [
+        "am i safe", "scan my computer", "check for threats", "is my computer secure",
+        "run a security scan", "any suspicious processes", "check my firewall", "audit my system",
+        "is anything suspicious running", "security status",
+    ],
+    'weather': [
+        "is it raining in [london]", "how hot is it in [cairo]", "what's the temperature in [paris]",
+        "will i need an umbrella in [seattle]", "how cold is it in [moscow]", "forecast for [berlin]",
+        "is it sunny in [madrid]", "temperature outside in [boston]", "how's it looking outside in [tokyo]",
+        "is it snowing in [denver]", "climate right now in [rome]",
+    ],
+    'help': [
+        "what can you do", "what are your features", "how do i use you", "show me what you can do",
+        "i need some guidance", "list your abilities", "what commands do you know", "how does this work",
+        "what are my options", "give me some examples",
+    ],
+    'none': [
+        "tell me a joke", "what's the meaning of life", "i like turtles", "sing me a song",
+        "do you love me", "order a pizza", "book a flight to rome", "how old are you",
+        "what is your favorite color", "call my mom", "send an email to john", "play some music",
+        "banana", "the quick brown fox", "are you a robot", "marry me", "drive me home",
+        "i'm hungry", "that's interesting", "never mind",
+    ],
+}
@@ -0,0 +1,45 @@
+"""
+Quick intent matching for short, self-contained commands.
+Used to decide early whether a (partial) transcript is already a complete command.
+"""
+
+import re
+from collections import namedtuple
+
+Intent = namedtuple('Intent', ['name', 'slots'])
+
+# Each pattern must match the whole utterance, so a longer command that merely
+# starts the same way ("set timer for...") is never mistaken for a short one ("time").
+QUICK_INTENTS = [
+    ('stop', r'stop|goodbye|good bye|exit|quit'),
+    ('time', r"(?:what )?(?:is the )?(?:current )?time(?: is it)?(?: now)?|what'?s the time"),
+    ('volume_set', r'(?:set )?(?:the )?volume(?: level)?(?: to)? (?P<level>\d{1,3})(?: ?percent| ?%)?'),
+    ('volume_mute', r'(?:volume )?(?:mute|unmute)(?: the)?(?: volume)?'),
+    ('volume_get', r'what is the (?:current )?volume|current volume'),
+    ('screenshot', r'(?:take )?(?:a )?screenshot'),
+    ('lock_screen', r'lock (?:the )?(?:screen|computer)'),
+    ('minimize_windows', r'minimi[sz]e all windows'),
+    ('system_info', r'system info(?:rmation)?'),
+    ('help', r'help'),
+]
+
+_COMPILED = [(name, re.compile(pattern)) for name, pattern in QUICK_INTENTS]
+_PUNCTUATION = re.compile(r"[^\w\s%']")
+_SPACES = re.compile(r'\s+')
+
+def normalize(text):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    text = _PUNCTUATION.sub(' ', text.lower())
+    return _SPACES.sub(' ', text).strip()
+
+def resolve(text):
+    """Return an Intent if the text is a complete short command, otherwise None"""
+    if not text:
+        return None
+    text = normalize(text)
+    for name, pattern in _COMPILED:
+        match = pattern.fullmatch(text)
+        if match:
+            slots = {k: v for k, v in match.groupdict().items() if v is not None}
+            return Intent(name, slots)
+    return None
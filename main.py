@@ -6,51 +6,40 @@ A powerful Windows voice assistant with system control, web integration, and pro
 
 import speech_recognition as sr
 import datetime
-import requests
 import json
 import os
-import webbrowser
-import subprocess
 import threading
 import time
-import math
 import random
-import string
 import socket
-import shutil
-import glob
-import re
 import tempfile
 import sys
+import argparse
+import atexit
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+import intents
+from streaming import StreamingListener
+from speculation import SpeculativeCache, ResultCache, predict as predict_lookups
+from tts_transport import CloudTTS, CircuitBreaker, CircuitOpenError
+from tts_budget import CharacterBudget, TTSRouter
+from idle_listen import IdleListener
+from audio_sink import PCMSink, pcm_rate
+from composer import ResponseComposer, PhraseCache, Reply, join as join_replies
+from barge_in import PlaybackReference, EchoGate, BargeInMonitor
+from server import AssistantServer, AudioCache
+from fixtures import FixtureRecorder, FixtureSource, FixtureRecognizer, load_manifest, summarize as summarize_replay
+from warmup import Warmup
+import audio_conditioning
+import backends
+import compound
+import metrics
+import plugins
+from plugins import install_package
 
 # Import configuration
-try:
-    from config import *
-except ImportError:
-    print("Warning: config.py not found. Using default settings.")
-    # Default configuration if config.py doesn't exist
-    ELEVENLABS_API_KEY = "YOUR_ELEVENLABS_API_KEY"
-    CUSTOM_VOICE_NAME = "default_voice"
-    OPENWEATHER_API_KEY = "YOUR_OPENWEATHERMAP_API_KEY"
-    PRIVACY_MODE = False
-    WAKE_WORD_MODE = False
-    WAKE_WORD = "hey assistant"
-    TTS_RATE = 180
-    TTS_VOLUME = 0.9
-    NOTES_FILE = "quick_notes.txt"
-    TODO_FILE = "todo.txt"
-    ENERGY_THRESHOLD = 4000
-    DYNAMIC_ENERGY_THRESHOLD = True
-    LISTEN_TIMEOUT = 5
-    PHRASE_TIME_LIMIT = 10
-
-# Auto-install required packages
-def install_package(package):
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", package], 
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception:
-        pass
+from settings import *
 
 # Import ElevenLabs
 try:
@@ -66,54 +55,6 @@ except ImportError:
     install_package("pyttsx3")
     import pyttsx3
 
-# Import other required packages
-try:
-    import psutil
-except ImportError:
-    install_package("psutil")
-    import psutil
-
-try:
-    import pyautogui
-except ImportError:
-    install_package("pyautogui")
-    import pyautogui
-
-try:
-    import pywhatkit
-except ImportError:
-    install_package("pywhatkit")
-    import pywhatkit
-
-try:
-    import wikipedia
-except ImportError:
-    install_package("wikipedia")
-    import wikipedia
-
-
-try:
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-except ImportError:
-    install_package("pycaw")
-    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-    from ctypes import cast, POINTER
-    from comtypes import CLSCTX_ALL
-
-try:
-    import win32api
-    import win32gui
-    import win32con
-    import win32process
-except ImportError:
-    install_package("pywin32")
-    import win32api
-    import win32gui
-    import win32con
-    import win32process
-
 # =============================================================================
 # SYSTEM INITIALIZATION
 # =============================================================================
@@ -126,6 +67,40 @@ try:
 except Exception as e:
     print(f"ElevenLabs initialization failed: {e}")
 
+# Cloud TTS transport: pooled connections, retry budget and circuit breaker
+cloud_tts = None
+if client:
+    cloud_tts = CloudTTS(
+        ELEVENLABS_API_KEY,
+        connect_timeout=TTS_CONNECT_TIMEOUT,
+        first_byte_timeout=TTS_FIRST_BYTE_TIMEOUT,
+        max_retries=TTS_MAX_RETRIES,
+        breaker=CircuitBreaker("elevenlabs", TTS_BREAKER_THRESHOLD, TTS_BREAKER_RESET),
+    )
+
+# In-process PCM output (used when TTS_OUTPUT_FORMAT is a pcm_* format)
+playback_reference = PlaybackReference() if BARGE_IN else None
+pcm_sink = None
+if cloud_tts and pcm_rate(TTS_OUTPUT_FORMAT):
+    pcm_sink = PCMSink(sample_rate=pcm_rate(TTS_OUTPUT_FORMAT), reference=playback_reference)
+
+# Cloud TTS characters are budgeted; long or over-budget replies use the local voice
+char_budget = CharacterBudget(TTS_CHAR_BUDGET, TTS_BUDGET_PERIOD_DAYS, TTS_BUDGET_FILE)
+tts_router = TTSRouter(char_budget, max_chars=TTS_CLOUD_MAX_CHARS)
+atexit.register(char_budget.save)   # record() only writes the file every minute or so
+# Synthesized replies that recur, kept by how often they are reused
+reply_audio = AudioCache(REPLY_CACHE_MB * 1024 * 1024, reuse=tts_router.reuse)
+
+# After IDLE_AFTER seconds without a command, wait on a cheap energy gate instead
+# of recalibrating and listening with the full capture path
+idle_listener = IdleListener(lambda: sr.Microphone(sample_rate=IDLE_SAMPLE_RATE),
+                             factor=IDLE_ENERGY_FACTOR, min_energy=IDLE_MIN_ENERGY,
+                             min_speech=IDLE_MIN_SPEECH, phrase_time_limit=PHRASE_TIME_LIMIT) if IDLE_LISTENING else None
+
+# Barge-in: separates the user's voice from the echo of our own playback
+echo_gate = EchoGate(playback_reference, floor=ENERGY_THRESHOLD, margin=BARGE_IN_MARGIN,
+                     echo_tail=BARGE_IN_ECHO_TAIL) if BARGE_IN else None
+
 # Initialize fallback TTS engine
 fallback_tts = None
 try:
@@ -136,32 +111,97 @@ except Exception as e:
     print(f"Fallback TTS initialization failed: {e}")
 
 # Global variables
-active_timers = []
 reminders = []
 listen_enabled = True
+batch_mode = False
+server_mode = False     # serving satellites: process-wide settings are not theirs to change
+
+# Per-thread capture of spoken replies (batch mode collects them instead of speaking)
+_speech_capture = threading.local()
+
+# Audio, transcript and stage timings of the last utterance heard
+last_utterance = {}
+# Audio of a phrase that interrupted playback, recognized as the next command
+pending_utterance = None
+fixture_recorder = None
+
+# Independent parts of a compound command ("... and ...") run here at once
+compound_pool = ThreadPoolExecutor(max_workers=COMPOUND_WORKERS, thread_name_prefix="compound")
+
+# Metrics (served on METRICS_PORT and written to METRICS_FILE on exit)
+REPLIES = metrics.counter('assistant_replies_total', "Replies, by the backend that delivered them", ['backend'])
+TTS_FAILURES = metrics.counter('assistant_tts_failures_total', "Text to speech errors, by backend", ['backend'])
+RECOGNITIONS = metrics.counter('assistant_recognitions_total', "Speech recognition attempts, by outcome", ['outcome'])
+RECOGNITION_SECONDS = metrics.histogram('assistant_recognition_seconds', "Time waiting for the speech recognizer")
+COMMANDS = metrics.counter('assistant_commands_total', "Commands handled, by intent", ['intent'])
+HANDLER_SECONDS = metrics.histogram('assistant_handler_seconds', "Time spent in plugin handlers", ['plugin'])
+HANDLER_ERRORS = metrics.counter('assistant_handler_errors_total', "Exceptions raised by handlers", ['intent'])
+LOOKUPS = metrics.counter('assistant_lookups_total', "Network lookups made, by kind and result", ['kind', 'result'])
+LOOKUP_SECONDS = metrics.histogram('assistant_lookup_seconds', "Network lookup time", ['kind'])
 
 # Voice ID detection
+# The resolved ID is cached on disk and used immediately on the next start; the
+# ElevenLabs voice catalog is only fetched in the background to revalidate it.
 VOICE_ID = None
-if client:
+
+def load_cached_voice_id():
+    """Return (voice_id, age_seconds) from the voice cache, or (None, None)"""
     try:
-        voices = client.voices.get_all().voices
-        for voice in voices:
-            if voice.name == CUSTOM_VOICE_NAME:
-                VOICE_ID = voice.voice_id
-                break
-        if VOICE_ID is None:
-            print(f"Warning: Voice '{CUSTOM_VOICE_NAME}' not found in your ElevenLabs account. Using fallback TTS.")
+        with open(VOICE_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get('voice_name') == CUSTOM_VOICE_NAME and data.get('voice_id'):
+            return data['voice_id'], time.time() - data.get('timestamp', 0)
+    except Exception:
+        pass
+    return None, None
+
+def save_cached_voice_id(voice_id):
+    """Persist the resolved voice ID with a timestamp"""
+    try:
+        tmp_path = VOICE_CACHE_FILE + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({'voice_name': CUSTOM_VOICE_NAME, 'voice_id': voice_id,
+                       'timestamp': time.time()}, f)
+        os.replace(tmp_path, VOICE_CACHE_FILE)
     except Exception as e:
-        print(f"Error fetching voices from ElevenLabs: {e}. Using fallback TTS.")
+        print(f"Could not save voice cache: {e}")
 
-# Initialize audio control for volume management
-try:
-    devices = AudioUtilities.GetSpeakers()
-    interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-    volume = cast(interface, POINTER(IAudioEndpointVolume))
-except:
-    volume = None
-    print("Audio control not available")
+def fetch_voice_id():
+    """Look up CUSTOM_VOICE_NAME in the ElevenLabs account"""
+    for voice in client.voices.get_all().voices:
+        if voice.name == CUSTOM_VOICE_NAME:
+            return voice.voice_id
+    return None
+
+def refresh_voice_id():
+    """Revalidate the voice ID against ElevenLabs and swap it in if it changed"""
+    global VOICE_ID
+    try:
+        voice_id = fetch_voice_id()
+    except Exception as e:
+        print(f"Error fetching voices from ElevenLabs: {e}. Keeping current voice setting.")
+        return
+    if voice_id is None:
+        print(f"Warning: Voice '{CUSTOM_VOICE_NAME}' not found in your ElevenLabs account. Using fallback TTS.")
+        try:
+            os.remove(VOICE_CACHE_FILE)
+        except OSError:
+            pass
+    else:
+        save_cached_voice_id(voice_id)
+    if voice_id != VOICE_ID:
+        if VOICE_ID is not None:
+            print("ElevenLabs voice ID changed; using the updated voice.")
+        VOICE_ID = voice_id  # single assignment, so speak() never sees a partial update
+
+if client:
+    VOICE_ID, cache_age = load_cached_voice_id()
+    if VOICE_ID is None or cache_age > VOICE_CACHE_MAX_AGE:
+        voice_thread = threading.Thread(target=refresh_voice_id, daemon=True)
+        voice_thread.start()
+        # Without a cached ID, wait briefly so the greeting can use the custom voice
+        if VOICE_ID is None:
+            voice_thread.join(VOICE_LOOKUP_TIMEOUT)
 
 # =============================================================================
 # PERSONALIZATION FEATURES - RANDOMIZED RESPONSES
@@ -221,29 +261,116 @@ def get_random_response(response_list):
     """Get a random response from a list of responses"""
     return random.choice(response_list)
 
+# Reply templates: pooled slots ({confirmation}, ...) and literal text are fixed and
+# can be played from pre-rendered audio; other slots are synthesized per reply
+RESPONSE_POOLS = {
+    'confirmation': CONFIRMATIONS,
+    'completion': COMPLETIONS,
+    'error': ERROR_RESPONSES,
+    'greeting': GREETINGS,
+    'goodbye': GOODBYES,
+}
+
+RESPONSE_TEMPLATES = {
+    'greeting': "{greeting}",
+    'goodbye': "{goodbye}",
+    'error': "{error}",
+    'time': "{confirmation} The current time is {time}.",
+    'volume_toggled': "{confirmation} Volume toggled.",
+    'volume_set': "{confirmation} Volume set to {level} percent.",
+    'screenshot_saved': "{completion} Screenshot saved as {filename}.",
+    'locking': "{confirmation} Locking the screen now.",
+    'timer_set': "{confirmation} Timer set for {duration}.",
+    'note_saved': "{confirmation} Note saved.",
+    'folder_created': "{completion} Folder '{name}' created.",
+    'file_created': "{completion} File '{name}' created.",
+    'windows_minimized': "{completion} All windows minimized.",
+    'switched_to': "{confirmation} Switched to {app}.",
+    'app_closed': "{completion} {app} closed.",
+    'google_search': "{confirmation} Searching Google for {query}.",
+    'web_answer': "According to {source}: {answer}",
+    'wikipedia': "Here's what I found: {summary}",
+    'weather': "The weather in {city}: {temperature} degrees celsius with {description}. Humidity is {humidity} percent.",
+    'todo_added': "{confirmation} I've added '{task}' to your list.",
+    'opening': "{confirmation} Opening {name}.",
+    'opening_website': "{confirmation} Opening {name} website.",
+}
+
+composer = ResponseComposer(
+    RESPONSE_TEMPLATES, RESPONSE_POOLS,
+    cache=PhraseCache(PHRASE_CACHE_DIR, namespace=f"{CUSTOM_VOICE_NAME}|{TTS_OUTPUT_FORMAT}"),
+    sample_rate=pcm_rate(TTS_OUTPUT_FORMAT) or 22050,
+)
+
+def reply(template_name, **values):
+    """Build a reply from a response template (templates may use {name} themselves)"""
+    return composer.reply(template_name, **values)
+
 # =============================================================================
 # CORE FUNCTIONS
 # =============================================================================
 
 def speak(text):
     """Enhanced speak function with privacy mode check and fallback TTS"""
+    captured = getattr(_speech_capture, 'replies', None)
+    if captured is not None:
+        captured.append(text)
+        REPLIES.labels('text').inc()
+        return
+    
     print(f"Assistant: {text}")
     
+    # Spoken responses are also noted while an utterance is being recorded as a fixture
+    heard = getattr(_speech_capture, 'heard', None)
+    if heard is not None:
+        heard.append(str(text))
+    
+    if batch_mode:
+        REPLIES.labels('text').inc()
+        return
+    
+    # The user interrupted; the rest of this answer stays on screen
+    if pending_utterance is not None:
+        REPLIES.labels('text').inc()
+        return
+    
     if PRIVACY_MODE:
         print(f"[PRIVACY MODE] Text-only mode")
+        REPLIES.labels('text').inc()
         return
     
     if not listen_enabled:
         return
         
     # Try ElevenLabs first
-    if client and VOICE_ID:
+    voice_id = VOICE_ID
+    if cloud_tts and voice_id:
         try:
-            audio = client.text_to_speech.convert(
-                voice_id=VOICE_ID,
-                text=text,
-                model_id="eleven_multilingual_v2"
-            )
+            # Raw PCM goes straight from the response buffers into the open output stream
+            if pcm_sink and pcm_sink.ensure_open():
+                # Only what isn't cached yet is billed: the tail after cached fixed phrases
+                tail = composer.split(text)[1] if isinstance(text, Reply) else str(text).strip()
+                clip = reply_audio.get(tail) if tail else None
+                if tts_router.route(tail, 0 if clip or not tail else len(tail)).route == 'local':
+                    speak_local(text)
+                    return
+                synthesize = lambda tail_text: synthesize_cached(tail_text, clip)
+                if isinstance(text, Reply):
+                    # Cached fixed phrases play while the variable tail is synthesized
+                    play_interruptible(lambda: composer.play(text, synthesize, pcm_sink, fallback=speak_local))
+                else:
+                    play_interruptible(lambda: pcm_sink.play(synthesize(tail)))
+                REPLIES.labels('elevenlabs').inc()
+                return
+            
+            # Count the request (reply_audio.get does on the PCM path) so recurring replies can be 'reused'
+            spoken = str(text).strip()
+            tts_router.reuse.seen(spoken)
+            if tts_router.route(spoken).route == 'local':
+                speak_local(text)
+                return
+            char_budget.record(len(text))
+            audio = cloud_tts.stream(voice_id, text)
             
             # Save audio to temporary file and play it
             with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as tmp_file:
@@ -251,8 +378,8 @@ def speak(text):
                     tmp_file.write(chunk)
                 tmp_filename = tmp_file.name
             
-            # Play using Windows default audio player
-            os.system(f'start /min "" "{tmp_filename}"')
+            # Play with the desktop's audio player
+            backends.get().play_audio_file(tmp_filename)
             
             # Schedule cleanup after playback (non-blocking)
             def cleanup():
@@ -265,18 +392,74 @@ def speak(text):
             cleanup_thread = threading.Thread(target=cleanup)
             cleanup_thread.daemon = True
             cleanup_thread.start()
+            REPLIES.labels('elevenlabs').inc()
             return
+        except CircuitOpenError:
+            pass  # Cloud TTS is known to be down; go straight to the local engine
         except Exception as e:
+            TTS_FAILURES.labels('elevenlabs').inc()
             print(f"ElevenLabs TTS error: {e}")
     
-    # Use Windows SAPI for reliable TTS
+    speak_local(text)
+
+def play_interruptible(play):
+    """Run a PCM playback call while listening for the user talking over it"""
+    global pending_utterance
+    pcm_sink.reset()
+    if not BARGE_IN:
+        return play()
+    
+    monitor = BargeInMonitor(sr.Microphone, echo_gate, on_speech=pcm_sink.stop,
+                             min_speech=BARGE_IN_MIN_SPEECH, phrase_time_limit=PHRASE_TIME_LIMIT).start()
     try:
-        import win32com.client
-        sapi = win32com.client.Dispatch('SAPI.SpVoice')
-        sapi.Speak(text)
+        play()
+    finally:
+        audio = monitor.finish(timeout=PHRASE_TIME_LIMIT + 1)
+    if audio is not None:
+        reaction = (pcm_sink.stopped_at or monitor.stats['detected_at']) - monitor.stats['onset']
+        print(f"(interrupted after {reaction * 1000:.0f} ms)")
+        pending_utterance = audio
+
+def synthesize_pcm(text):
+    """Stream PCM chunks for text from ElevenLabs"""
+    char_budget.record(len(text))
+    return cloud_tts.stream(VOICE_ID, text, output_format=TTS_OUTPUT_FORMAT, accept="audio/pcm")
+
+def synthesize_cached(text, clip=None):
+    """PCM chunks for text: the cached clip, or synthesized and kept once the text recurs"""
+    if clip is not None:
+        yield clip
         return
+    chunks = []
+    for chunk in synthesize_pcm(text):
+        chunks.append(bytes(chunk))
+        yield chunk
+    # Only complete audio is cached (an interrupted reply stops iterating early)
+    if tts_router.worth_caching(text):
+        reply_audio.put(text, b"".join(chunks))
+
+def prerender_phrases():
+    """Render the fixed reply phrases into the phrase cache"""
+    if not (pcm_sink and VOICE_ID):
+        return 0
+    try:
+        return composer.prerender(synthesize_pcm)
     except Exception as e:
-        print(f"Windows SAPI TTS error: {e}")
+        print(f"Phrase pre-rendering stopped: {e}")
+        return 0
+
+def speak_local(text):
+    """Speak text with a local engine (the desktop's own voice, then pyttsx3)"""
+    # The platform voice (SAPI on Windows, speech-dispatcher or espeak on Linux)
+    desktop = backends.get()
+    if desktop.speech_engine:
+        try:
+            if desktop.speak(text):
+                REPLIES.labels(desktop.speech_engine).inc()
+                return
+        except Exception as e:
+            TTS_FAILURES.labels(desktop.speech_engine).inc()
+            print(f"{desktop.speech_engine} TTS error: {e}")
     
     # Fallback to pyttsx3
     try:
@@ -286,326 +469,141 @@ def speak(text):
         tts_engine.say(text)
         tts_engine.runAndWait()
         del tts_engine
+        REPLIES.labels('pyttsx3').inc()
         return
     except Exception as e:
+        TTS_FAILURES.labels('pyttsx3').inc()
         print(f"pyttsx3 TTS error: {e}")
     
     # If all TTS fails, just print
+    REPLIES.labels('none').inc()
     print("[TTS not available - text only]")
 
 # =============================================================================
-# UTILITY FUNCTIONS
+# NETWORK LOOKUPS
 # =============================================================================
 
-# System Control Functions
-def set_volume(level):
-    """Set system volume (0-100) using endpoint scalar API"""
-    if volume:
-        try:
-            level = max(0, min(100, int(level)))
-            volume.SetMasterVolumeLevelScalar(level / 100.0, None)
-            return True
-        except Exception as e:
-            print(f"Volume error (set): {e}")
-            return False
-    return False
+# Speculative prefetch of lookups predicted from partial transcripts
+speculative_cache = SpeculativeCache(ttl=SPECULATION_TTL, min_chars=SPECULATION_MIN_CHARS) if SPECULATIVE_PREFETCH else None
 
-def get_volume():
-    """Get current system volume (0-100)"""
-    if volume:
-        try:
-            return int(round(volume.GetMasterVolumeLevelScalar() * 100))
-        except Exception as e:
-            print(f"Volume error (get): {e}")
-            return None
-    return None
-
-def mute_volume(desired=None):
-    """Toggle mute/unmute. If desired is True/False, set explicitly; otherwise toggle."""
-    if volume:
-        try:
-            current = bool(volume.GetMute())
-            new_state = (not current) if desired is None else bool(desired)
-            volume.SetMute(new_state, None)
-            return True
-        except Exception as e:
-            print(f"Volume error (mute): {e}")
-            return False
-    return False
-
-def take_screenshot():
-    """Take a screenshot"""
-    try:
-        screenshot = pyautogui.screenshot()
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"screenshot_{timestamp}.png"
-        screenshot.save(filename)
-        return filename
-    except Exception as e:
-        return None
+# Recent answers, shared by every command (and every client in server mode)
+result_cache = ResultCache(ttl=LOOKUP_CACHE_TTL) if LOOKUP_CACHE_TTL else None
 
-def lock_screen():
-    """Lock the computer screen"""
-    try:
-        subprocess.run(["rundll32.exe", "user32.dll,LockWorkStation"])
-        return True
-    except:
-        return False
+# Lookups live in plugins; resolving them imports the plugin on first use
+LOOKUP_FUNCTIONS = {
+    'wikipedia': lambda query: plugins.load('web').search_wikipedia(query),
+    'weather': lambda query: plugins.load('weather').fetch_weather(query),
+}
 
-def get_system_info():
-    """Get system information"""
-    try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('C:\\')
-        battery = psutil.sensors_battery() if hasattr(psutil, 'sensors_battery') else None
-        
-        info = {
-            'cpu': cpu_percent,
-            'memory_percent': memory.percent,
-            'memory_available': round(memory.available / (1024**3), 1),
-            'disk_percent': round((disk.total - disk.free) / disk.total * 100, 1),
-            'battery': battery.percent if battery else None
-        }
-        return info
-    except:
-        return None
+# Only successful answers are worth caching
+CACHEABLE = {
+    'wikipedia': bool,
+    'weather': lambda data: isinstance(data, dict) and data.get("cod") == 200,
+}
 
-def get_wifi_info():
-    """Get WiFi information"""
-    try:
-        result = subprocess.run(['netsh', 'wlan', 'show', 'profile'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            profiles = []
-            for line in result.stdout.split('\\n'):
-                if 'All User Profile' in line:
-                    profile = line.split(':')[-1].strip()
-                    profiles.append(profile)
-            return profiles
-    except:
-        pass
-    return []
+def speculate(partial_text):
+    """Start the network lookups a partial transcript predicts"""
+    if not speculative_cache:
+        return
+    for kind, query in predict_lookups(partial_text):
+        if kind == 'weather' and OPENWEATHER_API_KEY == "YOUR_OPENWEATHERMAP_API_KEY":
+            continue
+        speculative_cache.speculate(kind, query, LOOKUP_FUNCTIONS[kind])
 
-# Productivity Functions
-def calculate(expression):
-    """Safe calculator function"""
-    try:
-        # Remove any non-mathematical characters for security
-        expression = re.sub(r'[^0-9+\\-*/().\\s]', '', expression)
-        result = eval(expression)
+def lookup(kind, query, fetch):
+    """Run a network lookup, reusing a cached or speculative result when it matches"""
+    def fetch_timed(query):
+        start = time.perf_counter()
+        result = fetch(query)
+        LOOKUP_SECONDS.labels(kind).observe(time.perf_counter() - start)
+        LOOKUPS.labels(kind, 'ok' if CACHEABLE.get(kind, bool)(result) else 'failed').inc()
         return result
-    except:
-        return None
-
-def convert_units(value, from_unit, to_unit):
-    """Simple unit conversion"""
-    conversions = {
-        ('celsius', 'fahrenheit'): lambda x: (x * 9/5) + 32,
-        ('fahrenheit', 'celsius'): lambda x: (x - 32) * 5/9,
-        ('pounds', 'kilograms'): lambda x: x * 0.453592,
-        ('kilograms', 'pounds'): lambda x: x / 0.453592,
-        ('miles', 'kilometers'): lambda x: x * 1.60934,
-        ('kilometers', 'miles'): lambda x: x / 1.60934,
-        ('feet', 'meters'): lambda x: x * 0.3048,
-        ('meters', 'feet'): lambda x: x / 0.3048
-    }
     
-    key = (from_unit.lower(), to_unit.lower())
-    if key in conversions:
-        return conversions[key](value)
-    return None
-
-def set_timer(minutes, message="Timer finished!"):
-    """Set a timer in the background"""
-    def timer_function():
-        time.sleep(minutes * 60)
-        speak(message)
-        if message in [t['message'] for t in active_timers]:
-            active_timers.remove({'minutes': minutes, 'message': message})
+    def fetch_fresh(query):
+        if speculative_cache:
+            return speculative_cache.take(kind, query, fetch_timed)
+        return fetch_timed(query)
     
-    timer_thread = threading.Thread(target=timer_function)
-    timer_thread.daemon = True
-    timer_thread.start()
-    active_timers.append({'minutes': minutes, 'message': message})
-
-def save_note(content):
-    """Save a quick note with timestamp"""
-    try:
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        with open(NOTES_FILE, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {content}\\n")
-        return True
-    except:
-        return False
-
-# File Management Functions
-def create_folder(folder_name, path="."):
-    """Create a new folder"""
-    try:
-        full_path = os.path.join(path, folder_name)
-        os.makedirs(full_path, exist_ok=True)
-        return True
-    except:
-        return False
-
-def delete_file(filename):
-    """Safely delete a file"""
-    try:
-        if os.path.exists(filename):
-            os.remove(filename)
-            return True
-        return False
-    except:
-        return False
-
-def search_files(pattern, directory="."):
-    """Search for files matching a pattern"""
-    try:
-        matches = glob.glob(os.path.join(directory, f"**/*{pattern}*"), recursive=True)
-        return matches[:10]  # Limit to 10 results
-    except:
-        return []
-
-def create_file(filename, content=""):
-    """Create a new file with optional content"""
-    try:
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(content)
-        return True
-    except:
-        return False
-
-# Windows Integration Functions
-def minimize_all_windows():
-    """Minimize all windows"""
-    try:
-        pyautogui.hotkey('win', 'm')
-        return True
-    except:
-        return False
-
-def switch_window(app_name):
-    """Switch to a specific application window"""
-    try:
-        def enum_window_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                window_title = win32gui.GetWindowText(hwnd)
-                if app_name.lower() in window_title.lower():
-                    windows.append((hwnd, window_title))
-            return True
-        
-        windows = []
-        win32gui.EnumWindows(enum_window_callback, windows)
-        
-        if windows:
-            win32gui.SetForegroundWindow(windows[0][0])
-            return True
-        return False
-    except:
-        return False
-
-def close_application(app_name):
-    """Close a specific application"""
-    try:
-        for proc in psutil.process_iter(['pid', 'name']):
-            if app_name.lower() in proc.info['name'].lower():
-                proc.terminate()
-                return True
-        return False
-    except:
-        return False
-
-# Security Functions
-def generate_password(length=12):
-    """Generate a secure password"""
-    characters = string.ascii_letters + string.digits + "!@#$%^&*"
-    password = ''.join(random.choice(characters) for _ in range(length))
-    return password
-
-def check_system_security():
-    """Basic system security check"""
-    try:
-        # Check for suspicious processes
-        suspicious_count = 0
-        high_cpu_processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
-            try:
-                if proc.info['cpu_percent'] > 80:
-                    high_cpu_processes.append(proc.info['name'])
-                    suspicious_count += 1
-            except:
-                continue
-        
-        return {
-            'high_cpu_processes': high_cpu_processes,
-            'suspicious_count': suspicious_count
-        }
-    except:
-        return None
+    if result_cache:
+        return result_cache.get(kind, query, fetch_fresh, CACHEABLE.get(kind, bool))
+    return fetch_fresh(query)
 
+# =============================================================================
+# LISTENING
+# =============================================================================
 
-# Web Search Functions
-def search_google(query):
-    """Search Google using pywhatkit"""
-    try:
-        pywhatkit.search(query)
-        return True
-    except:
-        return False
-
-def search_wikipedia(query):
-    """Search Wikipedia and return summary"""
-    try:
-        wikipedia.set_lang("en")
-        # Try different search approaches
-        try:
-            summary = wikipedia.summary(query, sentences=2, auto_suggest=True)
-            return summary
-        except wikipedia.DisambiguationError as e:
-            # If multiple pages found, use the first one
-            summary = wikipedia.summary(e.options[0], sentences=2)
-            return summary
-        except wikipedia.PageError:
-            # Try searching for pages first
-            search_results = wikipedia.search(query, results=3)
-            if search_results:
-                summary = wikipedia.summary(search_results[0], sentences=2)
-                return summary
-            return None
-    except Exception as e:
-        print(f"Wikipedia search error: {e}")
-        return None
+# Bytes and seconds of speech captured and uploaded for recognition
+recognition_uploads = audio_conditioning.new_stats()
 
+def new_recognizer():
+    """A recognizer that uploads conditioned audio (see audio_conditioning.py), if enabled"""
+    if AUDIO_CONDITIONING:
+        return audio_conditioning.ConditionedRecognizer(target_rate=RECOGNITION_SAMPLE_RATE, pad=SILENCE_PADDING,
+                                                        stats=recognition_uploads)
+    return sr.Recognizer()
 
-def listen_for_command():
-    """Enhanced listening function with wake word and privacy mode support"""
+def listen_for_command(source=None, recognizer=None):
+    """Enhanced listening function with wake word and privacy mode support
+    
+    source and recognizer default to the microphone and Google recognition;
+    fixture replay passes a recorded WAV source instead.
+    """
     global listen_enabled
     
-    if PRIVACY_MODE:
+    if pending_utterance is not None and source is None:
+        return take_interruption()
+    
+    if PRIVACY_MODE and source is None:
         user_input = input("[PRIVACY MODE] Type your command: ")
         return user_input.lower() if user_input else None
     
-    r = sr.Recognizer()
+    r = recognizer or new_recognizer()
     r.energy_threshold = ENERGY_THRESHOLD
     r.dynamic_energy_threshold = DYNAMIC_ENERGY_THRESHOLD
+    last_utterance.clear()
+    timings = last_utterance['timings'] = {}
     
-    with sr.Microphone() as source:
+    with source or sr.Microphone() as source:
         if WAKE_WORD_MODE:
             print(f"Listening for '{WAKE_WORD}'...")
         else:
             print("\nListening...")
         
         try:
+            start = time.perf_counter()
             r.adjust_for_ambient_noise(source, duration=0.5)
-            audio = r.listen(source, timeout=LISTEN_TIMEOUT, phrase_time_limit=PHRASE_TIME_LIMIT)
+            timings['calibrate'] = time.perf_counter() - start
+            start = time.perf_counter()
+            if STREAMING_RECOGNITION:
+                query, audio, recognize_seconds = listen_streaming(r, source)
+                timings['capture'] = time.perf_counter() - start - recognize_seconds
+                timings['recognize'] = recognize_seconds
+            else:
+                audio = r.listen(source, timeout=LISTEN_TIMEOUT, phrase_time_limit=PHRASE_TIME_LIMIT)
+                timings['capture'] = time.perf_counter() - start
+            last_utterance['audio'] = audio
         except sr.WaitTimeoutError:
+            RECOGNITIONS.labels('timeout').inc()
+            return None
+        except sr.UnknownValueError:
+            RECOGNITIONS.labels('unknown').inc()
+            if not WAKE_WORD_MODE:
+                print("Sorry, I didn't catch that.")
+            return None
+        except sr.RequestError as e:
+            RECOGNITIONS.labels('request_error').inc()
+            print(f"Speech recognition error: {e}")
             return None
     
     try:
-        print("Processing...")
-        query = r.recognize_google(audio, language='en-us')
+        if not STREAMING_RECOGNITION:
+            print("Processing...")
+            start = time.perf_counter()
+            query = r.recognize_google(audio, language='en-us')
+            timings['recognize'] = time.perf_counter() - start
+        RECOGNITIONS.labels('ok').inc()
+        RECOGNITION_SECONDS.observe(timings['recognize'])
+        last_utterance['transcript'] = query
         print(f"You said: '{query}'")
         
         # Wake word detection
@@ -616,7 +614,7 @@ def listen_for_command():
                 if query:
                     return query
                 else:
-                    speak(get_random_response(GREETINGS))
+                    speak(reply('greeting'))
                     return "activated"
             else:
                 return None  # Ignore commands without wake word
@@ -624,22 +622,108 @@ def listen_for_command():
         return query.lower()
         
     except sr.UnknownValueError:
+        RECOGNITIONS.labels('unknown').inc()
         if not WAKE_WORD_MODE:
             print("Sorry, I didn't catch that.")
         return None
     except sr.RequestError as e:
+        RECOGNITIONS.labels('request_error').inc()
         print(f"Speech recognition error: {e}")
         return None
 
+def take_interruption():
+    """Recognize the phrase that interrupted the last reply"""
+    global pending_utterance
+    audio, pending_utterance = pending_utterance, None
+    # The user is already talking to us, so no wake word is needed
+    return recognize_captured(audio)
+
+def listen_idle():
+    """Wait on the idle energy gate, then recognize the phrase that woke it"""
+    global idle_listener
+    if not idle_listener.stats['wakes']:
+        print("(idle: listening for speech before waking up)")
+    try:
+        audio = idle_listener.wait(stop=lambda: not listen_enabled)
+    except Exception as e:
+        # The microphone may not open (or read) at IDLE_SAMPLE_RATE: stop idling, keep listening
+        print(f"Idle listening disabled: {e}")
+        idle_listener = None
+        return listen_for_command()
+    if audio is None:
+        return None
+    return recognize_captured(audio, wake_word_needed=True)
+
+def recognize_captured(audio, wake_word_needed=False):
+    """Recognize a phrase captured outside listen_for_command (barge-in, idle wake-up)"""
+    last_utterance.clear()
+    last_utterance.update(audio=audio, timings={})
+    
+    try:
+        start = time.perf_counter()
+        query = new_recognizer().recognize_google(audio, language='en-us')
+        last_utterance['timings']['recognize'] = time.perf_counter() - start
+    except sr.UnknownValueError:
+        RECOGNITIONS.labels('unknown').inc()
+        if not wake_word_needed:        # an idle wake-up on noise isn't worth mentioning
+            print("Sorry, I didn't catch that.")
+        return None
+    except sr.RequestError as e:
+        RECOGNITIONS.labels('request_error').inc()
+        print(f"Speech recognition error: {e}")
+        return None
+    RECOGNITIONS.labels('ok').inc()
+    RECOGNITION_SECONDS.observe(last_utterance['timings']['recognize'])
+    
+    last_utterance['transcript'] = query
+    print(f"You said: '{query}'")
+    if WAKE_WORD_MODE:
+        if wake_word_needed and WAKE_WORD.lower() not in query.lower():
+            return None
+        query = query.lower().replace(WAKE_WORD.lower(), "").strip()
+        if wake_word_needed and not query:
+            speak(reply('greeting'))
+            return "activated"
+    return query.lower() or None
+
+def listen_streaming(r, source):
+    """Capture a phrase with interim recognition, committing early once the intent is clear
+    
+    Returns (transcript, audio, seconds spent on the final recognition).
+    """
+    def transcribe(audio):
+        return r.recognize_google(audio, language='en-us')
+    
+    def show_partial(text):
+        print(f"  ...{text}")
+        speculate(text)
+    
+    listener = StreamingListener(r, transcribe, intents.resolve,
+                                 interim_interval=INTERIM_INTERVAL,
+                                 early_pause=EARLY_COMMIT_PAUSE)
+    query, audio, early = listener.listen(source, timeout=LISTEN_TIMEOUT,
+                                          phrase_time_limit=PHRASE_TIME_LIMIT,
+                                          on_partial=show_partial)
+    if early:
+        print(f"(committed early after {listener.stats['capture_seconds']}s)")
+    return query, audio, listener.stats['recognize_seconds']
+
 def continuous_listen():
-    """Continuous listening mode for wake word detection"""
+    """Listen for commands until told to stop, idling on the energy gate between conversations"""
     global listen_enabled
     
+    last_command = time.monotonic()
     while listen_enabled:
         try:
-            command = listen_for_command()
+            if idle_listener and pending_utterance is None and not PRIVACY_MODE \
+                    and time.monotonic() - last_command >= IDLE_AFTER:
+                command = listen_idle()
+            else:
+                command = listen_for_command()
             if command:
-                process_command(command)
+                last_command = time.monotonic()
+                if handle_utterance(command) == "exit":
+                    break
             time.sleep(0.1)  # Small delay to prevent excessive CPU usage
         except KeyboardInterrupt:
             break
@@ -647,6 +731,58 @@ def continuous_listen():
             print(f"Error in continuous listening: {e}")
             time.sleep(1)
 
+def handle_utterance(command):
+    """Process a heard command, saving it as a fixture when recording"""
+    if fixture_recorder is None or 'audio' not in last_utterance:
+        return process_command(command)
+    
+    _speech_capture.heard = []
+    start = time.perf_counter()
+    try:
+        return process_command(command)
+    finally:
+        last_utterance['timings']['respond'] = time.perf_counter() - start
+        rule = plugins.match(command)
+        fixture_id = fixture_recorder.record(last_utterance['audio'], last_utterance.get('transcript'),
+                                             intent=rule.intent if rule else None,
+                                             responses=_speech_capture.heard,
+                                             timings=last_utterance['timings'])
+        _speech_capture.heard = None
+        print(f"(recorded fixture {fixture_id})")
+
+# Statistical fallback for commands no keyword rule matches (loaded on first use)
+intent_classifier = None
+_classifier_lock = threading.Lock()
+
+def load_intent_classifier():
+    """The intent classifier, loaded (or trained) on first use; False if unavailable"""
+    global intent_classifier
+    if intent_classifier is None:
+        with _classifier_lock:
+            if intent_classifier is None:
+                try:
+                    from classifier import IntentClassifier
+                    intent_classifier = IntentClassifier().load_or_train(INTENT_MODEL_FILE)
+                except Exception as e:
+                    print(f"Intent classifier not available: {e}")
+                    intent_classifier = False
+    return intent_classifier
+
+def understood_as(command):
+    """Rewrite an unmatched command into one the rules handle, if the classifier is confident"""
+    if not INTENT_CLASSIFIER or not load_intent_classifier():
+        return None
+    
+    from classifier import usable
+    guess = intent_classifier.classify(command)
+    if not usable(guess, INTENT_MIN_CONFIDENCE, INTENT_ACTION_CONFIDENCE):
+        return None
+    # Only hand back commands the rules resolve, so this can't recurse forever
+    if plugins.match(guess.command) is None:
+        return None
+    print(f"(understood as '{guess.command}', {guess.confidence:.0%} sure)")
+    return guess.command
+
 def process_command(command):
     """Process voice commands with comprehensive feature support"""
     if not command or command == "activated":
@@ -654,261 +790,51 @@ def process_command(command):
     
     global PRIVACY_MODE, listen_enabled
     
+    # Several requests in one utterance are split and run together
+    if COMPOUND_COMMANDS:
+        waves = compound.plan(command, plugins.match)
+        if waves:
+            return run_compound(waves)
+    
+    # Intents are matched against the plugin manifest; plugins are imported on first use
+    rule = plugins.match(command)
+    if rule is not None:
+        COMMANDS.labels(rule.intent).inc()
+    if rule is not None and rule.plugin != 'core':
+        start = time.perf_counter()
+        try:
+            return plugins.dispatch(rule, command, plugin_context)
+        except Exception:
+            HANDLER_ERRORS.labels(rule.intent).inc()
+            raise
+        finally:
+            HANDLER_SECONDS.labels(rule.plugin).observe(time.perf_counter() - start)
+    intent = rule.intent if rule else None
+    
     # =========================================================================
     # CORE COMMANDS
     # =========================================================================
     
     # Exit commands
-    if any(word in command for word in ['stop', 'goodbye', 'good bye', 'exit', 'quit']):
-        speak(get_random_response(GOODBYES))
+    if intent == 'exit':
+        speak(reply('goodbye'))
         return "exit"
     
     # Greeting commands
-    elif any(word in command for word in ['hello', 'hi', 'hey']) and len(command.split()) <= 2:
-        speak(get_random_response(GREETINGS))
+    elif intent == 'greeting':
+        speak(reply('greeting'))
     
     # Time commands
-    elif 'time' in command:
+    elif intent == 'time':
         current_time = datetime.datetime.now().strftime("%I:%M %p")
-        speak(f"{get_random_response(CONFIRMATIONS)} The current time is {current_time}.")
-    
-    # =========================================================================
-    # SYSTEM CONTROL COMMANDS
-    # =========================================================================
-    
-    # Volume control - Enhanced to handle multiple formats
-    elif 'volume' in command:
-        if 'mute' in command or 'unmute' in command:
-            if mute_volume():
-                speak(f"{get_random_response(CONFIRMATIONS)} Volume toggled.")
-            else:
-                speak(get_random_response(ERROR_RESPONSES))
-        elif 'what is the volume' in command or 'current volume' in command:
-            vol = get_volume()
-            if vol is not None:
-                speak(f"The current volume is {vol} percent.")
-            else:
-                speak("I couldn't check the volume level.")
-        else:
-            # Handle volume setting - multiple formats supported
-            try:
-                volume_match = re.search(r'\d+', command)
-                if volume_match:
-                    level = int(volume_match.group())
-                    if 0 <= level <= 100:
-                        if set_volume(level):
-                            speak(f"{get_random_response(CONFIRMATIONS)} Volume set to {level} percent.")
-                        else:
-                            speak(get_random_response(ERROR_RESPONSES))
-                    else:
-                        speak("Please specify a volume between 0 and 100.")
-                else:
-                    speak("Please specify a volume level, for example: volume 50 or set volume to 75.")
-            except:
-                speak("I couldn't understand the volume level.")
-    
-    # Screenshot
-    elif 'screenshot' in command or 'take a screenshot' in command:
-        filename = take_screenshot()
-        if filename:
-            speak(f"{get_random_response(COMPLETIONS)} Screenshot saved as {filename}.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # Lock screen
-    elif 'lock screen' in command or 'lock computer' in command:
-        speak(f"{get_random_response(CONFIRMATIONS)} Locking the screen now.")
-        lock_screen()
-    
-    # System information
-    elif 'system info' in command or 'system information' in command or 'how is my computer' in command:
-        info = get_system_info()
-        if info:
-            response = f"Here's your system status: "
-            response += f"CPU usage is at {info['cpu']}%, "
-            response += f"memory usage is at {info['memory_percent']}%, "
-            if info['battery']:
-                response += f"battery is at {info['battery']}%, "
-            response += f"and disk usage is at {info['disk_percent']}%."
-            speak(response)
-        else:
-            speak("I couldn't retrieve system information.")
-    
-    # WiFi information
-    elif 'wifi' in command or 'wi-fi' in command:
-        profiles = get_wifi_info()
-        if profiles:
-            speak(f"I found {len(profiles)} WiFi profiles: {', '.join(profiles[:3])}.")
-        else:
-            speak("I couldn't find any WiFi profiles.")
-    
-    # =========================================================================
-    # PRODUCTIVITY COMMANDS
-    # =========================================================================
-    
-    # Calculator
-    elif any(word in command for word in ['calculate', 'math', 'plus', 'minus', 'multiply', 'divide', 'equals']):
-        # Extract mathematical expression
-        math_expression = re.sub(r'(calculate|math|what is|equals to)', '', command).strip()
-        math_expression = math_expression.replace('plus', '+').replace('minus', '-')
-        math_expression = math_expression.replace('multiply', '*').replace('times', '*')
-        math_expression = math_expression.replace('divide', '/').replace('divided by', '/')
-        
-        result = calculate(math_expression)
-        if result is not None:
-            speak(f"The result is {result}.")
-        else:
-            speak("I couldn't calculate that. Please check your expression.")
-    
-    # Unit conversion
-    elif 'convert' in command:
-        try:
-            # Parse conversion command (e.g., "convert 100 pounds to kilograms")
-            parts = command.split()
-            if 'to' in parts:
-                to_index = parts.index('to')
-                value = float(parts[parts.index('convert') + 1])
-                from_unit = parts[parts.index('convert') + 2]
-                to_unit = parts[to_index + 1]
-                
-                result = convert_units(value, from_unit, to_unit)
-                if result is not None:
-                    speak(f"{value} {from_unit} is {result:.2f} {to_unit}.")
-                else:
-                    speak("I don't know how to convert those units.")
-        except:
-            speak("I couldn't understand the conversion. Please try again.")
-    
-    # Timer
-    elif 'timer' in command:
-        try:
-            minutes_match = re.search(r'(\\d+)\\s*minute', command)
-            if minutes_match:
-                minutes = int(minutes_match.group(1))
-                message = f"Timer for {minutes} minutes is up!"
-                set_timer(minutes, message)
-                speak(f"{get_random_response(CONFIRMATIONS)} Timer set for {minutes} minutes.")
-            else:
-                speak("Please specify how many minutes for the timer.")
-        except:
-            speak("I couldn't set the timer. Please try again.")
-    
-    # Quick notes
-    elif 'note' in command or 'remember' in command:
-        note_content = command.replace('note', '').replace('remember', '').strip()
-        if save_note(note_content):
-            speak(f"{get_random_response(CONFIRMATIONS)} Note saved.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # =========================================================================
-    # FILE MANAGEMENT COMMANDS
-    # =========================================================================
-    
-    # Create folder
-    elif 'create folder' in command:
-        folder_name = command.replace('create folder', '').strip()
-        if create_folder(folder_name):
-            speak(f"{get_random_response(COMPLETIONS)} Folder '{folder_name}' created.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # Search files
-    elif 'search for file' in command or 'find file' in command:
-        pattern = command.replace('search for file', '').replace('find file', '').strip()
-        files = search_files(pattern)
-        if files:
-            speak(f"I found {len(files)} files: {', '.join([os.path.basename(f) for f in files[:3]])}.")
-        else:
-            speak(f"No files found matching '{pattern}'.")
-    
-    # Create file
-    elif 'create file' in command:
-        filename = command.replace('create file', '').strip()
-        if create_file(filename):
-            speak(f"{get_random_response(COMPLETIONS)} File '{filename}' created.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # =========================================================================
-    # WINDOWS INTEGRATION COMMANDS
-    # =========================================================================
-    
-    # Minimize windows
-    elif 'minimize all windows' in command or 'minimise all windows' in command:
-        if minimize_all_windows():
-            speak(f"{get_random_response(COMPLETIONS)} All windows minimized.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # Switch to application
-    elif 'switch to' in command:
-        app_name = command.replace('switch to', '').strip()
-        if switch_window(app_name):
-            speak(f"{get_random_response(CONFIRMATIONS)} Switched to {app_name}.")
-        else:
-            speak(f"I couldn't find {app_name}.")
-    
-    # Close application
-    elif 'close' in command and any(word in command for word in ['application', 'app', 'program']):
-        app_name = command.replace('close', '').replace('application', '').replace('app', '').replace('program', '').strip()
-        if close_application(app_name):
-            speak(f"{get_random_response(COMPLETIONS)} {app_name} closed.")
-        else:
-            speak(f"I couldn't close {app_name}.")
-    
-    # =========================================================================
-    # WEB SEARCH COMMANDS
-    # =========================================================================
-    
-    # Google search
-    elif 'search google for' in command or 'google' in command:
-        query = command.replace('search google for', '').replace('google', '').strip()
-        if search_google(query):
-            speak(f"{get_random_response(CONFIRMATIONS)} Searching Google for {query}.")
-        else:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    # Wikipedia search
-    elif 'wikipedia' in command or 'what is' in command:
-        query = command.replace('wikipedia', '').replace('what is', '').strip()
-        summary = search_wikipedia(query)
-        if summary:
-            speak(f"Here's what I found: {summary}")
-        else:
-            speak(f"I couldn't find information about {query} on Wikipedia.")
-    
-    # =========================================================================
-    # SECURITY & PRIVACY COMMANDS
-    # =========================================================================
-    
-    # Generate password
-    elif 'generate password' in command:
-        try:
-            length_match = re.search(r'(\\d+)', command)
-            length = int(length_match.group(1)) if length_match else 12
-            password = generate_password(length)
-            speak(f"I've generated a {length} character password. Check the screen for details.")
-            print(f"Generated password: {password}")
-        except:
-            password = generate_password()
-            speak("I've generated a 12 character password. Check the screen for details.")
-            print(f"Generated password: {password}")
-    
-    # Security check
-    elif 'security check' in command or 'check security' in command:
-        security_info = check_system_security()
-        if security_info:
-            if security_info['suspicious_count'] > 0:
-                speak(f"I found {security_info['suspicious_count']} processes using high CPU.")
-            else:
-                speak("Your system appears to be running normally.")
-        else:
-            speak("I couldn't perform a security check.")
+        speak(reply('time', time=current_time))
     
     # Privacy mode toggle
-    elif 'privacy mode' in command:
-        if 'on' in command or 'enable' in command:
+    elif intent == 'privacy_mode':
+        if server_mode:
+            # PRIVACY_MODE is process-wide; one satellite must not switch it for every client
+            speak("Privacy mode can only be changed on the assistant itself, not from a satellite.")
+        elif 'on' in command or 'enable' in command:
             PRIVACY_MODE = True
             speak("Privacy mode enabled. I'll use text input only.")
         elif 'off' in command or 'disable' in command:
@@ -919,172 +845,11 @@ def process_command(command):
             status = "enabled" if PRIVACY_MODE else "disabled"
             speak(f"Privacy mode {status}.")
     
-    # =========================================================================
-    # WEATHER COMMANDS
-    # =========================================================================
-    
-    elif 'weather' in command:
-        if OPENWEATHER_API_KEY == "YOUR_OPENWEATHERMAP_API_KEY":
-            speak("Weather functionality requires an API key. Please add your OpenWeatherMap API key to the configuration.")
-        elif 'in' in command:
-            city = command.split('in')[-1].strip()
-            base_url = "http://api.openweathermap.org/data/2.5/weather?"
-            complete_url = base_url + "appid=" + OPENWEATHER_API_KEY + "&q=" + city + "&units=metric"
-            try:
-                response = requests.get(complete_url)
-                weather_data = response.json()
-                if weather_data.get("cod") == 200:
-                    main_data = weather_data["main"]
-                    temperature = main_data["temp"]
-                    weather_desc = weather_data["weather"][0]["description"]
-                    humidity = main_data["humidity"]
-                    speak(f"The weather in {city}: {temperature} degrees celsius with {weather_desc}. Humidity is {humidity} percent.")
-                else:
-                    speak(f"I couldn't find the weather for {city}.")
-            except Exception as e:
-                speak("I'm having trouble connecting to the weather service.")
-        else:
-            speak("Which city's weather would you like to know?")
-    
-    # =========================================================================
-    # TO-DO LIST COMMANDS
-    # =========================================================================
-    
-    elif 'add' in command and 'to do list' in command:
-        task = command.split('add')[-1].replace('to do list', '').replace('to my to do list', '').strip()
-        try:
-            with open(TODO_FILE, "a", encoding="utf-8") as f:
-                f.write(task + "\\n")
-            speak(f"{get_random_response(CONFIRMATIONS)} I've added '{task}' to your list.")
-        except Exception as e:
-            speak(get_random_response(ERROR_RESPONSES))
-    
-    elif 'read my to do list' in command or 'show me my to do list' in command:
-        try:
-            with open(TODO_FILE, "r", encoding="utf-8") as f:
-                tasks = f.readlines()
-            if not tasks:
-                speak("Your to-do list is empty!")
-            else:
-                response = "Here are your tasks: "
-                for i, task in enumerate(tasks[:5]):  # Limit to 5 tasks
-                    response += f"{i+1}: {task.strip()}. "
-                speak(response)
-        except FileNotFoundError:
-            speak("You don't have a to-do list yet.")
-    
-    # =========================================================================
-    # APPLICATION OPENING COMMANDS
-    # =========================================================================
-    
-    elif 'open website' in command:
-        website = command.replace('open website', '').strip()
-        
-        # Dictionary of common multi-word websites and their URLs
-        website_mapping = {
-            'chat gpt': 'https://chat.openai.com',
-            'chatgpt': 'https://chat.openai.com',
-            'open ai': 'https://openai.com',
-            'openai': 'https://openai.com',
-            'you tube': 'https://www.youtube.com',
-            'youtube': 'https://www.youtube.com',
-            'face book': 'https://www.facebook.com',
-            'facebook': 'https://www.facebook.com',
-            'linked in': 'https://www.linkedin.com',
-            'linkedin': 'https://www.linkedin.com',
-            'git hub': 'https://github.com',
-            'github': 'https://github.com',
-            'stack overflow': 'https://stackoverflow.com',
-            'google': 'https://www.google.com',
-            'gmail': 'https://mail.google.com',
-            'google mail': 'https://mail.google.com',
-            'google drive': 'https://drive.google.com',
-            'google docs': 'https://docs.google.com',
-            'whats app': 'https://web.whatsapp.com',
-            'whatsapp': 'https://web.whatsapp.com',
-            'twitter': 'https://twitter.com',
-            'x': 'https://x.com',
-            'instagram': 'https://www.instagram.com',
-            'reddit': 'https://www.reddit.com',
-            'amazon': 'https://www.amazon.com',
-            'netflix': 'https://www.netflix.com',
-            'spotify': 'https://open.spotify.com',
-            'twitch': 'https://www.twitch.tv',
-            'discord': 'https://discord.com/app',
-            'microsoft teams': 'https://teams.microsoft.com',
-            'teams': 'https://teams.microsoft.com',
-            'zoom': 'https://zoom.us',
-            'slack': 'https://slack.com',
-            'notion': 'https://www.notion.so',
-            'wikipedia': 'https://www.wikipedia.org',
-            'wiki': 'https://www.wikipedia.org'
-        }
-        
-        # Check if it's a known website
-        website_lower = website.lower()
-        if website_lower in website_mapping:
-            speak(f"{get_random_response(CONFIRMATIONS)} Opening {website}.")
-            webbrowser.open(website_mapping[website_lower])
-        else:
-            # For unknown websites, remove spaces and try to form a URL
-            website_clean = website.replace(' ', '').lower()
-            speak(f"{get_random_response(CONFIRMATIONS)} Opening {website} website.")
-            webbrowser.open(f"https://www.{website_clean}.com")
-    
-    elif 'open' in command:
-        app = command.replace('open', '').strip()
-        
-        # Dictionary of common applications and their executables
-        app_mapping = {
-            'notepad': 'notepad',
-            'calculator': 'calc',
-            'paint': 'mspaint',
-            'word': 'winword',
-            'microsoft word': 'winword',
-            'excel': 'excel',
-            'microsoft excel': 'excel',
-            'powerpoint': 'powerpnt',
-            'microsoft powerpoint': 'powerpnt',
-            'chrome': 'chrome',
-            'google chrome': 'chrome',
-            'firefox': 'firefox',
-            'edge': 'msedge',
-            'microsoft edge': 'msedge',
-            'file explorer': 'explorer',
-            'explorer': 'explorer',
-            'command prompt': 'cmd',
-            'cmd': 'cmd',
-            'powershell': 'powershell',
-            'task manager': 'taskmgr',
-            'control panel': 'control',
-            'settings': 'ms-settings:',
-            'vs code': 'code',
-            'visual studio code': 'code'
-        }
-        
-        app_lower = app.lower()
-        
-        # Check if it's a known application
-        if app_lower in app_mapping:
-            speak(f"{get_random_response(CONFIRMATIONS)} Opening {app}.")
-            try:
-                subprocess.Popen(f'start {app_mapping[app_lower]}', shell=True)
-            except:
-                speak(f"I couldn't open {app}. It might not be installed.")
-        else:
-            # For unknown apps, try as-is
-            speak(f"{get_random_response(CONFIRMATIONS)} Opening {app}.")
-            try:
-                subprocess.call(['start', '', f'{app}.exe'], shell=True)
-            except Exception as e:
-                speak(f"I had trouble opening {app}.")
-    
-    
     # =========================================================================
     # HELP COMMAND
     # =========================================================================
     
-    elif 'help' in command or 'commands' in command:
+    elif intent == 'help':
         # Short spoken response
         spoken_help = "I can help you with system control like volume and screenshots, productivity tools like calculator and timer, file management, web search, opening applications, and much more. Check your screen for detailed examples."
         speak(spoken_help)
@@ -1111,6 +876,7 @@ def process_command(command):
         • "Create file test.txt" - Make new files
         
         Web & Information:
+        • "Search the web for why the sky is blue" - Spoken web answer
         • "Search Google for Python tutorials" - Web search
         • "What is machine learning" - Wikipedia search
         • "Weather in New York" - Weather information
@@ -1125,6 +891,9 @@ def process_command(command):
         • "Security check" - System monitoring
         • "Privacy mode on" - Toggle privacy mode
         
+        Combine requests with "and" or "then":
+        • "Set volume to 30 and take a screenshot and weather in Paris"
+        
         Say "stop" or "goodbye" to exit.
         """
         print(help_text)
@@ -1134,6 +903,11 @@ def process_command(command):
     # =========================================================================
     
     else:
+        rewritten = understood_as(command)
+        if rewritten:
+            return process_command(rewritten)
+        COMMANDS.labels('unknown').inc()
+        
         responses = [
             "I'm not sure how to help with that.",
             "Could you rephrase that?",
@@ -1143,13 +917,278 @@ def process_command(command):
         ]
         speak(random.choice(responses))
 
+def run_compound(waves):
+    """Run the parts of a compound command, independent ones at once, and speak one combined reply"""
+    results = compound.execute(waves, run_command_captured, compound_pool)
+    replies = []
+    for result in results:
+        replies.extend(result['responses'])
+        if result['status'] == 'error':
+            print(f"Error in '{result['command']}': {result['error']}")
+            replies.append(reply('error'))
+    if replies:
+        speak(join_replies(replies))
+    if any(result['status'] == 'exit' for result in results):
+        return "exit"
+
+plugin_context = plugins.PluginContext(speak=speak, reply=reply, lookup=lookup)
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def loaded_plugin(name):
+    """A plugin module if it has been imported already (metrics never import one)"""
+    return plugins.load(name) if name in plugins.loaded() else None
+
+# Read from the components' own stats when scraped, so they cost nothing per event
+metrics.gauge_function('assistant_timers_active', "Timers waiting to go off",
+                       lambda: len(loaded_plugin('productivity').active_timers) if loaded_plugin('productivity') else 0)
+metrics.gauge_function('assistant_screenshot_queue', "Screenshots waiting to be encoded",
+                       lambda: loaded_plugin('system_control').screenshots.pending if loaded_plugin('system_control') else 0)
+metrics.gauge_function('assistant_plugins_loaded', "Plugin modules imported so far", lambda: len(plugins.loaded()))
+metrics.counter_function('assistant_lookup_cache_total', "Lookup cache results (shared = joined a lookup in flight)",
+                         lambda: dict(result_cache.stats) if result_cache else None, ['result'])
+metrics.counter_function('assistant_speculation_total', "Speculative lookups started and how they were used",
+                         lambda: {k: v for k, v in speculative_cache.stats.items() if k != 'seconds_saved'}
+                         if speculative_cache else None, ['result'])
+metrics.counter_function('assistant_speculation_saved_seconds_total', "Lookup time saved by speculation",
+                         lambda: speculative_cache.stats['seconds_saved'] if speculative_cache else None)
+metrics.gauge_function('assistant_tts_circuit_open', "1 while ElevenLabs is skipped after repeated failures",
+                       lambda: int(cloud_tts.breaker.state != cloud_tts.breaker.CLOSED) if cloud_tts else None)
+metrics.counter_function('assistant_tts_requests_total', "ElevenLabs requests through the circuit breaker, by result",
+                         lambda: dict(cloud_tts.breaker.stats) if cloud_tts else None, ['result'])
+metrics.counter_function('assistant_recognition_audio_bytes_total',
+                         "Speech audio captured, and uploaded for recognition after conditioning",
+                         lambda: {'captured': recognition_uploads['bytes_captured'],
+                                  'uploaded': recognition_uploads['bytes_uploaded']}, ['kind'])
+metrics.counter_function('assistant_tts_routes_total', "Replies routed to cloud or local speech, and why",
+                         lambda: dict(tts_router.stats), ['route', 'reason'])
+metrics.gauge_function('assistant_tts_budget_chars', "Cloud TTS characters this period: used, projected and limit",
+                       lambda: {'used': char_budget.used, 'projected': char_budget.projected(),
+                                'limit': char_budget.limit}, ['kind'])
+metrics.counter_function('assistant_reply_audio_cache_total', "Reply audio cache results",
+                         lambda: dict(reply_audio.stats), ['result'])
+metrics.counter_function('assistant_reply_chars_total', "Reply characters, and those synthesized instead of cached",
+                         lambda: {'total': composer.stats['chars_total'], 'synthesized': composer.stats['chars_synthesized']},
+                         ['kind'])
+
+def start_metrics(endpoint=True):
+    """Serve metrics over HTTP and write them to METRICS_FILE on exit, as configured"""
+    if endpoint and METRICS_PORT:
+        try:
+            metrics.serve(METRICS_HOST, METRICS_PORT)
+            print(f"Metrics at http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+        except OSError as e:
+            print(f"Metrics endpoint not started: {e}")
+    if METRICS_FILE:
+        atexit.register(lambda: metrics.dump(METRICS_FILE))
+
+# =============================================================================
+# WARM-UP
+# =============================================================================
+
+# Host the speech recognizer sends audio to
+RECOGNITION_HOST = "www.google.com"
+
+def warm_recognition():
+    """Resolve the recognition host and initialize the audio device"""
+    socket.getaddrinfo(RECOGNITION_HOST, 80)
+    if not PRIVACY_MODE:
+        # Opening a stream loads PortAudio and the device; not calibrated here,
+        # since the greeting is playing
+        with sr.Microphone():
+            pass
+
+def prime_samplers():
+    """Take the first CPU sample and render the metrics once"""
+    import psutil
+    psutil.cpu_percent(interval=None)
+    metrics.REGISTRY.render()
+
+def start_warmup():
+    """Prime connections, engines and caches in the background (see warmup.py)"""
+    warm = Warmup(budget=WARMUP_BUDGET)
+    warm.add('plugins', plugins.load_all)
+    if INTENT_CLASSIFIER:
+        warm.add('classifier', load_intent_classifier)
+    warm.add('recognition', warm_recognition)
+    if cloud_tts:
+        warm.add('tts_connection', cloud_tts.warm)
+    if pcm_sink and VOICE_ID:
+        warm.add('phrases', prerender_phrases)
+    if OPENWEATHER_API_KEY != "YOUR_OPENWEATHERMAP_API_KEY":
+        warm.add('weather_connection', lambda: plugins.load('weather').warm())
+    warm.add('local_voice', lambda: backends.get().warm())
+    warm.add('samplers', prime_samplers)
+    return warm.start()
+
+# =============================================================================
+# BATCH MODE
+# =============================================================================
+
+def run_command_captured(command):
+    """Run one command and return a structured result instead of speaking it"""
+    outer = getattr(_speech_capture, 'replies', None)
+    _speech_capture.replies = []
+    result = {'command': command}
+    start = time.perf_counter()
+    try:
+        status = process_command(command.lower())
+        result['status'] = status or 'ok'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = str(e)
+    finally:
+        result['responses'] = _speech_capture.replies
+        _speech_capture.replies = outer     # parts of a compound command are captured inside it
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+def run_batch(lines, concurrency=1, output=None):
+    """Run commands from an iterable of lines, writing one JSON result per line"""
+    global batch_mode
+    batch_mode = True
+    output = output or sys.stdout
+    
+    # Blank lines and '#' comments are skipped
+    commands = [line.strip() for line in lines]
+    commands = [c for c in commands if c and not c.startswith('#')]
+    
+    # Handler prints go to stderr so stdout stays valid JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            for index, result in enumerate(executor.map(run_command_captured, commands)):
+                result['index'] = index
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+    return len(commands)
+
+# =============================================================================
+# FIXTURE REPLAY
+# =============================================================================
+
+def replay_fixture(directory, entry, realtime=True, offline=False):
+    """Run one recorded utterance through listening and command handling"""
+    source = FixtureSource(os.path.join(directory, entry['wav']), realtime=realtime)
+    recognizer = FixtureRecognizer(entry.get('transcript')) if offline else None
+    start = time.perf_counter()
+    command = listen_for_command(source, recognizer)
+    result = {'id': entry['id'], 'transcript': last_utterance.get('transcript')}
+    timings = dict(last_utterance.get('timings', {}))
+    if command:
+        handled = run_command_captured(command)
+        timings['respond'] = handled['elapsed_ms'] / 1000
+        rule = plugins.match(command)
+        result.update(intent=rule.intent if rule else None, status=handled['status'],
+                      responses=handled['responses'])
+    timings['total'] = time.perf_counter() - start
+    result['timings'] = {k: round(v, 4) for k, v in timings.items()}
+    result['match'] = (result['transcript'] == entry.get('transcript')
+                       and result.get('intent') == entry.get('intent'))
+    return result
+
+def run_replay(directory, realtime=True, offline=False, output=None):
+    """Replay every fixture in a directory, writing one JSON result per line and a latency summary"""
+    global batch_mode
+    batch_mode = True
+    output = output or sys.stdout
+    entries = load_manifest(directory)
+    if not entries:
+        print(f"No fixtures found in {directory}", file=sys.stderr)
+        return []
+    
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        for entry in entries:
+            result = replay_fixture(directory, entry, realtime, offline)
+            results.append(result)
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+    print(summarize_replay(results), file=sys.stderr)
+    return results
+
+# =============================================================================
+# SERVER MODE
+# =============================================================================
+
+def run_server(address):
+    """Serve commands from satellites over HTTP until interrupted"""
+    global batch_mode, server_mode
+    batch_mode = True
+    server_mode = True
+    host, _, port = address.rpartition(':')
+    host = host or SERVER_HOST
+    sample_rate = pcm_rate(TTS_OUTPUT_FORMAT)
+    server = AssistantServer((host, int(port)), run_command_captured,
+                             synthesize=synthesize_pcm if cloud_tts and sample_rate else None,
+                             sample_rate=sample_rate, workers=SERVER_WORKERS,
+                             session_ttl=SERVER_SESSION_TTL, token=SERVER_TOKEN)
+    metrics.gauge_function('assistant_server_pending', "Server commands queued or running",
+                           lambda: server.health()['pending'])
+    metrics.gauge_function('assistant_server_sessions', "Active satellite sessions", lambda: len(server.sessions))
+    metrics.counter_function('assistant_server_requests_total', "Server requests, by kind",
+                             lambda: dict(server.stats), ['kind'])
+    metrics.counter_function('assistant_server_tts_cache_total', "Server TTS audio cache results",
+                             lambda: dict(server.audio_cache.stats), ['result'])
+    start_metrics()
+    print(f"Assistant server listening on http://{host}:{server.server_address[1]} "
+          f"({SERVER_WORKERS} workers, text to speech {'on' if server.synthesize else 'off'})")
+    if not LAZY_PLUGINS:
+        plugins.load_all()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Server stats: {server.health()}")
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="AI Voice Assistant")
+    parser.add_argument('--batch', nargs='?', const='-', metavar='FILE',
+                        help="run commands from FILE (or stdin if omitted or '-') and print JSON results")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="number of batch commands to run in parallel (default: 1)")
+    parser.add_argument('--serve', nargs='?', const=f"{SERVER_HOST}:{SERVER_PORT}", metavar='HOST:PORT',
+                        help=f"serve commands to satellites over HTTP (default {SERVER_HOST}:{SERVER_PORT})")
+    parser.add_argument('--record-fixtures', metavar='DIR',
+                        help="save each utterance's audio, transcript, intent and responses to DIR")
+    parser.add_argument('--replay', metavar='DIR',
+                        help="replay recorded fixtures from DIR instead of listening, and report stage latencies")
+    parser.add_argument('--offline', action='store_true',
+                        help="with --replay, use the recorded transcripts instead of calling the recognizer")
+    parser.add_argument('--fast', action='store_true',
+                        help="with --replay, read fixture audio as fast as possible instead of in real time")
+    return parser.parse_args(argv)
+
 # =============================================================================
 # MAIN PROGRAM
 # =============================================================================
 
-def main():
+def main(argv=None):
     """Main program function"""
-    global listen_enabled
+    global listen_enabled, fixture_recorder
+    
+    args = parse_args(argv)
+    if args.serve:
+        run_server(args.serve)
+        return
+    # Batch runs and replays are short-lived: metrics only go to the file
+    start_metrics(endpoint=not (args.replay or args.batch))
+    if args.replay:
+        run_replay(args.replay, realtime=not args.fast, offline=args.offline)
+        return
+    if args.record_fixtures:
+        fixture_recorder = FixtureRecorder(args.record_fixtures)
+    if args.batch:
+        if args.batch == '-':
+            run_batch(sys.stdin, args.concurrency)
+        else:
+            with open(args.batch, "r", encoding="utf-8") as f:
+                run_batch(f, args.concurrency)
+        return
     
     print("\n" + "="*60)
     print("       AI Voice Assistant")
@@ -1169,6 +1208,12 @@ def main():
     if not VOICE_ID:
         print("Warning: ElevenLabs voice not configured. Using fallback TTS.")
     
+    if not LAZY_PLUGINS and not WARMUP:
+        plugins.load_all()
+    
+    # Warm up while the greeting plays
+    warm = start_warmup() if WARMUP else None
+    
     # Initial greeting
     greeting_messages = [
         "Hello! AI Voice Assistant is online and ready to help!",
@@ -1177,18 +1222,17 @@ def main():
     ]
     speak(random.choice(greeting_messages))
     
+    if warm:
+        print(warm.wait().summary())
+    else:
+        # Render fixed reply phrases in the background so later replies can splice them
+        threading.Thread(target=prerender_phrases, daemon=True).start()
+    
     # Main interaction loop
     try:
         if WAKE_WORD_MODE:
             print(f"\nWake word mode enabled. Say '{WAKE_WORD}' followed by your command.")
-            continuous_listen()
-        else:
-            while listen_enabled:
-                command = listen_for_command()
-                if command:
-                    result = process_command(command)
-                    if result == "exit":
-                        break
+        continuous_listen()
                         
     except KeyboardInterrupt:
         speak("Goodbye! Thanks for using AI Voice Assistant!")
@@ -1196,6 +1240,19 @@ def main():
         print(f"An error occurred: {e}")
         speak("I encountered an error. Goodbye for now.")
     
+    if cloud_tts and cloud_tts.breaker.stats['opened']:
+        print(f"ElevenLabs circuit breaker: {cloud_tts.breaker.stats}")
+    if sum(tts_router.stats.values()):
+        print(tts_router.report())
+    if composer.stats['replies']:
+        print(f"Reply audio: {composer.stats['chars_synthesized']} of {composer.stats['chars_total']} characters synthesized")
+    if recognition_uploads['utterances']:
+        print(audio_conditioning.report(recognition_uploads))
+    if idle_listener and idle_listener.stats['wakes']:
+        print(f"Idle listening: woke {idle_listener.stats['wakes']} times, "
+              f"idle for {idle_listener.stats['seconds']:.0f} s")
+    if speculative_cache and speculative_cache.stats['started']:
+        print(speculative_cache.report())
     print("\nAI Voice Assistant shutdown complete.")
 
 if __name__ == "__main__":
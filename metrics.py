@@ -0,0 +1,414 @@
+"""
+Metrics registry with a Prometheus text endpoint.
+
+Counters, gauges and histograms are recorded where things happen (speech
+output, recognition, command handling); numbers other components already keep
+in their own stats dicts are read through callbacks only when the metrics are
+scraped, so they cost nothing per event. Counters and histograms keep one cell
+per thread and add them up when scraped, so recording takes no lock and stays
+well under a microsecond.
+
+    REPLIES = metrics.counter('assistant_replies_total', "Replies spoken", ['backend'])
+    REPLIES.labels('sapi').inc()
+
+serve() exposes the registry at http://HOST:PORT/metrics; dump() writes the
+same text to a file.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from a fast command to a slow network lookup
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Shards:
+    """Per-thread cells summed at scrape time, so recording never takes a lock
+
+    Each thread only ever writes its own cell. Cells of threads that have
+    exited are folded into one when new threads keep appearing (timer threads,
+    per-connection server threads).
+    """
+
+    __slots__ = ('_local', '_cells', '_lock', '_make')
+
+    def __init__(self, make):
+        self._local = threading.local()
+        self._cells = []            # [(thread, cell)]
+        self._lock = threading.Lock()
+        self._make = make
+
+    def cell(self):
+        cell = self._make()
+        thread = threading.current_thread()
+        with self._lock:
+            if len(self._cells) >= 32:
+                self._fold()
+            self._cells.append((thread, cell))
+        self._local.cell = cell
+        return cell
+
+    def _fold(self):
+        alive, dead = [], []
+        for thread, cell in self._cells:
+            (alive if thread.is_alive() else dead).append((thread, cell))
+        if len(dead) > 1:
+            total = self._make()
+            for _, cell in dead:
+                _add(total, cell)
+            dead = [(None, total)]
+        self._cells = alive + [(thread or _FOLDED, cell) for thread, cell in dead]
+
+    def total(self):
+        result = self._make()
+        with self._lock:
+            cells = [cell for _, cell in self._cells]
+        for cell in cells:
+            _add(result, cell)
+        return result
+
+
+class _Folded:
+    """Stands in for the exited threads whose cells were folded together"""
+
+    @staticmethod
+    def is_alive():
+        return False
+
+
+_FOLDED = _Folded()
+
+
+def _add(total, cell):
+    """Add a cell into total: [value] or [counts, sum]"""
+    if len(total) == 1:
+        total[0] += cell[0]
+    else:
+        counts = total[0]
+        for i, count in enumerate(cell[0]):
+            counts[i] += count
+        total[1] += cell[1]
+
+
+class _CounterChild:
+    __slots__ = ('_shards',)
+
+    def __init__(self):
+        self._shards = _Shards(lambda: [0])
+
+    def inc(self, amount=1):
+        try:
+            self._shards._local.cell[0] += amount
+        except AttributeError:
+            self._shards.cell()[0] += amount
+
+    @property
+    def value(self):
+        return self._shards.total()[0]
+
+
+class _GaugeChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', '_shards')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        size = len(bounds) + 1
+        self._shards = _Shards(lambda: [[0] * size, 0.0])
+
+    def observe(self, value):
+        try:
+            cell = self._shards._local.cell
+        except AttributeError:
+            cell = self._shards.cell()
+        cell[0][bisect.bisect_left(self.bounds, value)] += 1
+        cell[1] += value
+
+    def snapshot(self):
+        """(bucket counts, sum)"""
+        counts, total = self._shards.total()
+        return counts, total
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    """Context manager observing the seconds spent inside it"""
+
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Metric:
+    """A named metric with zero or more labels; one child per label combination"""
+
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children = {}
+        self._lock = threading.Lock()
+        self._default = None if self.label_names else self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """The child for these label values (callers on hot paths can keep it)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self):
+        if self._default is not None:
+            return [((), self._default)]
+        return sorted(self._children.items())
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in self._items():
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values, child):
+        return [f"{self.name}{_labels(self.label_names, values)} {_number(child.value)}"]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def _render_child(self, values, child):
+        counts, total = child.snapshot()
+        lines, cumulative = [], 0
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            le = 'le="' + _number(float(bound)) + '"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, values, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, values)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, values)} {cumulative}")
+        return lines
+
+
+class Callback(Metric):
+    """Gauge or counter whose values are read from a function at scrape time
+
+    The function returns a number, or a dict from label value (a tuple when
+    there are several labels) to number; None skips the metric.
+    """
+
+    def __init__(self, name, help, kind, function, labels=()):
+        self.kind = kind
+        self.function = function
+        super().__init__(name, help, labels)
+
+    def _new_child(self):
+        return None
+
+    def _items(self):
+        try:
+            values = self.function()
+        except Exception:
+            return []
+        if values is None:
+            return []
+        if not isinstance(values, dict):
+            return [((), _Value(values))]
+        items = [((key if isinstance(key, tuple) else (key,)), _Value(value)) for key, value in values.items()]
+        return sorted(items, key=lambda item: tuple(map(str, item[0])))
+
+
+class _Value:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Registry:
+    """All metrics of one process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                    raise ValueError(f"Metric {metric.name} is already registered differently")
+                if not isinstance(metric, Callback):
+                    return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name):
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def render(self):
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name, help, labels=(), registry=REGISTRY):
+    return registry.register(Counter(name, help, labels))
+
+
+def gauge(name, help, labels=(), registry=REGISTRY):
+    return registry.register(Gauge(name, help, labels))
+
+
+def histogram(name, help, labels=(), buckets=DEFAULT_BUCKETS, registry=REGISTRY):
+    return registry.register(Histogram(name, help, labels, buckets))
+
+
+def gauge_function(name, help, function, labels=(), registry=REGISTRY):
+    return registry.register(Callback(name, help, 'gauge', function, labels))
+
+
+def counter_function(name, help, function, labels=(), registry=REGISTRY):
+    return registry.register(Callback(name, help, 'counter', function, labels))
+
+
+# =============================================================================
+# EXPORT
+# =============================================================================
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host, port, registry=REGISTRY):
+    """Serve /metrics on a background thread; returns the HTTP server"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics").start()
+    return server
+
+
+def dump(path, registry=REGISTRY):
+    """Write the current metrics to a file (replaced atomically)"""
+    temp = path + ".tmp"
+    with open(temp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(temp, path)
@@ -0,0 +1,130 @@
+"""
+Command plugins, imported on first use.
+
+The manifest below is all that is loaded at startup: it lists every intent in
+matching order, the substring rule that selects it, and the plugin module that
+handles it. A plugin module (and its platform dependencies) is imported only
+when one of its intents first matches. Intents owned by 'core' are handled in
+main.py itself.
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+from collections import namedtuple
+
+# intent: name passed to the plugin's handle()
+# plugin: module in this package, or 'core'
+# phrases: the rule matches if any of these occur in the command...
+# also: ...and (if given) any of these occur too...
+# max_words: ...and (if given) the command is at most this many words
+Rule = namedtuple('Rule', ['intent', 'plugin', 'phrases', 'also', 'max_words'], defaults=((), None))
+
+MANIFEST = [
+    Rule('exit', 'core', ('stop', 'goodbye', 'good bye', 'exit', 'quit')),
+    Rule('greeting', 'core', ('hello', 'hi', 'hey'), max_words=2),
+    # before 'time', which would also match "timer"
+    Rule('timer', 'productivity', ('timer',)),
+    Rule('time', 'core', ('time',)),
+    Rule('volume', 'system_control', ('volume',)),
+    Rule('save_screenshot', 'system_control', ('save the last screenshot', 'save last screenshot', 'save the screenshot')),
+    Rule('screenshot', 'system_control', ('screenshot', 'take a screenshot')),
+    Rule('lock_screen', 'system_control', ('lock screen', 'lock computer')),
+    Rule('system_info', 'system_control', ('system info', 'system information', 'how is my computer')),
+    Rule('wifi', 'system_control', ('wifi', 'wi-fi')),
+    Rule('calculate', 'productivity', ('calculate', 'math', 'plus', 'minus', 'multiply', 'divide', 'equals')),
+    Rule('convert', 'productivity', ('convert',)),
+    Rule('note', 'productivity', ('note', 'remember')),
+    Rule('disk_usage', 'files', ('disk usage', 'disk space', 'using my disk', 'using up my disk', 'largest folders',
+                                 'biggest folders', 'largest files', 'biggest files', 'files over', 'files larger than',
+                                 'files bigger than')),
+    Rule('create_folder', 'files', ('create folder',)),
+    Rule('search_files', 'files', ('search for file', 'find file')),
+    Rule('create_file', 'files', ('create file',)),
+    Rule('minimize_windows', 'windows', ('minimize all windows', 'minimise all windows')),
+    Rule('switch_window', 'windows', ('switch to',)),
+    Rule('close_app', 'windows', ('close',), also=('application', 'app', 'program')),
+    Rule('web_answer', 'web', ('search the web for', 'search the web', 'look up', 'ask the web')),
+    Rule('google_search', 'web', ('search google for', 'google')),
+    Rule('wikipedia', 'web', ('wikipedia', 'what is')),
+    Rule('generate_password', 'security', ('generate password',)),
+    Rule('security_check', 'security', ('security check', 'check security')),
+    Rule('privacy_mode', 'core', ('privacy mode',)),
+    Rule('weather', 'weather', ('weather',)),
+    Rule('todo_add', 'productivity', ('add',), also=('to do list',)),
+    Rule('todo_read', 'productivity', ('read my to do list', 'show me my to do list')),
+    Rule('open_website', 'web', ('open website',)),
+    Rule('open_app', 'windows', ('open',)),
+    Rule('help', 'core', ('help', 'commands')),
+]
+
+PLUGINS = sorted({rule.plugin for rule in MANIFEST if rule.plugin != 'core'})
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def install_package(package):
+    """Install a missing dependency with pip (best effort)"""
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", package],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except Exception:
+        pass
+
+
+class PluginContext:
+    """What plugins may use from the running assistant"""
+
+    def __init__(self, speak, reply, lookup):
+        self.speak = speak
+        self.reply = reply
+        self.lookup = lookup
+
+
+def rule_matches(rule, command):
+    """Check one manifest rule against a lowercase command"""
+    if not any(phrase in command for phrase in rule.phrases):
+        return False
+    if rule.also and not any(phrase in command for phrase in rule.also):
+        return False
+    if rule.max_words is not None and len(command.split()) > rule.max_words:
+        return False
+    return True
+
+
+def match(command):
+    """Return the first manifest rule matching the command, or None"""
+    for rule in MANIFEST:
+        if rule_matches(rule, command):
+            return rule
+    return None
+
+
+def load(plugin):
+    """Import a plugin module on first use"""
+    module = _loaded.get(plugin)
+    if module is None:
+        with _load_lock:
+            module = _loaded.get(plugin)
+            if module is None:
+                module = importlib.import_module(f"{__name__}.{plugin}")
+                _loaded[plugin] = module
+    return module
+
+
+def load_all():
+    """Import every plugin up front (used when lazy loading is turned off)"""
+    for plugin in PLUGINS:
+        load(plugin)
+
+
+def loaded():
+    """Names of the plugins imported so far"""
+    return sorted(_loaded)
+
+
+def dispatch(rule, command, ctx):
+    """Run a matched intent in its plugin"""
+    return load(rule.plugin).handle(rule.intent, command, ctx)
@@ -0,0 +1,72 @@
+"""
+Built-in name tables for opening websites and applications.
+Kept free of heavy imports so the alias index can be built (and benchmarked) cheaply.
+"""
+
+# Dictionary of common multi-word websites and their URLs
+WEBSITES = {
+    'chat gpt': 'https://chat.openai.com',
+    'chatgpt': 'https://chat.openai.com',
+    'open ai': 'https://openai.com',
+    'openai': 'https://openai.com',
+    'you tube': 'https://www.youtube.com',
+    'youtube': 'https://www.youtube.com',
+    'face book': 'https://www.facebook.com',
+    'facebook': 'https://www.facebook.com',
+    'linked in': 'https://www.linkedin.com',
+    'linkedin': 'https://www.linkedin.com',
+    'git hub': 'https://github.com',
+    'github': 'https://github.com',
+    'stack overflow': 'https://stackoverflow.com',
+    'google': 'https://www.google.com',
+    'gmail': 'https://mail.google.com',
+    'google mail': 'https://mail.google.com',
+    'google drive': 'https://drive.google.com',
+    'google docs': 'https://docs.google.com',
+    'whats app': 'https://web.whatsapp.com',
+    'whatsapp': 'https://web.whatsapp.com',
+    'twitter': 'https://twitter.com',
+    'x': 'https://x.com',
+    'instagram': 'https://www.instagram.com',
+    'reddit': 'https://www.reddit.com',
+    'amazon': 'https://www.amazon.com',
+    'netflix': 'https://www.netflix.com',
+    'spotify': 'https://open.spotify.com',
+    'twitch': 'https://www.twitch.tv',
+    'discord': 'https://discord.com/app',
+    'microsoft teams': 'https://teams.microsoft.com',
+    'teams': 'https://teams.microsoft.com',
+    'zoom': 'https://zoom.us',
+    'slack': 'https://slack.com',
+    'notion': 'https://www.notion.so',
+    'wikipedia': 'https://www.wikipedia.org',
+    'wiki': 'https://www.wikipedia.org'
+}
+
+# Dictionary of common applications and their executables
+APPS = {
+    'notepad': 'notepad',
+    'calculator': 'calc',
+    'paint': 'mspaint',
+    'word': 'winword',
+    'microsoft word': 'winword',
+    'excel': 'excel',
+    'microsoft excel': 'excel',
+    'powerpoint': 'powerpnt',
+    'microsoft powerpoint': 'powerpnt',
+    'chrome': 'chrome',
+    'google chrome': 'chrome',
+    'firefox': 'firefox',
+    'edge': 'msedge',
+    'microsoft edge': 'msedge',
+    'file explorer': 'explorer',
+    'explorer': 'explorer',
+    'command prompt': 'cmd',
+    'cmd': 'cmd',
+    'powershell': 'powershell',
+    'task manager': 'taskmgr',
+    'control panel': 'control',
+    'settings': 'ms-settings:',
+    'vs code': 'code',
+    'visual studio code': 'code'
+}
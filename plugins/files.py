@@ -0,0 +1,142 @@
+"""
+File management: create folders and files, search for files, disk usage.
+"""
+
+import glob
+import os
+import re
+
+from disk_usage import DiskUsage, human_size
+from settings import DISK_SCAN_ROOTS, DISK_SCAN_WORKERS, DISK_CACHE_FILE, DISK_REFRESH_SECONDS, DISK_LARGE_FILE_MB
+from slots import extract, BYTES
+
+disk = DiskUsage(DISK_SCAN_ROOTS, DISK_CACHE_FILE, workers=DISK_SCAN_WORKERS,
+                 large_file_bytes=DISK_LARGE_FILE_MB * BYTES['megabytes'])
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def create_folder(folder_name, path="."):
+    """Create a new folder"""
+    try:
+        full_path = os.path.join(path, folder_name)
+        os.makedirs(full_path, exist_ok=True)
+        return True
+    except:
+        return False
+
+def delete_file(filename):
+    """Safely delete a file"""
+    try:
+        if os.path.exists(filename):
+            os.remove(filename)
+            return True
+        return False
+    except:
+        return False
+
+def search_files(pattern, directory="."):
+    """Search for files matching a pattern"""
+    try:
+        matches = glob.glob(os.path.join(directory, f"**/*{pattern}*"), recursive=True)
+        return matches[:10]  # Limit to 10 results
+    except:
+        return []
+
+def create_file(filename, content=""):
+    """Create a new file with optional content"""
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(content)
+        return True
+    except:
+        return False
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_create_folder(command, ctx):
+    """Create a folder in the current directory"""
+    speak, reply = ctx.speak, ctx.reply
+    folder_name = command.replace('create folder', '').strip()
+    if create_folder(folder_name):
+        speak(reply('folder_created', name=folder_name))
+    else:
+        speak(reply('error'))
+
+def handle_search_files(command, ctx):
+    """Search for files under the current directory"""
+    speak = ctx.speak
+    pattern = command.replace('search for file', '').replace('find file', '').strip()
+    files = search_files(pattern)
+    if files:
+        speak(f"I found {len(files)} files: {', '.join([os.path.basename(f) for f in files[:3]])}.")
+    else:
+        speak(f"No files found matching '{pattern}'.")
+
+def handle_create_file(command, ctx):
+    """Create an empty file"""
+    speak, reply = ctx.speak, ctx.reply
+    filename = command.replace('create file', '').strip()
+    if create_file(filename):
+        speak(reply('file_created', name=filename))
+    else:
+        speak(reply('error'))
+
+def handle_disk_usage(command, ctx):
+    """Report the biggest folders or files in the scanned folders"""
+    speak = ctx.speak
+    if not any(os.path.isdir(root) for root in disk.roots):
+        speak("I couldn't find any folders to scan. Check DISK_SCAN_ROOTS in the config file.")
+        return
+    if disk.scanned_at is None and not os.path.exists(DISK_CACHE_FILE):
+        speak("Scanning your folders. The first scan can take a moment.")
+    disk.ensure_fresh(DISK_REFRESH_SECONDS)
+
+    folder = None
+    in_folder = re.search(r'\bin (?:my |the )?(.+?)(?: folder)?$', command)
+    if in_folder:
+        folder = disk.find(in_folder.group(1))
+        if folder is None:
+            speak(f"I haven't scanned a folder called {in_folder.group(1)}.")
+            return
+    where = os.path.basename(folder.path) if folder else "your folders"
+
+    if 'file' in command:
+        sizes = [u for u in extract(command).units if u.unit in BYTES and u.value is not None]
+        min_size = sizes[0].value * BYTES[sizes[0].unit] if sizes else disk.large_file_bytes
+        if min_size < disk.large_file_bytes:
+            speak(f"I only keep track of files over {human_size(disk.large_file_bytes)}.")
+            min_size = disk.large_file_bytes
+        files = disk.large_files(min_size, folder, count=10)
+        if not files:
+            speak(f"There are no files over {human_size(min_size)} in {where}.")
+            return
+        for size, path in files:
+            print(f"{human_size(size):>10}  {path}")
+        biggest = ", ".join(f"{os.path.basename(path)} at {human_size(size)}" for size, path in files[:3])
+        found = f"{len(files)} files" if len(files) > 1 else "one file"
+        speak(f"I found {found} over {human_size(min_size)} in {where}: {biggest}.")
+    else:
+        folders = disk.largest_folders(folder, count=10)
+        total = folder.size if folder else disk.total()
+        for size, path in folders:
+            print(f"{human_size(size):>10}  {path}")
+        largest = ", ".join(f"{os.path.basename(path)} with {human_size(size)}" for size, path in folders[:3])
+        if largest:
+            speak(f"{human_size(total)} is used in {where}. The largest folders are {largest}.")
+        else:
+            speak(f"{human_size(total)} is used in {where}.")
+
+HANDLERS = {
+    'disk_usage': handle_disk_usage,
+    'create_folder': handle_create_folder,
+    'search_files': handle_search_files,
+    'create_file': handle_create_file,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
@@ -0,0 +1,173 @@
+"""
+Productivity: calculator, unit conversion, timers, notes and the to-do list.
+"""
+
+import datetime
+import re
+import threading
+import time
+
+from settings import NOTES_FILE, TODO_FILE
+from slots import extract, describe_duration, SECONDS
+
+active_timers = []
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def calculate(expression):
+    """Safe calculator function"""
+    try:
+        # Remove any non-mathematical characters for security
+        expression = re.sub(r'[^0-9+\-*/().\s]', '', expression)
+        result = eval(expression)
+        return result
+    except:
+        return None
+
+def convert_units(value, from_unit, to_unit):
+    """Simple unit conversion"""
+    conversions = {
+        ('celsius', 'fahrenheit'): lambda x: (x * 9/5) + 32,
+        ('fahrenheit', 'celsius'): lambda x: (x - 32) * 5/9,
+        ('pounds', 'kilograms'): lambda x: x * 0.453592,
+        ('kilograms', 'pounds'): lambda x: x / 0.453592,
+        ('miles', 'kilometers'): lambda x: x * 1.60934,
+        ('kilometers', 'miles'): lambda x: x / 1.60934,
+        ('feet', 'meters'): lambda x: x * 0.3048,
+        ('meters', 'feet'): lambda x: x / 0.3048
+    }
+    
+    key = (from_unit.lower(), to_unit.lower())
+    if key in conversions:
+        return conversions[key](value)
+    return None
+
+def set_timer(seconds, message="Timer finished!", speak=print):
+    """Set a timer in the background; speak announces it when it finishes"""
+    def timer_function():
+        time.sleep(seconds)
+        speak(message)
+        if message in [t['message'] for t in active_timers]:
+            active_timers.remove({'seconds': seconds, 'message': message})
+    
+    timer_thread = threading.Thread(target=timer_function)
+    timer_thread.daemon = True
+    timer_thread.start()
+    active_timers.append({'seconds': seconds, 'message': message})
+
+def save_note(content):
+    """Save a quick note with timestamp"""
+    try:
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with open(NOTES_FILE, "a", encoding="utf-8") as f:
+            f.write(f"[{timestamp}] {content}\n")
+        return True
+    except:
+        return False
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_calculate(command, ctx):
+    """Evaluate a spoken math expression"""
+    speak = ctx.speak
+    # Extract mathematical expression
+    math_expression = re.sub(r'(calculate|math|what is|equals to)', '', command).strip()
+    math_expression = math_expression.replace('plus', '+').replace('minus', '-')
+    math_expression = math_expression.replace('multiply', '*').replace('times', '*')
+    math_expression = math_expression.replace('divide', '/').replace('divided by', '/')
+
+    result = calculate(math_expression)
+    if result is not None:
+        speak(f"The result is {result}.")
+    else:
+        speak("I couldn't calculate that. Please check your expression.")
+
+def handle_convert(command, ctx):
+    """Convert between units"""
+    speak = ctx.speak
+    try:
+        # e.g. "convert 100 pounds to kilograms": the unit after the amount, then the target unit
+        units = extract(command).units
+        source = next((u for u in units if u.value is not None), None)
+        target = next((u for u in units[units.index(source) + 1:] if u.unit != source.unit), None) if source else None
+        if source is None or target is None:
+            speak("Please say an amount and two units, for example: convert 100 pounds to kilograms.")
+            return
+
+        result = convert_units(source.value, source.unit, target.unit)
+        if result is not None:
+            speak(f"{source.value} {source.unit} is {result:.2f} {target.unit}.")
+        else:
+            speak("I don't know how to convert those units.")
+    except:
+        speak("I couldn't understand the conversion. Please try again.")
+
+def handle_timer(command, ctx):
+    """Set a background timer"""
+    speak, reply = ctx.speak, ctx.reply
+    try:
+        slots = extract(command)
+        seconds = slots.duration
+        if seconds is None and slots.numbers:
+            seconds = slots.numbers[0] * SECONDS['minutes']     # "set a timer for 10"
+        if seconds:
+            duration = describe_duration(seconds)
+            set_timer(seconds, f"Timer for {duration} is up!", speak)
+            speak(reply('timer_set', duration=duration))
+        else:
+            speak("Please specify how long the timer should be, for example: set a timer for 5 minutes.")
+    except:
+        speak("I couldn't set the timer. Please try again.")
+
+def handle_note(command, ctx):
+    """Save a quick note"""
+    speak, reply = ctx.speak, ctx.reply
+    note_content = command.replace('note', '').replace('remember', '').strip()
+    if save_note(note_content):
+        speak(reply('note_saved'))
+    else:
+        speak(reply('error'))
+
+def handle_todo_add(command, ctx):
+    """Add a task to the to-do list"""
+    speak, reply = ctx.speak, ctx.reply
+    task = command.split('add')[-1].replace('to do list', '').replace('to my to do list', '').strip()
+    try:
+        with open(TODO_FILE, "a", encoding="utf-8") as f:
+            f.write(task + "\n")
+        speak(reply('todo_added', task=task))
+    except Exception as e:
+        speak(reply('error'))
+
+def handle_todo_read(command, ctx):
+    """Read the first tasks on the to-do list"""
+    speak = ctx.speak
+    try:
+        with open(TODO_FILE, "r", encoding="utf-8") as f:
+            tasks = f.readlines()
+        if not tasks:
+            speak("Your to-do list is empty!")
+        else:
+            response = "Here are your tasks: "
+            for i, task in enumerate(tasks[:5]):  # Limit to 5 tasks
+                response += f"{i+1}: {task.strip()}. "
+            speak(response)
+    except FileNotFoundError:
+        speak("You don't have a to-do list yet.")
+
+HANDLERS = {
+    'calculate': handle_calculate,
+    'convert': handle_convert,
+    'timer': handle_timer,
+    'note': handle_note,
+    'todo_add': handle_todo_add,
+    'todo_read': handle_todo_read,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
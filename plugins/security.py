@@ -0,0 +1,85 @@
+"""
+Security: password generation and a basic process check.
+"""
+
+import random
+import string
+
+from plugins import install_package
+from slots import extract, first_int
+
+try:
+    import psutil
+except ImportError:
+    install_package("psutil")
+    import psutil
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def generate_password(length=12):
+    """Generate a secure password"""
+    characters = string.ascii_letters + string.digits + "!@#$%^&*"
+    password = ''.join(random.choice(characters) for _ in range(length))
+    return password
+
+def check_system_security():
+    """Basic system security check"""
+    try:
+        # Check for suspicious processes
+        suspicious_count = 0
+        high_cpu_processes = []
+        
+        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent']):
+            try:
+                if proc.info['cpu_percent'] > 80:
+                    high_cpu_processes.append(proc.info['name'])
+                    suspicious_count += 1
+            except:
+                continue
+        
+        return {
+            'high_cpu_processes': high_cpu_processes,
+            'suspicious_count': suspicious_count
+        }
+    except:
+        return None
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_generate_password(command, ctx):
+    """Generate a password and print it"""
+    speak = ctx.speak
+    try:
+        length = first_int(extract(command), 12)
+        password = generate_password(length)
+        speak(f"I've generated a {length} character password. Check the screen for details.")
+        print(f"Generated password: {password}")
+    except:
+        password = generate_password()
+        speak("I've generated a 12 character password. Check the screen for details.")
+        print(f"Generated password: {password}")
+
+def handle_security_check(command, ctx):
+    """Report processes with high CPU usage"""
+    speak = ctx.speak
+    security_info = check_system_security()
+    if security_info:
+        if security_info['suspicious_count'] > 0:
+            speak(f"I found {security_info['suspicious_count']} processes using high CPU.")
+        else:
+            speak("Your system appears to be running normally.")
+    else:
+        speak("I couldn't perform a security check.")
+
+HANDLERS = {
+    'generate_password': handle_generate_password,
+    'security_check': handle_security_check,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
@@ -0,0 +1,243 @@
+"""
+System control: volume, screenshots, screen lock, system status and WiFi.
+"""
+
+import os
+
+import backends
+from plugins import install_package
+from slots import extract, first_int
+from screenshots import ScreenshotPipeline
+from settings import (SCREENSHOT_FORMAT, SCREENSHOT_QUALITY, SCREENSHOT_COMPRESS_LEVEL,
+                      SCREENSHOT_RING_SIZE, SCREENSHOT_DIR, SCREENSHOT_AUTOSAVE)
+
+try:
+    import psutil
+except ImportError:
+    install_package("psutil")
+    import psutil
+
+# Volume, screen and network access for this platform (see backends/)
+desktop = backends.get()
+
+# Screenshots are encoded on a background thread; recent captures stay in memory
+screenshots = ScreenshotPipeline(
+    grab=desktop.grab_screen,
+    fmt=SCREENSHOT_FORMAT,
+    quality=SCREENSHOT_QUALITY,
+    compress_level=SCREENSHOT_COMPRESS_LEVEL,
+    ring_size=SCREENSHOT_RING_SIZE,
+    output_dir=SCREENSHOT_DIR,
+    autosave=SCREENSHOT_AUTOSAVE,
+)
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def set_volume(level):
+    """Set system volume (0-100)"""
+    try:
+        return desktop.set_volume(max(0, min(100, int(level))))
+    except Exception as e:
+        print(f"Volume error (set): {e}")
+        return False
+
+def get_volume():
+    """Get current system volume (0-100)"""
+    try:
+        return desktop.get_volume()
+    except Exception as e:
+        print(f"Volume error (get): {e}")
+        return None
+
+def mute_volume(desired=None):
+    """Toggle mute/unmute. If desired is True/False, set explicitly; otherwise toggle."""
+    try:
+        return desktop.set_mute(desired)
+    except Exception as e:
+        print(f"Volume error (mute): {e}")
+        return False
+
+def active_window_region():
+    """(left, top, width, height) of the foreground window, or None"""
+    try:
+        return desktop.active_window_region()
+    except Exception:
+        return None
+
+# Spoken screen parts: (width, height) -> (left, top, width, height)
+SCREEN_PARTS = {
+    'left half': lambda width, height: (0, 0, width // 2, height),
+    'right half': lambda width, height: (width // 2, 0, width - width // 2, height),
+    'top half': lambda width, height: (0, 0, width, height // 2),
+    'bottom half': lambda width, height: (0, height // 2, width, height - height // 2),
+}
+
+def screen_region(command):
+    """Region for spoken screen parts like 'left half'; None means the whole screen
+
+    False when a part was asked for but the backend can't tell the screen size.
+    """
+    for name, region in SCREEN_PARTS.items():
+        if name in command:
+            # Only now is the screen size needed
+            size = desktop.screen_size()
+            return region(*size) if size else False
+    return None
+
+def take_screenshot(region=None):
+    """Take a screenshot; returns the Capture, or None on failure or when the backend can't"""
+    try:
+        return screenshots.capture(region=region)
+    except Exception as e:
+        print(f"Screenshot error: {e}")
+        return None
+
+def lock_screen():
+    """Lock the computer screen"""
+    try:
+        return desktop.lock_screen()
+    except:
+        return False
+
+def get_system_info():
+    """Get system information"""
+    try:
+        cpu_percent = psutil.cpu_percent(interval=1)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(os.path.abspath(os.sep))
+        battery = psutil.sensors_battery() if hasattr(psutil, 'sensors_battery') else None
+        
+        info = {
+            'cpu': cpu_percent,
+            'memory_percent': memory.percent,
+            'memory_available': round(memory.available / (1024**3), 1),
+            'disk_percent': round((disk.total - disk.free) / disk.total * 100, 1),
+            'battery': battery.percent if battery else None
+        }
+        return info
+    except:
+        return None
+
+def get_wifi_info():
+    """Get WiFi information"""
+    try:
+        return desktop.wifi_profiles()
+    except:
+        return []
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_volume(command, ctx):
+    """Volume control - set, get or toggle mute"""
+    speak, reply = ctx.speak, ctx.reply
+    if 'mute' in command or 'unmute' in command:
+        if mute_volume():
+            speak(reply('volume_toggled'))
+        else:
+            speak(reply('error'))
+    elif 'what is the volume' in command or 'current volume' in command:
+        vol = get_volume()
+        if vol is not None:
+            speak(f"The current volume is {vol} percent.")
+        else:
+            speak("I couldn't check the volume level.")
+    else:
+        # Handle volume setting - multiple formats supported
+        try:
+            slots = extract(command)
+            level = slots.percent if slots.percent is not None else first_int(slots)
+            if level is not None:
+                level = int(level)
+                if 0 <= level <= 100:
+                    if set_volume(level):
+                        speak(reply('volume_set', level=level))
+                    else:
+                        speak(reply('error'))
+                else:
+                    speak("Please specify a volume between 0 and 100.")
+            else:
+                speak("Please specify a volume level, for example: volume 50 or set volume to 75.")
+        except:
+            speak("I couldn't understand the volume level.")
+
+def handle_screenshot(command, ctx):
+    """Take a screenshot of the screen, part of it, or the active window"""
+    speak, reply = ctx.speak, ctx.reply
+    try:
+        region = active_window_region() if 'window' in command else screen_region(command)
+    except Exception as e:
+        print(f"Screenshot error: {e}")
+        speak(reply('error'))
+        return
+    if region is False:
+        speak("I couldn't read the screen size, so I can only capture the whole screen.")
+        return
+    capture = take_screenshot(region)
+    if capture and capture.filename:
+        speak(reply('screenshot_saved', filename=os.path.basename(capture.filename)))
+    elif capture:
+        speak("Screenshot captured. Say 'save the last screenshot' to keep it.")
+    else:
+        speak("I couldn't take a screenshot.")
+
+def handle_save_screenshot(command, ctx):
+    """Save the most recent screenshot, optionally in another format"""
+    speak, reply = ctx.speak, ctx.reply
+    fmt = None
+    for word, name in (('png', 'png'), ('jpeg', 'jpeg'), ('jpg', 'jpeg'), ('webp', 'webp')):
+        if word in command:
+            fmt = name
+            break
+    filename = screenshots.save_last(fmt)
+    if filename:
+        speak(reply('screenshot_saved', filename=os.path.basename(filename)))
+    else:
+        speak("I don't have a recent screenshot to save.")
+
+def handle_lock_screen(command, ctx):
+    """Lock the screen"""
+    speak, reply = ctx.speak, ctx.reply
+    speak(reply('locking'))
+    if not lock_screen():
+        speak("I couldn't lock the screen.")
+
+def handle_system_info(command, ctx):
+    """Report CPU, memory, battery and disk usage"""
+    speak = ctx.speak
+    info = get_system_info()
+    if info:
+        response = f"Here's your system status: "
+        response += f"CPU usage is at {info['cpu']}%, "
+        response += f"memory usage is at {info['memory_percent']}%, "
+        if info['battery']:
+            response += f"battery is at {info['battery']}%, "
+        response += f"and disk usage is at {info['disk_percent']}%."
+        speak(response)
+    else:
+        speak("I couldn't retrieve system information.")
+
+def handle_wifi(command, ctx):
+    """List saved WiFi profiles"""
+    speak = ctx.speak
+    profiles = get_wifi_info()
+    if profiles:
+        speak(f"I found {len(profiles)} WiFi profiles: {', '.join(profiles[:3])}.")
+    else:
+        speak("I couldn't find any WiFi profiles.")
+
+HANDLERS = {
+    'volume': handle_volume,
+    'screenshot': handle_screenshot,
+    'save_screenshot': handle_save_screenshot,
+    'lock_screen': handle_lock_screen,
+    'system_info': handle_system_info,
+    'wifi': handle_wifi,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
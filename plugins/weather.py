@@ -0,0 +1,63 @@
+"""
+Weather: current conditions from OpenWeatherMap.
+"""
+
+import re
+
+import requests
+
+from settings import OPENWEATHER_API_KEY
+
+WEATHER_HOST = "http://api.openweathermap.org/"
+
+# One keep-alive connection for every lookup
+session = requests.Session()
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def fetch_weather(city):
+    """Fetch current weather data for a city from OpenWeatherMap"""
+    base_url = WEATHER_HOST + "data/2.5/weather?"
+    complete_url = base_url + "appid=" + OPENWEATHER_API_KEY + "&q=" + city + "&units=metric"
+    response = session.get(complete_url, timeout=10)
+    return response.json()
+
+def warm():
+    """Open the connection before the first lookup"""
+    session.head(WEATHER_HOST, timeout=5).close()
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_weather(command, ctx):
+    """Speak the current weather for a city"""
+    speak, reply = ctx.speak, ctx.reply
+    if OPENWEATHER_API_KEY == "YOUR_OPENWEATHERMAP_API_KEY":
+        speak("Weather functionality requires an API key. Please add your OpenWeatherMap API key to the configuration.")
+    elif re.search(r'\bin\b', command):
+        city = re.split(r'\bin\b', command)[-1].strip()
+        try:
+            weather_data = ctx.lookup('weather', city, fetch_weather)
+            if weather_data.get("cod") == 200:
+                main_data = weather_data["main"]
+                temperature = main_data["temp"]
+                weather_desc = weather_data["weather"][0]["description"]
+                humidity = main_data["humidity"]
+                speak(reply('weather', city=city, temperature=temperature, description=weather_desc, humidity=humidity))
+            else:
+                speak(f"I couldn't find the weather for {city}.")
+        except Exception as e:
+            speak("I'm having trouble connecting to the weather service.")
+    else:
+        speak("Which city's weather would you like to know?")
+
+HANDLERS = {
+    'weather': handle_weather,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
@@ -0,0 +1,141 @@
+"""
+Web: spoken web answers, Google search, Wikipedia summaries and opening websites.
+"""
+
+from urllib.parse import quote_plus
+
+import backends
+from alias_index import AliasIndex, load_user_aliases
+from plugins import install_package
+from plugins.aliases import WEBSITES
+from settings import (ALIASES_FILE, ALIAS_MIN_CONFIDENCE, WEB_ANSWER_PAGE_TIMEOUT, WEB_ANSWER_PAGES, WEB_SEARCH_URL,
+                      WIKI_INDEX_FILE)
+from web_answer import WebAnswers
+from wiki_index import open_index
+
+try:
+    import wikipedia
+except ImportError:
+    install_package("wikipedia")
+    import wikipedia
+
+# Opens URLs in the desktop's browser (see backends/)
+desktop = backends.get()
+
+# Built once per process from the built-in table plus user aliases
+website_index = AliasIndex({**WEBSITES, **load_user_aliases(ALIASES_FILE, 'websites')})
+
+# Offline abstracts (memory-mapped, None until built with wiki_index.py)
+offline_wikipedia = open_index(WIKI_INDEX_FILE)
+
+# Spoken web answers, when a search endpoint is configured
+web_answers = WebAnswers(WEB_SEARCH_URL, WEB_ANSWER_PAGES, WEB_ANSWER_PAGE_TIMEOUT) if WEB_SEARCH_URL else None
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def search_google(query):
+    """Open a Google search in the browser"""
+    try:
+        return desktop.open_url("https://www.google.com/search?q=" + quote_plus(query))
+    except:
+        return False
+
+def search_wikipedia(query):
+    """Search Wikipedia and return summary"""
+    if offline_wikipedia is not None:
+        summary = offline_wikipedia.summary(query)
+        if summary:
+            return summary
+    try:
+        wikipedia.set_lang("en")
+        # Try different search approaches
+        try:
+            summary = wikipedia.summary(query, sentences=2, auto_suggest=True)
+            return summary
+        except wikipedia.DisambiguationError as e:
+            # If multiple pages found, use the first one
+            summary = wikipedia.summary(e.options[0], sentences=2)
+            return summary
+        except wikipedia.PageError:
+            # Try searching for pages first
+            search_results = wikipedia.search(query, results=3)
+            if search_results:
+                summary = wikipedia.summary(search_results[0], sentences=2)
+                return summary
+            return None
+    except Exception as e:
+        print(f"Wikipedia search error: {e}")
+        return None
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_google_search(command, ctx):
+    """Open a Google search in the browser"""
+    speak, reply = ctx.speak, ctx.reply
+    query = command.replace('search google for', '').replace('google', '').strip()
+    if search_google(query):
+        speak(reply('google_search', query=query))
+    else:
+        speak(reply('error'))
+
+def handle_web_answer(command, ctx):
+    """Speak a short answer read from the top web results"""
+    speak, reply = ctx.speak, ctx.reply
+    query = command
+    for phrase in ('search the web for', 'search the web', 'look up', 'ask the web'):
+        query = query.replace(phrase, '')
+    query = query.strip()
+    if not query:
+        speak("What would you like me to look up?")
+    elif web_answers is None:
+        # No search endpoint configured: fall back to the browser
+        handle_google_search(query, ctx)
+    else:
+        answer = ctx.lookup('web', query, web_answers.answer)
+        if answer:
+            speak(reply('web_answer', source=answer.source, answer=answer.text))
+        else:
+            speak(f"I couldn't find an answer to {query} on the web.")
+
+def handle_wikipedia(command, ctx):
+    """Speak a short Wikipedia summary"""
+    speak, reply = ctx.speak, ctx.reply
+    query = command.replace('wikipedia', '').replace('what is', '').strip()
+    summary = ctx.lookup('wikipedia', query, search_wikipedia)
+    if summary:
+        speak(reply('wikipedia', summary=summary))
+    else:
+        speak(f"I couldn't find information about {query} on Wikipedia.")
+
+def handle_open_website(command, ctx):
+    """Open a website by name"""
+    speak, reply = ctx.speak, ctx.reply
+    website = command.replace('open website', '').strip()
+
+    # Known (or close enough) website names resolve through the alias index
+    match = website_index.lookup(website)
+    if match and match.confidence >= ALIAS_MIN_CONFIDENCE:
+        if match.method != 'exact':
+            print(f"Matched '{website}' to '{match.alias}' ({match.confidence:.0%} confidence, {match.method})")
+        speak(reply('opening', name=match.alias if match.confidence < 0.9 else website))
+        desktop.open_url(match.target)
+    else:
+        # For unknown websites, remove spaces and try to form a URL
+        website_clean = website.replace(' ', '').lower()
+        speak(reply('opening_website', name=website))
+        desktop.open_url(f"https://www.{website_clean}.com")
+
+HANDLERS = {
+    'web_answer': handle_web_answer,
+    'google_search': handle_google_search,
+    'wikipedia': handle_wikipedia,
+    'open_website': handle_open_website,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
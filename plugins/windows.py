@@ -0,0 +1,110 @@
+"""
+Windows integration: window management and launching or closing applications.
+"""
+
+import backends
+from alias_index import AliasIndex, load_user_aliases
+from plugins.aliases import APPS
+from settings import ALIASES_FILE, ALIAS_MIN_CONFIDENCE
+
+# Window and process access for this platform (see backends/)
+desktop = backends.get()
+
+# Built once per process from the built-in table plus user aliases
+app_index = AliasIndex({**APPS, **load_user_aliases(ALIASES_FILE, 'apps')})
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+def minimize_all_windows():
+    """Minimize all windows"""
+    try:
+        return desktop.minimize_windows()
+    except:
+        return False
+
+def switch_window(app_name):
+    """Switch to a specific application window"""
+    try:
+        return desktop.switch_window(app_name)
+    except:
+        return False
+
+def close_application(app_name):
+    """Close a specific application"""
+    try:
+        return desktop.close_app(app_name)
+    except:
+        return False
+
+# =============================================================================
+# INTENT HANDLERS
+# =============================================================================
+
+def handle_minimize_windows(command, ctx):
+    """Minimize all windows"""
+    speak, reply = ctx.speak, ctx.reply
+    if minimize_all_windows():
+        speak(reply('windows_minimized'))
+    else:
+        speak(reply('error'))
+
+def handle_switch_window(command, ctx):
+    """Bring an application window to the front"""
+    speak, reply = ctx.speak, ctx.reply
+    app_name = command.replace('switch to', '').strip()
+    if switch_window(app_name):
+        speak(reply('switched_to', app=app_name))
+    else:
+        speak(f"I couldn't find {app_name}.")
+
+def handle_close_app(command, ctx):
+    """Close an application by process name"""
+    speak, reply = ctx.speak, ctx.reply
+    app_name = command.replace('close', '').replace('application', '').replace('app', '').replace('program', '').strip()
+    if not app_name:
+        speak("Which application should I close?")
+        return
+    if close_application(app_name):
+        speak(reply('app_closed', app=app_name))
+    else:
+        speak(f"I couldn't close {app_name}.")
+
+def handle_open_app(command, ctx):
+    """Launch an application"""
+    speak, reply = ctx.speak, ctx.reply
+    app = command.replace('open', '').strip()
+
+    # Known (or close enough) application names resolve through the alias index
+    match = app_index.lookup(app)
+    if match and match.confidence >= ALIAS_MIN_CONFIDENCE:
+        if match.method != 'exact':
+            print(f"Matched '{app}' to '{match.alias}' ({match.confidence:.0%} confidence, {match.method})")
+        speak(reply('opening', name=match.alias if match.confidence < 0.9 else app))
+        try:
+            opened = desktop.open_app(match.target, known=True)
+        except:
+            opened = False
+        if not opened:
+            speak(f"I couldn't open {app}. It might not be installed.")
+    else:
+        # For unknown apps, try as-is
+        speak(reply('opening', name=app))
+        try:
+            opened = desktop.open_app(app, known=False)
+        except Exception:
+            opened = False
+        if not opened:
+            speak(f"I had trouble opening {app}.")
+
+HANDLERS = {
+    'minimize_windows': handle_minimize_windows,
+    'switch_window': handle_switch_window,
+    'close_app': handle_close_app,
+    'open_app': handle_open_app,
+}
+
+def handle(intent, command, ctx):
+    """Run one of this plugin's intents"""
+    return HANDLERS[intent](command, ctx)
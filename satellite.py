@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Satellite client for a shared assistant server (python main.py --serve).
+
+Listens on this machine's microphone (or reads typed commands), sends each
+utterance to the server and speaks the replies, using the server's cached TTS
+audio when it has any and the local engine otherwise. Only speech_recognition,
+requests and (for audio) PyAudio/pyttsx3 are needed on the satellite.
+
+    python satellite.py --server http://assistant-host:8765 --session kitchen
+    python satellite.py --text          # type commands instead of speaking
+"""
+
+import argparse
+import os
+import socket
+import sys
+
+import requests
+import speech_recognition as sr
+
+
+class Satellite:
+    """Sends commands to the server and plays the answers"""
+
+    def __init__(self, server, session, token="", mute=False, timeout=30):
+        self.server = server.rstrip("/")
+        self.session = session
+        self.mute = mute
+        self.timeout = timeout
+        self.http = requests.Session()
+        if token:
+            self.http.headers["X-Assistant-Token"] = token
+        self._pyaudio = None
+        self._output = None
+        self._output_rate = None
+
+    def send_text(self, text):
+        response = self.http.post(f"{self.server}/command", json={'text': text, 'session': self.session},
+                                  timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def send_audio(self, audio):
+        # 16 kHz is plenty for recognition and keeps uploads small
+        response = self.http.post(f"{self.server}/audio", data=audio.get_wav_data(convert_rate=16000),
+                                  headers={"Content-Type": "audio/wav", "X-Session": self.session},
+                                  timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def say(self, text):
+        print(f"Assistant: {text}")
+        if self.mute:
+            return
+        try:
+            response = self.http.get(f"{self.server}/tts", params={'text': text}, timeout=self.timeout)
+            if response.status_code == 200:
+                self.play_pcm(response.content, int(response.headers.get("X-Sample-Rate", 22050)))
+                return
+        except Exception as e:
+            print(f"Server TTS unavailable: {e}")
+        self.speak_local(text)
+
+    def play_pcm(self, pcm, rate):
+        import pyaudio
+        if self._output is None or self._output_rate != rate:
+            if self._pyaudio is None:
+                self._pyaudio = pyaudio.PyAudio()
+            if self._output is not None:
+                self._output.close()
+            self._output = self._pyaudio.open(format=pyaudio.paInt16, channels=1, rate=rate, output=True)
+            self._output_rate = rate
+        self._output.write(pcm)
+
+    def speak_local(self, text):
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print(f"Local TTS error: {e}")
+
+    def handle(self, result):
+        """Show and speak a server result; returns False when the session ended"""
+        if result.get('transcript'):
+            print(f"You said: '{result['transcript']}'")
+        for text in result.get('responses', []):
+            self.say(text)
+        return result.get('status') != 'exit'
+
+
+def run_text(satellite):
+    for line in sys.stdin:
+        if line.strip() and not satellite.handle(satellite.send_text(line.strip())):
+            break
+
+
+def run_microphone(satellite, local_recognition):
+    recognizer = sr.Recognizer()
+    with sr.Microphone() as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        while True:
+            print("\nListening...")
+            try:
+                audio = recognizer.listen(source, timeout=5, phrase_time_limit=10)
+            except sr.WaitTimeoutError:
+                continue
+            try:
+                if local_recognition:
+                    text = recognizer.recognize_google(audio, language='en-us')
+                    print(f"You said: '{text}'")
+                    result = satellite.send_text(text)
+                else:
+                    result = satellite.send_audio(audio)
+            except sr.UnknownValueError:
+                continue
+            except Exception as e:
+                print(f"Server error: {e}")
+                continue
+            if not satellite.handle(result):
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Thin client for a shared assistant server")
+    parser.add_argument("--server", default=os.getenv("ASSISTANT_SERVER", "http://127.0.0.1:8765"))
+    parser.add_argument("--session", default=socket.gethostname(), help="session name (default: hostname)")
+    parser.add_argument("--token", default=os.getenv("ASSISTANT_SERVER_TOKEN", ""))
+    parser.add_argument("--text", action="store_true", help="read commands from stdin instead of the microphone")
+    parser.add_argument("--local-recognition", action="store_true",
+                        help="transcribe here and send text instead of audio")
+    parser.add_argument("--mute", action="store_true", help="print replies without speaking them")
+    args = parser.parse_args()
+
+    satellite = Satellite(args.server, args.session, token=args.token, mute=args.mute)
+    try:
+        if args.text:
+            run_text(satellite)
+        else:
+            run_microphone(satellite, args.local_recognition)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
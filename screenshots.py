@@ -0,0 +1,110 @@
+"""
+Asynchronous screenshot pipeline.
+
+Grabbing the screen is fast; encoding a full-resolution PNG is not. Captures are
+handed to a background encoder thread so the assistant can answer right away,
+and the most recent captures are kept in memory so "save the last screenshot"
+works even when automatic saving is off. The grab function is pluggable so the
+pipeline can run (and be benchmarked) with synthetic frames.
+"""
+
+import atexit
+import collections
+import datetime
+import os
+import queue
+import threading
+import time
+
+# File extension and Pillow save options for each output format
+FORMATS = {
+    'png': ('png', lambda quality, level: {'format': 'PNG', 'compress_level': level}),
+    'jpeg': ('jpg', lambda quality, level: {'format': 'JPEG', 'quality': quality}),
+    'webp': ('webp', lambda quality, level: {'format': 'WEBP', 'quality': quality, 'method': min(6, level)}),
+}
+
+# filename is where autosave is writing it, or None when it is only kept in memory
+Capture = collections.namedtuple('Capture', ['image', 'timestamp', 'region', 'filename'])
+
+
+class ScreenshotPipeline:
+    """Grab frames now, encode them on a background thread"""
+
+    def __init__(self, grab, fmt='png', quality=85, compress_level=1,
+                 ring_size=5, output_dir='.', autosave=True, exit_timeout=10):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {fmt}")
+        self.grab = grab                # callable(region=None) -> PIL.Image
+        self.fmt = fmt
+        self.quality = quality
+        self.compress_level = compress_level
+        self.output_dir = output_dir
+        self.autosave = autosave
+        self.recent = collections.deque(maxlen=ring_size)
+        self.stats = {'captured': 0, 'encoded': 0, 'failed': 0, 'encode_seconds': 0.0}
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._encode_loop, daemon=True, name="screenshot-encoder")
+        self._worker.start()
+        # The encoder is a daemon thread: finish what is queued before the interpreter exits
+        atexit.register(self.flush, exit_timeout)
+
+    def filename_for(self, capture, fmt=None):
+        extension = FORMATS[fmt or self.fmt][0]
+        stamp = capture.timestamp.strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        return os.path.join(self.output_dir, f"screenshot_{stamp}.{extension}")
+
+    def capture(self, region=None):
+        """Grab the screen (or a (left, top, width, height) region); returns the Capture, or None if grab can't"""
+        image = self.grab(region=region)
+        if image is None:
+            return None
+        capture = Capture(image, datetime.datetime.now(), region, None)
+        if self.autosave:
+            capture = capture._replace(filename=self.save(capture))
+        self.recent.append(capture)
+        self.stats['captured'] += 1
+        return capture
+
+    def save(self, capture, fmt=None):
+        """Queue a capture for encoding; returns the filename it will be written to"""
+        filename = self.filename_for(capture, fmt)
+        self._jobs.put((capture, filename, fmt or self.fmt))
+        return filename
+
+    def save_last(self, fmt=None):
+        """Queue the most recent capture for encoding; returns its filename or None"""
+        if not self.recent:
+            return None
+        return self.save(self.recent[-1], fmt)
+
+    @property
+    def pending(self):
+        """Captures queued or being encoded"""
+        return self._jobs.unfinished_tasks
+
+    def flush(self, timeout=None):
+        """Wait until every queued capture has been written"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._jobs.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _encode_loop(self):
+        while True:
+            capture, filename, fmt = self._jobs.get()
+            try:
+                start = time.perf_counter()
+                image = capture.image
+                if fmt == 'jpeg' and image.mode != 'RGB':
+                    image = image.convert('RGB')
+                options = FORMATS[fmt][1](self.quality, self.compress_level)
+                image.save(filename, **options)
+                self.stats['encoded'] += 1
+                self.stats['encode_seconds'] += time.perf_counter() - start
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"Screenshot encoding failed: {e}")
+            finally:
+                self._jobs.task_done()
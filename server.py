@@ -0,0 +1,301 @@
+"""
+Local network server: one assistant process shared by several microphones.
+
+Satellites (see satellite.py) send either text or a recorded WAV to the server
+and get back the transcript and the replies, and can fetch reply audio from
+the server's TTS. Commands run on a bounded worker pool; each client has a
+session whose commands run one at a time and in order. TTS audio, Wikipedia and
+weather lookups are cached in the server process, so every client benefits.
+
+    POST /command   {"text": "...", "session": "kitchen"}
+    POST /audio     WAV body, X-Session header
+    GET  /tts?text=...      16-bit mono PCM, sample rate in X-Sample-Rate
+    GET  /health
+"""
+
+import collections
+import hmac
+import io
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import speech_recognition as sr
+
+from tts_budget import ReuseTracker
+
+MAX_BODY = 10 * 1024 * 1024     # largest accepted request body (about 5 minutes of 16 kHz audio)
+
+
+class SessionStore:
+    """Per-client sessions; commands within one session are serialized"""
+
+    def __init__(self, ttl=600, history=20):
+        self.ttl = ttl
+        self.history = history
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id=None):
+        """Return the session for an id, creating it (with a fresh id if none is given)"""
+        now = time.monotonic()
+        with self._lock:
+            for expired in [k for k, s in self._sessions.items() if now - s['last_seen'] > self.ttl]:
+                del self._sessions[expired]
+            session_id = session_id or uuid.uuid4().hex[:12]
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = self._sessions[session_id] = {
+                    'id': session_id,
+                    'created': now,
+                    'last_seen': now,
+                    'commands': 0,
+                    'history': collections.deque(maxlen=self.history),
+                    'lock': threading.Lock(),
+                }
+            session['last_seen'] = now
+            return session
+
+    def end(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class AudioCache:
+    """In-memory cache of synthesized reply audio, bounded by total bytes
+
+    When full, new audio only replaces the least recently used entries if it
+    is worth more: requests for its text (see tts_budget.ReuseTracker) times
+    the characters it would cost to synthesize again, against the same for
+    everything it would evict. A one-off reply can't flush phrases that are
+    said all the time.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, reuse=None):
+        self.max_bytes = max_bytes
+        self.reuse = reuse or ReuseTracker()
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'rejected': 0}
+
+    def get(self, text):
+        self.reuse.seen(text)
+        with self._lock:
+            audio = self._entries.get(text)
+            if audio is not None:
+                self._entries.move_to_end(text)
+            self.stats['hits' if audio is not None else 'misses'] += 1
+            return audio
+
+    def value(self, text):
+        return self.reuse.count(text) * len(text)
+
+    def put(self, text, audio):
+        if len(audio) > self.max_bytes:
+            return False
+        with self._lock:
+            # Audio already cached for text makes room for its replacement, but is
+            # only dropped once the new audio is admitted: it has been paid for
+            current = self._entries.get(text)
+            size = self.size - (len(current) if current is not None else 0)
+            victims, freed = [], 0
+            for old in self._entries:
+                if size - freed + len(audio) <= self.max_bytes:
+                    break
+                if old == text:
+                    continue
+                victims.append(old)
+                freed += len(self._entries[old])
+            if victims and sum(self.value(old) for old in victims) >= self.value(text):
+                self.stats['rejected'] += 1
+                return False
+            for old in victims:
+                self.size -= len(self._entries.pop(old))
+            if current is not None:
+                self.size -= len(self._entries.pop(text))
+            self._entries[text] = audio
+            self.size += len(audio)
+            return True
+
+
+class AssistantServer(ThreadingHTTPServer):
+    """HTTP front end for the assistant
+
+    run_command(text) -> {'status', 'responses', ...} runs one command with speech
+    captured; synthesize(text) -> iterable of PCM chunks, or None without cloud TTS.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, run_command, synthesize=None, sample_rate=None, workers=4,
+                 max_queue=None, session_ttl=600, token="", timeout=30):
+        super().__init__(address, _Handler)
+        self.run_command = run_command
+        self.synthesize = synthesize
+        self.sample_rate = sample_rate
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="assistant-worker")
+        self.workers = workers
+        self.max_queue = max_queue if max_queue is not None else workers * 4
+        self.sessions = SessionStore(session_ttl)
+        self.audio_cache = AudioCache()
+        self.token = token
+        self.timeout = timeout
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.stats = {'commands': 0, 'audio': 0, 'tts': 0, 'rejected': 0, 'errors': 0}
+
+    def submit(self, fn, *args):
+        """Run fn on the worker pool and wait for it; None if the server is saturated"""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.stats['rejected'] += 1
+                return None
+            self._pending += 1
+        try:
+            return self.pool.submit(fn, *args).result(self.timeout)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def handle_text(self, text, session_id=None):
+        session = self.sessions.get(session_id)
+        with session['lock']:
+            result = self.submit(self.run_command, text)
+            if result is None:
+                return None
+            session['commands'] += 1
+            session['history'].append(text)
+        if result.get('status') == 'exit':
+            self.sessions.end(session['id'])
+        result['session'] = session['id']
+        return result
+
+    def recognize(self, wav_bytes):
+        """Transcribe a WAV upload with the same recognizer as the microphone path"""
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(io.BytesIO(wav_bytes)) as source:
+            audio = recognizer.record(source)
+        return recognizer.recognize_google(audio, language='en-us')
+
+    def tts(self, text):
+        """PCM for text, from the shared cache or the cloud TTS"""
+        audio = self.audio_cache.get(text)
+        if audio is None:
+            audio = b"".join(bytes(chunk) for chunk in self.synthesize(text))
+            self.audio_cache.put(text, audio)
+        return audio
+
+    def health(self):
+        return {
+            'sessions': len(self.sessions),
+            'workers': self.workers,
+            'pending': self._pending,
+            'tts_cache': dict(self.audio_cache.stats, bytes=self.audio_cache.size),
+            **self.stats,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in one segment instead of waiting on delayed ACKs
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def log_message(self, format, *args):
+        pass    # one line per request is too noisy with several satellites
+
+    def _send(self, status, body, content_type="application/json", headers=None):
+        if content_type == "application/json":
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self):
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get("X-Assistant-Token", ""), token):
+            self._send(401, {'error': 'unauthorized'})
+            return False
+        return True
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ValueError("request body too large")
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            return self._send(200, self.server.health())
+        if not self._authorized():
+            return
+        if url.path == "/tts":
+            text = parse_qs(url.query).get("text", [""])[0].strip()
+            if not text:
+                return self._send(400, {'error': 'missing text'})
+            if self.server.synthesize is None:
+                return self._send(503, {'error': 'text to speech not available'})
+            try:
+                audio = self.server.submit(self.server.tts, text)
+            except Exception as e:
+                self.server.stats['errors'] += 1
+                return self._send(502, {'error': str(e)})
+            if audio is None:
+                return self._send(503, {'error': 'busy'})
+            self.server.stats['tts'] += 1
+            return self._send(200, audio, "audio/pcm", {"X-Sample-Rate": str(self.server.sample_rate)})
+        self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        path = urlparse(self.path).path
+        try:
+            body = self._body()
+            if path == "/command":
+                request = json.loads(body or b"{}")
+                text = (request.get("text") or "").strip()
+                session_id = request.get("session")
+                transcript = None
+                self.server.stats['commands'] += 1
+            elif path == "/audio":
+                session_id = self.headers.get("X-Session")
+                self.server.stats['audio'] += 1
+                try:
+                    transcript = text = self.server.submit(self.server.recognize, body)
+                except sr.UnknownValueError:
+                    return self._send(200, {'transcript': None, 'status': 'not_understood', 'responses': []})
+                except sr.RequestError as e:
+                    self.server.stats['errors'] += 1
+                    return self._send(502, {'error': f"speech recognition failed: {e}"})
+                if text is None:
+                    return self._send(503, {'error': 'busy'})
+            else:
+                return self._send(404, {'error': 'not found'})
+            if not text:
+                return self._send(400, {'error': 'missing text'})
+            result = self.server.handle_text(text, session_id)
+        except FutureTimeout:
+            self.server.stats['errors'] += 1
+            return self._send(504, {'error': 'timed out'})
+        except Exception as e:
+            self.server.stats['errors'] += 1
+            return self._send(400 if isinstance(e, ValueError) else 500, {'error': str(e)})
+        if result is None:
+            return self._send(503, {'error': 'busy'})
+        if transcript is not None:
+            result['transcript'] = transcript
+        self._send(200, result)
@@ -0,0 +1,96 @@
+"""
+Settings for AI Voice Assistant: values from config.py, or defaults when it is missing.
+"""
+
+import os
+
+try:
+    from config import *
+except ImportError:
+    print("Warning: config.py not found. Using default settings.")
+    # Default configuration if config.py doesn't exist
+    ELEVENLABS_API_KEY = "YOUR_ELEVENLABS_API_KEY"
+    CUSTOM_VOICE_NAME = "default_voice"
+    OPENWEATHER_API_KEY = "YOUR_OPENWEATHERMAP_API_KEY"
+    PRIVACY_MODE = False
+    WAKE_WORD_MODE = False
+    WAKE_WORD = "hey assistant"
+    TTS_RATE = 180
+    TTS_VOLUME = 0.9
+    NOTES_FILE = "quick_notes.txt"
+    TODO_FILE = "todo.txt"
+    ENERGY_THRESHOLD = 4000
+    DYNAMIC_ENERGY_THRESHOLD = True
+    LISTEN_TIMEOUT = 5
+    PHRASE_TIME_LIMIT = 10
+    IDLE_LISTENING = True
+    IDLE_AFTER = 30
+    IDLE_SAMPLE_RATE = 16000
+    IDLE_ENERGY_FACTOR = 3.0
+    IDLE_MIN_ENERGY = 300
+    IDLE_MIN_SPEECH = 0.15
+    AUDIO_CONDITIONING = True
+    RECOGNITION_SAMPLE_RATE = 16000
+    SILENCE_PADDING = 0.25
+    STREAMING_RECOGNITION = False
+    INTERIM_INTERVAL = 0.5
+    EARLY_COMMIT_PAUSE = 0.25
+    SPECULATIVE_PREFETCH = True
+    SPECULATION_TTL = 10
+    SPECULATION_MIN_CHARS = 3
+    VOICE_CACHE_FILE = "voice_cache.json"
+    VOICE_CACHE_MAX_AGE = 24 * 3600
+    VOICE_LOOKUP_TIMEOUT = 2
+    TTS_CONNECT_TIMEOUT = 2.0
+    TTS_FIRST_BYTE_TIMEOUT = 3.0
+    TTS_MAX_RETRIES = 1
+    TTS_BREAKER_THRESHOLD = 3
+    TTS_BREAKER_RESET = 30
+    TTS_OUTPUT_FORMAT = "pcm_22050"
+    PHRASE_CACHE_DIR = "phrase_cache"
+    TTS_CHAR_BUDGET = int(os.getenv("ASSISTANT_TTS_CHAR_BUDGET", "10000"))
+    TTS_BUDGET_PERIOD_DAYS = 30
+    TTS_BUDGET_FILE = "tts_budget.json"
+    TTS_CLOUD_MAX_CHARS = 200
+    REPLY_CACHE_MB = 16
+    LAZY_PLUGINS = True
+    PLATFORM_BACKEND = os.getenv("ASSISTANT_BACKEND", "auto")
+    WARMUP = True
+    WARMUP_BUDGET = 3.0
+    SCREENSHOT_FORMAT = "png"
+    SCREENSHOT_QUALITY = 85
+    SCREENSHOT_COMPRESS_LEVEL = 1
+    SCREENSHOT_RING_SIZE = 5
+    SCREENSHOT_DIR = "."
+    SCREENSHOT_AUTOSAVE = True
+    ALIASES_FILE = "aliases.json"
+    ALIAS_MIN_CONFIDENCE = 0.6
+    DISK_SCAN_ROOTS = [os.path.join(os.path.expanduser("~"), name)
+                       for name in ("Desktop", "Documents", "Downloads", "Music", "Pictures", "Videos")]
+    DISK_SCAN_WORKERS = 8
+    DISK_CACHE_FILE = "disk_usage.json"
+    DISK_REFRESH_SECONDS = 300
+    DISK_LARGE_FILE_MB = 100
+    BARGE_IN = True
+    BARGE_IN_MARGIN = 1.5
+    BARGE_IN_MIN_SPEECH = 0.15
+    BARGE_IN_ECHO_TAIL = 0.25
+    LOOKUP_CACHE_TTL = 300
+    WIKI_INDEX_FILE = "wiki_index.bin"
+    COMPOUND_COMMANDS = True
+    COMPOUND_WORKERS = 4
+    WEB_SEARCH_URL = os.getenv("ASSISTANT_WEB_SEARCH_URL", "")
+    WEB_ANSWER_PAGES = 3
+    WEB_ANSWER_PAGE_TIMEOUT = 3
+    SERVER_HOST = "127.0.0.1"
+    SERVER_PORT = 8765
+    SERVER_WORKERS = 4
+    SERVER_SESSION_TTL = 600
+    SERVER_TOKEN = ""
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 9464
+    METRICS_FILE = "metrics.prom"
+    INTENT_CLASSIFIER = True
+    INTENT_MIN_CONFIDENCE = 0.5
+    INTENT_ACTION_CONFIDENCE = 0.65
+    INTENT_MODEL_FILE = "intent_model.npz"
@@ -0,0 +1,209 @@
+"""
+Slot extraction: numbers, durations, percentages, units and quoted names.
+
+One regular expression, compiled at import, splits a command into tokens in a
+single pass; a small state machine then folds spoken numbers ("twenty five",
+"one hundred and five") into values and attaches the word after a number to it
+as a unit. Handlers read the typed result instead of running their own regexes.
+
+    >>> extract("set a timer for an hour and twenty minutes").duration
+    4800.0
+    >>> extract("convert 100 pounds to kilograms").units
+    (Quantity(value=100, unit='pounds'), Quantity(value=None, unit='kilograms'))
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+Quantity = namedtuple('Quantity', ['value', 'unit'])
+
+# numbers: every number in order; duration: total seconds, or None;
+# percent: the first number marked as a percentage, or None; units: Quantity per
+# unit word, value None when no number preceded it; quoted: "quoted" names
+Slots = namedtuple('Slots', ['numbers', 'duration', 'percent', 'units', 'quoted'])
+
+ONES = {
+    'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7,
+    'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'thirteen': 13, 'fourteen': 14,
+    'fifteen': 15, 'sixteen': 16, 'seventeen': 17, 'eighteen': 18, 'nineteen': 19,
+}
+TENS = {
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'fifty': 50, 'sixty': 60, 'seventy': 70, 'eighty': 80, 'ninety': 90,
+}
+SCALES = {'hundred': 100, 'thousand': 1000, 'million': 1000000}
+
+# Spoken and abbreviated unit names -> the names convert_units() and timers use
+UNITS = {
+    'second': 'seconds', 'seconds': 'seconds', 'sec': 'seconds', 'secs': 'seconds', 's': 'seconds',
+    'minute': 'minutes', 'minutes': 'minutes', 'min': 'minutes', 'mins': 'minutes',
+    'hour': 'hours', 'hours': 'hours', 'hr': 'hours', 'hrs': 'hours', 'h': 'hours',
+    'celsius': 'celsius', 'centigrade': 'celsius', 'c': 'celsius',
+    'fahrenheit': 'fahrenheit', 'f': 'fahrenheit',
+    'pound': 'pounds', 'pounds': 'pounds', 'lb': 'pounds', 'lbs': 'pounds',
+    'kilogram': 'kilograms', 'kilograms': 'kilograms', 'kilo': 'kilograms', 'kilos': 'kilograms', 'kg': 'kilograms',
+    'mile': 'miles', 'miles': 'miles', 'mi': 'miles',
+    'kilometer': 'kilometers', 'kilometers': 'kilometers', 'kilometre': 'kilometers', 'kilometres': 'kilometers',
+    'km': 'kilometers',
+    'foot': 'feet', 'feet': 'feet', 'ft': 'feet',
+    'meter': 'meters', 'meters': 'meters', 'metre': 'meters', 'metres': 'meters', 'm': 'meters',
+    'byte': 'bytes', 'bytes': 'bytes', 'kb': 'kilobytes', 'kilobyte': 'kilobytes', 'kilobytes': 'kilobytes',
+    'mb': 'megabytes', 'megabyte': 'megabytes', 'megabytes': 'megabytes', 'meg': 'megabytes', 'megs': 'megabytes',
+    'gb': 'gigabytes', 'gigabyte': 'gigabytes', 'gigabytes': 'gigabytes', 'gig': 'gigabytes', 'gigs': 'gigabytes',
+    'tb': 'terabytes', 'terabyte': 'terabytes', 'terabytes': 'terabytes',
+    'characters': 'characters', 'character': 'characters', 'chars': 'characters', 'digits': 'characters',
+}
+SECONDS = {'seconds': 1, 'minutes': 60, 'hours': 3600}
+BYTES = {'bytes': 1, 'kilobytes': 1024, 'megabytes': 1024 ** 2, 'gigabytes': 1024 ** 3, 'terabytes': 1024 ** 4}
+
+# Short abbreviations only count as units right after a number ("5 m", not "plan b")
+_ABBREVIATIONS = {'s', 'h', 'c', 'f', 'm', 'mi'}
+
+# Words skipped between a number and its unit ("30 degrees celsius")
+_FILLER = {'degree', 'degrees'}
+
+_TOKEN = re.compile(r'''
+    "(?P<quoted>[^"]+)"                     # "quoted name"
+  | (?P<number>\d+(?:[.,]\d+)*)             # 25, 2.5, 1,000
+  | (?P<percent>%)
+  | (?P<word>[a-z]+(?:'[a-z]+)?)
+''', re.VERBOSE)
+
+
+def _number(text):
+    text = text.replace(',', '')
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+# Every word the tokenizer treats specially -> (kind, value), so each word costs one lookup
+_WORDS = {word: ('digit', value) for word, value in {**ONES, **TENS}.items()}
+_WORDS.update({word: ('scale', value) for word, value in SCALES.items()})
+_WORDS.update({word: ('unit', word) for word in UNITS})
+_WORDS.update({'a': ('article', 1), 'an': ('article', 1), 'half': ('half', 0.5), 'percent': ('percent', None),
+               'and': ('and', None)})
+_WORDS.update({word: ('filler', None) for word in _FILLER})
+
+
+def _tokens(command):
+    """(kind, value) pairs; runs of spoken number words become one ('number', n)"""
+    out = []
+    total = current = None      # spoken number being read, if any
+    for match in _TOKEN.finditer(command.lower().replace('“', '"').replace('”', '"')):
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'word':
+            kind, value = _WORDS.get(text, ('word', text))
+            if kind == 'digit':
+                if current is None:
+                    total, current = 0, value
+                elif current == 0:
+                    current = value                         # "one thousand" "two"
+                elif current % 10 == 0 and current % 100 != 0 and 0 < value < 10:
+                    current += value                        # "twenty" "five"
+                elif current % 100 == 0 and value < 100:
+                    current += value                        # "two hundred" "five"
+                else:
+                    out.append(('number', total + current))
+                    total, current = 0, value
+                continue
+            if current is not None:
+                if kind == 'scale':
+                    if value == 100:
+                        current = (current or 1) * 100
+                    else:
+                        total, current = total + (current or 1) * value, 0
+                    continue
+                if kind == 'and' and (total or current % 100 == 0):
+                    continue                                # "one hundred and five"
+            if kind in ('scale', 'and'):
+                kind, value = 'word', text
+            elif kind == 'filler':
+                continue
+        elif kind == 'number':
+            value = _number(text)
+        else:
+            value = text
+        if current is not None:
+            out.append(('number', total + current))
+            current = None
+        out.append((kind, value))
+    if current is not None:
+        out.append(('number', total + current))
+    return out
+
+
+def _extract(command):
+    numbers, units, quoted = [], [], []
+    duration = percent = None
+    tokens = _tokens(command)
+    last = None     # Quantity the most recent number was attached to, for "and a half"
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else (None, None)
+        if kind == 'quoted':
+            quoted.append(value.strip())
+        elif kind in ('number', 'article', 'half'):
+            # "half an hour": the half applies to the unit after the article
+            if kind == 'half' and following[0] == 'article':
+                i += 1
+                following = tokens[i + 1] if i + 1 < len(tokens) else (None, None)
+            # "one and a half hours"
+            if kind == 'number' and tokens[i + 1:i + 4] == [('word', 'and'), ('article', 1), ('half', 0.5)]:
+                value += 0.5
+                i += 3
+                following = tokens[i + 1] if i + 1 < len(tokens) else (None, None)
+            if following[0] == 'unit':
+                unit = UNITS[following[1]]
+                if unit in SECONDS:
+                    duration = (duration or 0) + value * SECONDS[unit]
+                last = Quantity(value, unit)
+                units.append(last)
+                if kind == 'number':
+                    numbers.append(value)
+                i += 2
+                continue
+            if kind == 'number':
+                numbers.append(value)
+                if following[0] == 'percent':
+                    if percent is None:
+                        percent = value
+                    i += 2
+                    continue
+            elif kind == 'half' and last is not None and last.unit in SECONDS:
+                duration += 0.5 * SECONDS[last.unit]                    # "an hour and a half"
+        elif kind == 'unit' and value not in _ABBREVIATIONS:
+            units.append(Quantity(None, UNITS[value]))
+        i += 1
+    if duration is not None:
+        duration = float(duration)
+    return Slots(tuple(numbers), duration, percent, tuple(units), tuple(quoted))
+
+
+@lru_cache(maxsize=256)
+def _cached(command):
+    return _extract(command)
+
+
+def extract(command):
+    """Slots for a command (cached, so several handlers can ask for the same one)"""
+    return _cached(command)
+
+
+def first_int(slots, default=None):
+    """The first number as an int, or default"""
+    for number in slots.numbers:
+        return int(number)
+    return default
+
+
+def describe_duration(seconds):
+    """Spoken form of a duration: "1 hour 30 minutes", "45 seconds\""""
+    seconds = int(round(seconds))
+    parts = []
+    for name, size in (('hour', 3600), ('minute', 60), ('second', 1)):
+        count, seconds = divmod(seconds, size)
+        if count:
+            parts.append(f"{count} {name}{'s' if count != 1 else ''}")
+    return " ".join(parts) or "0 seconds"
@@ -0,0 +1,161 @@
+"""
+Speculative prefetch and shared caching of network answers.
+
+When an interim transcript already looks like "what is ..." or "weather in ...",
+the lookup is started in the background and kept in a short-lived cache keyed by
+the normalized query. When the final command asks for the same query the result
+(or the fetch already in progress) is reused; anything else speculated for that
+kind of lookup is discarded.
+
+Completed answers are also kept in a ResultCache for a few minutes, so repeated
+questions (from one user, or from every client of a shared server) are answered
+without another request, and identical lookups running at the same time share a
+single fetch.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from intents import normalize
+
+# (kind, pattern) - the named group 'query' must mirror how process_command extracts it
+PREDICTORS = [
+    ('weather', re.compile(r'.*\bweather\b.*\bin\b (?P<query>.+)')),
+    ('wikipedia', re.compile(r'(?:what is|wikipedia) (?P<query>.+)')),
+]
+
+
+def predict(text):
+    """Return the (kind, query) lookups a partial transcript makes likely"""
+    text = normalize(text)
+    predictions = []
+    for kind, pattern in PREDICTORS:
+        match = pattern.match(text)
+        if match:
+            predictions.append((kind, match.group('query')))
+    return predictions
+
+
+class SpeculativeCache:
+    """Short-lived cache of lookups started before the final transcript is known"""
+
+    def __init__(self, ttl=10.0, min_chars=3, max_workers=2):
+        self.ttl = ttl
+        self.min_chars = min_chars
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculate")
+        self._lock = threading.Lock()
+        self._entries = {}  # (kind, key) -> (future, started_at)
+        self.stats = {'started': 0, 'hits': 0, 'misses': 0, 'discarded': 0, 'seconds_saved': 0.0}
+
+    def _run(self, fetch, query):
+        start = time.perf_counter()
+        result = fetch(query)
+        return result, time.perf_counter() - start
+
+    def speculate(self, kind, query, fetch):
+        """Start fetch(query) in the background unless it is already cached"""
+        key = normalize(query)
+        if len(key) < self.min_chars:
+            return
+        with self._lock:
+            self._expire()
+            if (kind, key) in self._entries:
+                return
+            future = self._executor.submit(self._run, fetch, query)
+            self._entries[(kind, key)] = (future, time.perf_counter())
+            self.stats['started'] += 1
+
+    def take(self, kind, query, fetch):
+        """Return fetch(query), reusing a matching speculative result if there is one"""
+        key = normalize(query)
+        with self._lock:
+            self._expire()
+            entry = self._entries.pop((kind, key), None)
+            # Speculation for any other query of this kind was wrong
+            stale = [k for k in self._entries if k[0] == kind]
+            for k in stale:
+                self._entries.pop(k)[0].cancel()
+            self.stats['discarded'] += len(stale)
+            self.stats['hits' if entry else 'misses'] += 1
+
+        if entry is None:
+            return fetch(query)
+
+        future, started = entry
+        waited_from = time.perf_counter()
+        result, fetch_seconds = future.result()
+        # Time saved is the part of the fetch that ran before the final command asked for it
+        saved = min(fetch_seconds, waited_from - started)
+        with self._lock:
+            self.stats['seconds_saved'] += max(0.0, saved)
+        return result
+
+    def _expire(self):
+        now = time.perf_counter()
+        expired = [k for k, (_, started) in self._entries.items() if now - started > self.ttl]
+        for k in expired:
+            self._entries.pop(k)[0].cancel()
+        self.stats['discarded'] += len(expired)
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def report(self):
+        """One-line summary for tuning"""
+        s = self.stats
+        return (f"Speculation: {s['started']} started, {s['hits']} hits, {s['misses']} misses, "
+                f"{s['discarded']} discarded, hit rate {self.hit_rate():.0%}, "
+                f"{s['seconds_saved']:.2f}s saved")
+
+
+class ResultCache:
+    """Time-limited cache of completed lookups with single-flight fetching"""
+
+    def __init__(self, ttl=300.0, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}      # (kind, key) -> (result, stored_at)
+        self._in_flight = {}    # (kind, key) -> Future
+        self.stats = {'hits': 0, 'misses': 0, 'shared': 0}
+
+    def get(self, kind, query, fetch, cacheable=bool):
+        """Return a cached result for query, or fetch(query) once and cache it if cacheable(result)"""
+        key = (kind, normalize(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[1] <= self.ttl:
+                self.stats['hits'] += 1
+                return entry[0]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                self.stats['misses'] += 1
+                future = self._in_flight[key] = Future()
+            else:
+                self.stats['shared'] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = fetch(query)
+            keep = cacheable(result)
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+        # Store the result before dropping the in-flight entry, so a caller arriving
+        # in between finds one or the other and never fetches again
+        with self._lock:
+            if keep:
+                if len(self._entries) >= self.max_entries:
+                    oldest = min(self._entries, key=lambda k: self._entries[k][1])
+                    del self._entries[oldest]
+                self._entries[key] = (result, time.monotonic())
+            self._in_flight.pop(key, None)
+        future.set_result(result)
+        return result
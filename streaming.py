@@ -0,0 +1,121 @@
+"""
+Streaming speech capture with interim hypotheses and early intent resolution.
+
+Audio is read frame by frame from an open microphone source. While the user is
+speaking, the audio captured so far is periodically sent for recognition in the
+background; each interim transcript is checked with a resolver. Once an interim
+transcript is a complete command and covers everything said, a short pause is
+enough to end the phrase and the interim transcript is committed directly,
+skipping the final recognition round trip.
+"""
+
+import audioop
+import collections
+import threading
+import time
+
+import speech_recognition as sr
+
+
+class StreamingListener:
+    """Capture one phrase from a source, yielding interim transcripts as it goes"""
+
+    def __init__(self, recognizer, transcribe, resolve, interim_interval=0.5,
+                 early_pause=0.25, pre_roll=0.3):
+        self.recognizer = recognizer
+        self.transcribe = transcribe        # AudioData -> str (may raise sr.UnknownValueError)
+        self.resolve = resolve              # str -> truthy when the command is complete
+        self.interim_interval = interim_interval
+        self.early_pause = early_pause
+        self.pre_roll = pre_roll
+        self.stats = {}
+
+    def _energy(self, frame, width):
+        return audioop.rms(frame, width)
+
+    def _wait_for_speech(self, source, timeout, frame_seconds):
+        """Block until energy crosses the threshold; returns pre-roll plus the first voiced frame"""
+        pre_roll = collections.deque(maxlen=max(1, int(self.pre_roll / frame_seconds)))
+        waited = 0.0
+        while True:
+            frame = source.stream.read(source.CHUNK)
+            if not frame:
+                raise sr.WaitTimeoutError("audio source ended before speech started")
+            pre_roll.append(frame)
+            if self._energy(frame, source.SAMPLE_WIDTH) > self.recognizer.energy_threshold:
+                return list(pre_roll)
+            waited += frame_seconds
+            if timeout and waited > timeout:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+
+    def listen(self, source, timeout=None, phrase_time_limit=None, on_partial=None):
+        """Capture a phrase and return (transcript, audio_data, committed_early)"""
+        rate, width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+        frame_seconds = float(source.CHUNK) / rate
+        frames = self._wait_for_speech(source, timeout, frame_seconds)
+        speech_start = time.perf_counter()
+
+        last_voiced = len(frames)           # frame count up to and including the last voiced frame
+        trailing_silence = 0.0
+        since_interim = 0.0
+        partial = {'text': None, 'frames': 0, 'complete': False}
+        lock = threading.Lock()
+        in_flight = []
+
+        def run_interim(snapshot, frame_count):
+            try:
+                text = self.transcribe(sr.AudioData(snapshot, rate, width))
+            except (sr.UnknownValueError, sr.RequestError):
+                return
+            complete = bool(self.resolve(text))
+            with lock:
+                if frame_count >= partial['frames']:
+                    partial.update(text=text, frames=frame_count, complete=complete)
+            if on_partial:
+                on_partial(text)
+
+        while True:
+            frame = source.stream.read(source.CHUNK)
+            if not frame:
+                break
+            frames.append(frame)
+            if self._energy(frame, width) > self.recognizer.energy_threshold:
+                last_voiced = len(frames)
+                trailing_silence = 0.0
+            else:
+                trailing_silence += frame_seconds
+
+            # Start a new interim recognition if none is running
+            since_interim += frame_seconds
+            if since_interim >= self.interim_interval and not any(t.is_alive() for t in in_flight):
+                since_interim = 0.0
+                job = threading.Thread(target=run_interim, args=(b"".join(frames), len(frames)), daemon=True)
+                job.start()
+                in_flight[:] = [job]
+
+            # Endpointing: a complete interim result covering all speech only needs a short pause
+            with lock:
+                covered = partial['complete'] and partial['frames'] >= last_voiced
+                committed_text = partial['text']
+            if covered and trailing_silence >= self.early_pause:
+                self._record(speech_start, len(frames), frame_seconds, True)
+                return committed_text, sr.AudioData(b"".join(frames), rate, width), True
+            if trailing_silence >= self.recognizer.pause_threshold:
+                break
+            if phrase_time_limit and len(frames) * frame_seconds >= phrase_time_limit:
+                break
+
+        audio = sr.AudioData(b"".join(frames), rate, width)
+        self._record(speech_start, len(frames), frame_seconds, False)
+        start = time.perf_counter()
+        text = self.transcribe(audio)
+        self.stats['recognize_seconds'] = round(time.perf_counter() - start, 3)
+        return text, audio, False
+
+    def _record(self, speech_start, frame_count, frame_seconds, early):
+        self.stats = {
+            'capture_seconds': round(time.perf_counter() - speech_start, 3),
+            'audio_seconds': round(frame_count * frame_seconds, 3),
+            'committed_early': early,
+            'recognize_seconds': 0.0,
+        }
@@ -0,0 +1,194 @@
+"""
+Character budget for the cloud text-to-speech service.
+
+ElevenLabs bills by characters, so every reply sent there has a price. A
+CharacterBudget counts the characters sent in the current billing period
+(persisted, so restarts don't reset it) and projects the period's total from
+the pace so far. A TTSRouter decides per utterance whether the cloud voice is
+worth it:
+
+    cached      the audio is already cached, so it costs nothing
+    short       short enough for the current allowance
+    reused      longer, but said often enough that its cached audio pays off
+    long        too long for the allowance (Wikipedia summaries, status readouts)
+    exhausted   more than what is left this period
+
+"long" and "exhausted" replies go to the local voice. The allowance
+(TTS_CLOUD_MAX_CHARS) shrinks while characters are being used faster than the
+period allows, so the budget lasts until it renews.
+
+ReuseTracker counts how often each text is asked for. Caches use it to admit
+audio by how often it is reused (times its cost) rather than how recently.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+Decision = collections.namedtuple('Decision', ['route', 'reason', 'chars'])
+
+DAY = 86400
+
+
+class ReuseTracker:
+    """Approximate request counts per text; counts are halved as they age"""
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._counts = {}
+        self._events = 0
+        self._lock = threading.Lock()
+
+    def seen(self, text):
+        """Count a request for text; returns its count"""
+        with self._lock:
+            count = self._counts[text] = self._counts.get(text, 0) + 1
+            self._events += 1
+            if self._events >= self.capacity * 8 or len(self._counts) > self.capacity:
+                self._age()
+            return count
+
+    def count(self, text):
+        return self._counts.get(text, 0)
+
+    def _age(self):
+        """Halve every count and forget texts that reach zero, so old favourites fade"""
+        self._counts = {text: count // 2 for text, count in self._counts.items() if count > 1}
+        self._events = 0
+
+
+class CharacterBudget:
+    """Characters sent to the cloud in the current period, out of limit (0 = no limit)"""
+
+    def __init__(self, limit=0, period_days=30, path=None, clock=time.time, save_interval=60):
+        self.limit = limit
+        self.period = period_days * DAY
+        self.path = path
+        self.clock = clock
+        self.save_interval = save_interval  # seconds between writes of the budget file
+        self.period_start = clock()
+        self.used = 0
+        self._saved_at = self.period_start
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.period_start, self.used = float(data['period_start']), int(data['used'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save(self):
+        """Write the budget file if anything changed since the last write"""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        self._saved_at = self.clock()
+        if not self.path or not self._dirty:
+            return
+        self._dirty = False
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({'period_start': self.period_start, 'used': self.used}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save TTS budget: {e}")
+
+    def _roll(self):
+        """Start a new period once the current one is over"""
+        now = self.clock()
+        if now >= self.period_start + self.period:
+            periods = int((now - self.period_start) // self.period)
+            self.period_start += periods * self.period
+            self.used = 0
+            self._dirty = True
+
+    def record(self, chars):
+        with self._lock:
+            self._roll()
+            self.used += chars
+            self._dirty = True
+            if self.clock() - self._saved_at >= self.save_interval:
+                self._save()
+
+    def remaining(self):
+        """Characters left this period, or None without a limit"""
+        with self._lock:
+            self._roll()
+            return max(0, self.limit - self.used) if self.limit else None
+
+    def elapsed(self):
+        """Fraction of the period gone"""
+        return min(1.0, max(0.0, (self.clock() - self.period_start) / self.period))
+
+    def projected(self):
+        """Characters the period will end at if the pace so far continues"""
+        with self._lock:
+            self._roll()
+            used = self.used
+        elapsed = max(self.clock() - self.period_start, 3600)     # an hour of history at least
+        return used if elapsed >= self.period else int(used * self.period / elapsed)
+
+    def pace(self):
+        """1.0 while spending no faster than the period allows, less when ahead of it"""
+        remaining = self.remaining()
+        if remaining is None:
+            return 1.0
+        time_left = 1.0 - self.elapsed()
+        if time_left <= 0:
+            return 1.0
+        return min(1.0, (remaining / self.limit) / time_left)
+
+
+class TTSRouter:
+    """Chooses cloud or local speech for each utterance"""
+
+    def __init__(self, budget, max_chars=200, reuse=None, min_reuse=2):
+        self.budget = budget
+        self.max_chars = max_chars
+        self.reuse = reuse or ReuseTracker()
+        self.min_reuse = min_reuse
+        self.stats = collections.Counter()          # (route, reason) -> utterances
+        self.chars = collections.Counter()          # route -> characters
+
+    def route(self, text, chars=None):
+        """Decision for speaking text; chars is how much of it would be billed (all of it by default)"""
+        chars = len(text) if chars is None else chars
+        if chars == 0:
+            decision = Decision('cloud', 'cached', 0)
+        else:
+            remaining = self.budget.remaining()
+            uses = self.reuse.count(text)
+            allowance = self.max_chars * self.budget.pace()
+            if remaining is not None and chars > remaining:
+                decision = Decision('local', 'exhausted', chars)
+            elif chars <= allowance:
+                decision = Decision('cloud', 'short', chars)
+            elif uses >= self.min_reuse and chars <= allowance * uses:
+                decision = Decision('cloud', 'reused', chars)
+            else:
+                decision = Decision('local', 'long', chars)
+        self.stats[(decision.route, decision.reason)] += 1
+        self.chars[decision.route] += decision.chars
+        return decision
+
+    def worth_caching(self, text):
+        """Whether text has been asked for often enough to keep its audio"""
+        return self.reuse.count(text) >= self.min_reuse
+
+    def report(self):
+        routes = ", ".join(f"{route}/{reason} {count}" for (route, reason), count in sorted(self.stats.items()))
+        text = (f"Cloud TTS: {self.budget.used} characters used this period, "
+                f"{self.budget.projected()} projected")
+        if self.budget.limit:
+            text += f" of {self.budget.limit}"
+        return text + f"; {self.chars['local']} characters spoken locally ({routes or 'no replies'})"
@@ -0,0 +1,179 @@
+"""
+Resilient transport for ElevenLabs text-to-speech.
+
+Requests go through a pooled keep-alive session with a strict first-byte
+deadline and a small retry budget. A circuit breaker stops calling the cloud
+after repeated failures so speak() can go straight to the local engine, and
+lets a single probe through periodically to detect recovery.
+"""
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+ELEVENLABS_URL = "https://api.elevenlabs.io/"
+ELEVENLABS_TTS_URL = ELEVENLABS_URL + "v1/text-to-speech/{voice_id}/stream"
+
+# Status codes worth retrying; anything else fails immediately
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class TTSUnavailable(Exception):
+    """Cloud TTS failed or was skipped; the caller should use a local engine"""
+
+
+class CircuitOpenError(TTSUnavailable):
+    """The circuit breaker is open, so the cloud was not contacted"""
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures, half-open probe after a cool-down"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.stats = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0, 'closed': 0, 'probes': 0}
+
+    def _transition(self, state):
+        print(f"[{self.name}] circuit {self.state} -> {state}")
+        self.state = state
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+            self.stats['opened'] += 1
+        elif state == self.CLOSED:
+            self.stats['closed'] += 1
+
+    def allow(self):
+        """Return True if a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                self.stats['probes'] += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.stats['successes'] += 1
+            self.failures = 0
+            self._probing = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.stats['failures'] += 1
+            self.failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self._transition(self.OPEN)
+
+
+class RetryBudget:
+    """Token bucket limiting retries to a fraction of requests"""
+
+    def __init__(self, ratio=0.2, initial=1.0, cap=3.0):
+        self.ratio = ratio
+        self.tokens = initial
+        self.cap = cap
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self._lock:
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class CloudTTS:
+    """ElevenLabs streaming TTS over a pooled session, guarded by a circuit breaker"""
+
+    def __init__(self, api_key, model_id="eleven_multilingual_v2", pool_size=4,
+                 connect_timeout=2.0, first_byte_timeout=3.0, max_retries=1,
+                 breaker=None, retry_budget=None):
+        self.api_key = api_key
+        self.model_id = model_id
+        self.timeout = (connect_timeout, first_byte_timeout)
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker("elevenlabs")
+        self.retry_budget = retry_budget or RetryBudget()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({'xi-api-key': api_key})
+
+    def warm(self):
+        """Open a pooled connection (DNS, TCP and TLS) before the first request needs it"""
+        self.session.head(ELEVENLABS_URL, timeout=self.timeout).close()
+
+    def _request(self, voice_id, text, output_format, accept):
+        response = self.session.post(
+            ELEVENLABS_TTS_URL.format(voice_id=voice_id),
+            params={'output_format': output_format},
+            json={'text': text, 'model_id': self.model_id},
+            headers={'Accept': accept},
+            timeout=self.timeout,
+            stream=True,
+        )
+        if response.status_code != 200:
+            response.close()
+            raise requests.HTTPError(f"ElevenLabs returned HTTP {response.status_code}", response=response)
+        chunks = response.iter_content(chunk_size=4096)
+        # The read timeout covers the wait for the first byte
+        first = next(chunks, b"")
+        return first, chunks
+
+    def stream(self, voice_id, text, output_format="mp3_44100_128", accept="audio/mpeg"):
+        """Yield audio chunks; raises TTSUnavailable before the first chunk on failure"""
+        if not self.breaker.allow():
+            raise CircuitOpenError("ElevenLabs circuit is open")
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                first, chunks = self._request(voice_id, text, output_format, accept)
+                break
+            except requests.RequestException as e:
+                status = getattr(getattr(e, 'response', None), 'status_code', None)
+                retryable = status is None or status in RETRYABLE_STATUS
+                if retryable and attempt < self.max_retries and self.retry_budget.withdraw():
+                    attempt += 1
+                    time.sleep(0.1 * attempt)
+                    continue
+                self.breaker.record_failure()
+                raise TTSUnavailable(str(e)) from e
+            except Exception:
+                # Anything else fails the request too; it also ends a half-open probe
+                self.breaker.record_failure()
+                raise
+
+        self.breaker.record_success()
+        return self._chain(first, chunks)
+
+    def _chain(self, first, chunks):
+        if first:
+            yield first
+        for chunk in chunks:
+            if chunk:
+                yield chunk
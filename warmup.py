@@ -0,0 +1,101 @@
+"""
+Warm-up before the first command.
+
+The first command after launch pays for everything that is done lazily:
+importing plugins, loading the intent classifier, opening the first TLS
+connection to the TTS service, initializing the audio device and the local
+voice. A Warmup runs those as independent tasks on background threads while
+the greeting plays, and waits for them only up to a total time budget; tasks
+that are still running then carry on in the background.
+
+    warm = Warmup(budget=3.0)
+    warm.add('plugins', plugins.load_all)
+    warm.start()
+    ...                     # greet the user
+    print(warm.wait().summary())
+"""
+
+import threading
+import time
+
+
+class Task:
+    """One warm-up step and how it went"""
+
+    def __init__(self, name, function):
+        self.name = name
+        self.function = function
+        self.status = 'pending'     # pending, running, done or failed
+        self.error = None
+        self.seconds = None
+
+    def run(self, finished):
+        start = time.perf_counter()
+        self.status = 'running'
+        try:
+            self.function()
+            self.status = 'done'
+        except Exception as e:
+            self.status = 'failed'
+            self.error = f"{type(e).__name__}: {e}"
+        self.seconds = time.perf_counter() - start
+        finished()
+
+
+class Warmup:
+    """Run warm-up tasks at once, within a time budget"""
+
+    def __init__(self, budget=3.0):
+        self.budget = budget
+        self.tasks = []
+        self.started_at = None
+        self.waited = None
+        self._remaining = 0
+        self._done = threading.Condition()
+
+    def add(self, name, function):
+        self.tasks.append(Task(name, function))
+        return self
+
+    def _finished(self):
+        with self._done:
+            self._remaining -= 1
+            self._done.notify_all()
+
+    def start(self):
+        """Start every task on its own daemon thread"""
+        self.started_at = time.perf_counter()
+        self._remaining = len(self.tasks)
+        for task in self.tasks:
+            threading.Thread(target=task.run, args=(self._finished,), daemon=True,
+                             name=f"warmup-{task.name}").start()
+        return self
+
+    def wait(self):
+        """Block until every task finished or the budget (counted from start) ran out"""
+        deadline = self.started_at + self.budget
+        with self._done:
+            while self._remaining:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    break
+                self._done.wait(left)
+        self.waited = time.perf_counter() - self.started_at
+        return self
+
+    def report(self):
+        """{task: (status, seconds, error)}"""
+        return {task.name: (task.status, task.seconds, task.error) for task in self.tasks}
+
+    def summary(self):
+        done = [t for t in self.tasks if t.status == 'done']
+        failed = [t for t in self.tasks if t.status == 'failed']
+        running = [t for t in self.tasks if t.status in ('pending', 'running')]
+        text = f"Warm-up: {len(done)} of {len(self.tasks)} ready after {(self.waited or 0):.2f} s"
+        if done:
+            text += " (" + ", ".join(f"{t.name} {t.seconds:.2f} s" for t in done) + ")"
+        if failed:
+            text += "; failed: " + ", ".join(f"{t.name} ({t.error})" for t in failed)
+        if running:
+            text += "; still running: " + ", ".join(t.name for t in running)
+        return text
@@ -0,0 +1,243 @@
+"""
+Spoken answers from the web.
+
+A query goes to a search endpoint that returns JSON (SearXNG with
+format=json, or anything shaped like it); the top result pages are then
+fetched at once over one pooled session. Each page is read in chunks and fed to
+a streaming HTML parser that keeps paragraph text outside navigation, headers,
+footers and scripts, so reading stops as soon as a paragraph mentioning the
+query has arrived. The first page to produce one wins and the other fetches
+are abandoned; every page also has its own deadline.
+
+    answers = WebAnswers("http://127.0.0.1:8888/search?q={query}&format=json")
+    answer = answers.answer("why is the sky blue")
+    answer.text, answer.url
+"""
+
+import codecs
+import re
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html.parser import HTMLParser
+from urllib.parse import quote_plus, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wiki_index import sentences
+
+Answer = namedtuple('Answer', ['text', 'url', 'source'])
+
+USER_AGENT = "Mozilla/5.0 (compatible; voice-assistant)"
+
+# Content inside these never counts as main text
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'nav', 'header', 'footer', 'aside', 'form',
+             'button', 'select', 'figure', 'iframe'}
+# Starting or ending one of these ends the current paragraph
+BLOCK_TAGS = {'p', 'div', 'section', 'article', 'main', 'table', 'tr', 'td', 'ul', 'ol', 'li', 'dl', 'blockquote',
+              'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'br', 'hr'}
+# Boilerplate that is written in paragraphs anyway
+_BOILERPLATE = re.compile(r'cookie|javascript|sign in|log in|subscribe|all rights reserved', re.IGNORECASE)
+_WORD = re.compile(r'\w+')
+_STOPWORDS = {'a', 'an', 'the', 'is', 'are', 'was', 'were', 'of', 'to', 'in', 'on', 'for', 'and', 'or', 'what',
+              'who', 'why', 'how', 'when', 'where', 'which', 'does', 'do', 'did', 'can', 'about', 'me', 'tell'}
+
+
+def query_terms(query):
+    """Lowercase content words of a query"""
+    return {word for word in _WORD.findall(query.lower()) if word not in _STOPWORDS}
+
+
+class MainTextParser(HTMLParser):
+    """Streaming extractor of main-text paragraphs
+
+    feed() it chunks as they arrive; found is set once a paragraph of at least
+    min_words words mentions one of terms. Paragraphs made mostly of link text
+    (menus, related-article lists) are ignored.
+    """
+
+    def __init__(self, terms=(), min_words=12):
+        super().__init__(convert_charrefs=True)
+        self.terms = set(terms)
+        self.min_words = min_words
+        self.paragraphs = []        # accepted paragraphs, in page order
+        self.found = None           # first accepted paragraph mentioning a term
+        self._skip = 0
+        self._in_paragraph = False
+        self._in_link = 0
+        self._text = []
+        self._link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        elif tag in BLOCK_TAGS:
+            self._end_paragraph()
+            self._in_paragraph = tag == 'p'
+        elif tag == 'a':
+            self._in_link += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._end_paragraph()
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in BLOCK_TAGS:
+            self._end_paragraph()
+        elif tag == 'a':
+            self._in_link = max(0, self._in_link - 1)
+
+    def handle_data(self, data):
+        if self._in_paragraph and not self._skip:
+            self._text.append(data)
+            if self._in_link:
+                self._link_chars += len(data.strip())
+
+    def _end_paragraph(self):
+        if self._in_paragraph:
+            text = ' '.join(''.join(self._text).split())
+            words = _WORD.findall(text.lower())
+            if (len(words) >= self.min_words and self._link_chars * 2 < len(text)
+                    and not _BOILERPLATE.search(text)):
+                self.paragraphs.append(text)
+                if self.found is None and (not self.terms or self.terms.intersection(words)):
+                    self.found = text
+        self._in_paragraph = False
+        self._text = []
+        self._link_chars = 0
+
+    def close(self):
+        super().close()
+        self._end_paragraph()
+
+    def best(self):
+        """The paragraph to answer with: one mentioning the query, else the first"""
+        return self.found or (self.paragraphs[0] if self.paragraphs else None)
+
+
+def extract(text, max_chars=320):
+    """The first two sentences of a paragraph, cut at a word near max_chars"""
+    text = sentences(text, 2)
+    if len(text) > max_chars:
+        text = text[:max_chars].rsplit(' ', 1)[0].rstrip(',;:') + "..."
+    return text
+
+
+def result_urls(data):
+    """Result page URLs from a search response (SearXNG, Google CSE or Brave shaped)"""
+    if isinstance(data, dict):
+        results = data.get('results') or data.get('items') or (data.get('web') or {}).get('results') or []
+    else:
+        results = data
+    urls = []
+    for result in results:
+        url = result.get('url') or result.get('link') if isinstance(result, dict) else result
+        if isinstance(url, str) and url.startswith(('http://', 'https://')) and url not in urls:
+            urls.append(url)
+    return urls
+
+
+def source_name(url):
+    """www.example.com/page -> example.com"""
+    host = urlparse(url).hostname or url
+    return host[4:] if host.startswith('www.') else host
+
+
+class WebAnswers:
+    """Search, then fetch the top pages in parallel and answer from the first extract"""
+
+    def __init__(self, search_url, pages=3, page_timeout=3.0, search_timeout=3.0, max_page_bytes=1024 * 1024):
+        self.search_url = search_url
+        self.pages = pages
+        self.page_timeout = page_timeout
+        self.search_timeout = search_timeout
+        self.max_page_bytes = max_page_bytes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pages + 1, pool_maxsize=pages * 2, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT})
+        self._pool = ThreadPoolExecutor(max_workers=pages * 2, thread_name_prefix="web-answer")
+        self.stats = {'searches': 0, 'pages': 0, 'answers': 0, 'timeouts': 0, 'errors': 0}
+
+    def search(self, query):
+        """Result URLs for query, best first"""
+        self.stats['searches'] += 1
+        response = self.session.get(self.search_url.format(query=quote_plus(query)),
+                                    timeout=self.search_timeout, headers={'Accept': 'application/json'})
+        response.raise_for_status()
+        return result_urls(response.json())
+
+    def read_page(self, url, terms, stop):
+        """(paragraph mentioning the query, best paragraph) of one page, either None
+
+        Reading ends when a paragraph mentions the query, when another page has
+        already answered (stop is set), or at the page deadline.
+        """
+        deadline = time.monotonic() + self.page_timeout
+        parser = MainTextParser(terms)
+        try:
+            with self.session.get(url, timeout=(min(1.5, self.page_timeout), self.page_timeout), stream=True) as response:
+                content_type = response.headers.get('Content-Type', 'text/html').lower()
+                if response.status_code != 200 or 'html' not in content_type:
+                    return None, None
+                # Without a charset requests assumes Latin-1; pages nowadays are UTF-8
+                encoding = response.encoding if 'charset' in content_type else 'utf-8'
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                received = 0
+                for chunk in response.iter_content(chunk_size=8192):
+                    parser.feed(decoder.decode(chunk))
+                    received += len(chunk)
+                    if parser.found or stop.is_set():
+                        break
+                    if time.monotonic() > deadline:
+                        self.stats['timeouts'] += 1
+                        break
+                    if received > self.max_page_bytes:
+                        break
+                else:
+                    parser.feed(decoder.decode(b'', final=True))
+                    parser.close()
+        except (requests.RequestException, LookupError):
+            self.stats['errors'] += 1
+        finally:
+            self.stats['pages'] += 1
+        return parser.found, parser.best()
+
+    def answer(self, query):
+        """Answer for query from the first result page that yields one, or None"""
+        try:
+            urls = self.search(query)[:self.pages]
+        except (requests.RequestException, ValueError) as e:
+            print(f"Web search error: {e}")
+            return None
+        if not urls:
+            return None
+
+        terms = query_terms(query)
+        stop = threading.Event()
+        futures = {self._pool.submit(self.read_page, url, terms, stop): url for url in urls}
+        deadline = time.monotonic() + self.page_timeout + 0.5
+        fallback = None
+        try:
+            while futures:
+                done, _ = wait(futures, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    url = futures.pop(future)
+                    found, best = future.result()
+                    if found:
+                        self.stats['answers'] += 1
+                        return Answer(extract(found), url, source_name(url))
+                    if best and fallback is None:
+                        fallback = Answer(extract(best), url, source_name(url))
+        finally:
+            stop.set()
+        if fallback:
+            self.stats['answers'] += 1
+        return fallback
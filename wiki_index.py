@@ -0,0 +1,285 @@
+"""
+Offline Wikipedia abstracts, memory-mapped.
+
+build() turns a Wikipedia abstracts dump (enwiki-latest-abstract.xml.gz, or a
+title<TAB>abstract file) into one little-endian index file:
+
+    header     magic, key and block counts, section offsets
+    blob       the abstracts as "title\\0abstract", zlib-compressed in blocks
+    keys       sorted 64-bit hashes of normalized titles
+    records    (block, start, length) for each key, in the same order
+    blocks     byte offset of every compressed block, plus the end
+
+WikiIndex opens the file with mmap, so opening takes milliseconds whatever its
+size and only the pages a lookup touches are read: a binary search over the
+keys, then one block is decompressed up to the entry. Titles are found by normalized form
+("the Eiffel tower", "eiffel-tower" and "Eiffel Tower" are the same key); a
+title with a qualifier ("Mercury (planet)") is also reachable without it when
+no other article has that name.
+
+    python wiki_index.py build enwiki-latest-abstract.xml.gz
+    python wiki_index.py lookup "eiffel tower"
+"""
+
+import bisect
+import bz2
+import gzip
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import unicodedata
+import zlib
+from array import array
+
+MAGIC = b'WIKIABS1'
+# magic, keys, blocks, keys offset, records offset, blocks offset, blob offset
+_HEADER = struct.Struct('<8sQQQQQQ')
+HEADER_SIZE = 64
+BLOCK_SIZE = 16 * 1024
+
+_NON_WORD = re.compile(r'[\W_]+')
+_QUALIFIER = re.compile(r'\s*\([^)]*\)\s*$')
+_ARTICLE = re.compile(r'^(?:the|a|an) ')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"\'(])')
+
+
+def normalize(title):
+    """Lowercase, accents and punctuation removed, leading article dropped"""
+    text = title.casefold()
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    text = _NON_WORD.sub(' ', text).strip()
+    return _ARTICLE.sub('', text)
+
+
+def key(title):
+    """64-bit key of a normalized title"""
+    return int.from_bytes(hashlib.blake2b(title.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def sentences(text, count):
+    """The first count sentences of text"""
+    return ' '.join(_SENTENCE_END.split(text.strip(), count)[:count])
+
+
+# =============================================================================
+# DUMP READING
+# =============================================================================
+
+def _open_dump(path, mode='rb'):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode)
+    if path.endswith('.bz2'):
+        return bz2.open(path, mode)
+    return open(path, mode)
+
+
+def _useful(abstract):
+    """Skip empty abstracts, template debris and disambiguation pages"""
+    return bool(abstract) and abstract[0] not in '|{' and not abstract.rstrip().endswith('may refer to:')
+
+
+def read_abstracts(path):
+    """Yield (title, abstract) from an abstracts XML dump or a title<TAB>abstract file"""
+    name = path[:-3] if path.endswith('.gz') else path[:-4] if path.endswith('.bz2') else path
+    if not name.endswith('.xml'):
+        with _open_dump(path, 'rt') as f:
+            for line in f:
+                title, _, abstract = line.rstrip('\n').partition('\t')
+                abstract = abstract.strip()
+                if title and _useful(abstract):
+                    yield title, abstract
+        return
+
+    import xml.etree.ElementTree as ET
+    with _open_dump(path) as f:
+        title = None
+        for _, element in ET.iterparse(f):
+            if element.tag == 'title':
+                title = (element.text or '').removeprefix('Wikipedia: ')
+            elif element.tag == 'abstract':
+                abstract = (element.text or '').strip()
+                if title and _useful(abstract):
+                    yield title, abstract
+            elif element.tag == 'doc':
+                element.clear()         # keep memory flat on a multi-GB dump
+
+
+# =============================================================================
+# BUILDING
+# =============================================================================
+
+def build(entries, path, block_size=BLOCK_SIZE, progress=None):
+    """Write an index of (title, abstract) pairs to path; returns the number of keys
+
+    The first article with a normalized title wins; titles with a qualifier are
+    then added without it where that name is still free.
+    """
+    import numpy as np
+
+    keys, records = array('Q'), array('I')
+    alias_keys, alias_entries = array('Q'), array('I')
+    block_offsets, block, blob_size = array('Q', [0]), bytearray(), 0
+    temp = path + ".tmp"
+    with open(temp, 'wb') as out:
+        out.write(b'\0' * HEADER_SIZE)
+
+        def flush():
+            nonlocal block, blob_size
+            data = zlib.compress(bytes(block), 6)
+            out.write(data)
+            blob_size += len(data)
+            block_offsets.append(blob_size)
+            block = bytearray()
+
+        for count, (title, abstract) in enumerate(entries, 1):
+            normal = normalize(title)
+            if not normal:
+                continue
+            data = f"{title}\0{abstract}".encode('utf-8')
+            if block and len(block) + len(data) > block_size:
+                flush()
+            stripped = normalize(_QUALIFIER.sub('', title)) if title.endswith(')') else normal
+            if stripped and stripped != normal:
+                alias_keys.append(key(stripped))
+                alias_entries.append(len(keys))
+            keys.append(key(normal))
+            records.extend((len(block_offsets) - 1, len(block), len(data)))
+            block += data
+            if progress and count % 100000 == 0:
+                progress(count, len(keys))
+        if block:
+            flush()
+
+        # Articles first, then qualifier-free aliases, so unique() keeps the
+        # first article for every key and an alias only where the name is free
+        all_keys = np.concatenate([np.frombuffer(keys, np.uint64), np.frombuffer(alias_keys, np.uint64)])
+        all_entries = np.concatenate([np.arange(len(keys), dtype=np.uint32), np.frombuffer(alias_entries, np.uint32)])
+        unique_keys, first = np.unique(all_keys, return_index=True)
+        sorted_records = np.frombuffer(records, np.uint32).reshape(-1, 3)[all_entries[first]]
+
+        keys_offset = _aligned(HEADER_SIZE + blob_size)
+        records_offset = keys_offset + unique_keys.nbytes
+        blocks_offset = _aligned(records_offset + sorted_records.nbytes)
+        out.write(b'\0' * (keys_offset - HEADER_SIZE - blob_size))
+        out.write(unique_keys.astype('<u8').tobytes())
+        out.write(sorted_records.astype('<u4').tobytes())
+        out.write(b'\0' * (blocks_offset - records_offset - sorted_records.nbytes))
+        out.write(np.frombuffer(block_offsets, np.uint64).astype('<u8').tobytes())
+        out.seek(0)
+        out.write(_HEADER.pack(MAGIC, len(unique_keys), len(block_offsets) - 1,
+                               keys_offset, records_offset, blocks_offset, HEADER_SIZE))
+    os.replace(temp, path)
+    return len(unique_keys)
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+# =============================================================================
+# LOOKUP
+# =============================================================================
+
+class WikiIndex:
+    """A built index file, memory-mapped; safe to share between threads"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.entries, self.blocks, keys, records, blocks, self._blob = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a Wikipedia abstracts index")
+        view = memoryview(self._map)
+        self._keys = view[keys:keys + self.entries * 8].cast('Q')
+        self._records = view[records:records + self.entries * 12].cast('I')
+        self._block_offsets = view[blocks:blocks + (self.blocks + 1) * 8].cast('Q')
+        self.stats = {'lookups': 0, 'hits': 0}
+
+    def __len__(self):
+        return self.entries
+
+    def _read(self, block, start, length):
+        """Decompress a block only as far as the entry that ends at start + length"""
+        begin = self._blob + self._block_offsets[block]
+        end = self._blob + self._block_offsets[block + 1]
+        data = zlib.decompressobj().decompress(self._map[begin:end], start + length)
+        return data[start:]
+
+    def lookup(self, title):
+        """(title, abstract) of the article with this (normalized) title, or None"""
+        self.stats['lookups'] += 1
+        normal = normalize(title)
+        if not normal:
+            return None
+        k = key(normal)
+        i = bisect.bisect_left(self._keys, k)
+        if i == self.entries or self._keys[i] != k:
+            return None
+        block, start, length = self._records[i * 3:i * 3 + 3]
+        found, _, abstract = self._read(block, start, length).decode('utf-8').partition('\0')
+        self.stats['hits'] += 1
+        return found, abstract
+
+    def summary(self, query, sentences_count=2):
+        """The first sentences of the abstract for query, or None"""
+        found = self.lookup(query)
+        return sentences(found[1], sentences_count) if found else None
+
+    def close(self):
+        self._keys = self._records = self._block_offsets = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+
+def open_index(path):
+    """The index at path, or None when it has not been built"""
+    try:
+        return WikiIndex(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Could not open offline Wikipedia index {path}: {e}")
+        return None
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Offline Wikipedia abstracts index")
+    parser.add_argument('--index', default=None, help="index file (default: WIKI_INDEX_FILE from config.py)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build_parser = commands.add_parser('build', help="build the index from an abstracts dump")
+    build_parser.add_argument('dump', help="enwiki-latest-abstract.xml[.gz|.bz2] or a title<TAB>abstract file")
+    lookup_parser = commands.add_parser('lookup', help="look up a title")
+    lookup_parser.add_argument('query', nargs='+')
+    args = parser.parse_args(argv)
+
+    path = args.index
+    if path is None:
+        from settings import WIKI_INDEX_FILE
+        path = WIKI_INDEX_FILE
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        count = build(read_abstracts(args.dump), path,
+                      progress=lambda read, kept: print(f"  {read:,} articles read, {kept:,} titles", flush=True))
+        print(f"Indexed {count:,} titles into {path} in {time.perf_counter() - start:.0f} s")
+        return
+
+    index = open_index(path)
+    if index is None:
+        sys.exit(f"No index at {path}; build one with: python wiki_index.py build DUMP")
+    found = index.lookup(' '.join(args.query))
+    print(f"{found[0]}: {found[1]}" if found else "Not found")
+
+
+if __name__ == "__main__":
+    main()